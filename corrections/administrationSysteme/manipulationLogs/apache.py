@@ -1,10 +1,25 @@
 import re
+import socket
+import json
+import hashlib
+import numpy as np
 import geoip2.database
+import geoip2.errors
 from collections import Counter
 from user_agents import parse as ua_parse  # pip install pyyaml ua-parser user-agents
 import zipfile
 import io
-from dateutil import parser
+import os
+import gzip
+import glob
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from array import array
+from calendar import timegm
+from datetime import date
 
 # presentation
 from tqdm import tqdm
@@ -13,8 +28,83 @@ from rich.table import Table
 from rich.progress import track
 from termgraph import termgraph, module
 
+from sketches import HeavyHitters, HyperLogLog, TDigest
+
 # https://github.com/elastic/examples/tree/master/Common%20Data%20Formats/apache_logs
 
+LOG_ZIP_PATH = "../../medias/analyseLogs/apache.zip"
+GEOIP_DB_PATH = (
+    "../../medias/analyseLogs/GeoLite2-Country_20220125/GeoLite2-Country.mmdb"
+)
+
+# Taille minimale d'un morceau de fichier texte confié à un processus
+MIN_CHUNK_SIZE = 4 * 1024 * 1024
+# Nombre de lignes par lot pour les membres d'archives zip (non découpables)
+LINES_PER_BATCH = 20_000
+
+# Tables déjà parsées, réutilisées d'une analyse à l'autre (voir LogSource)
+CACHE_DIR = ".apache_cache"
+# À incrémenter quand les colonnes ou le parsing changent
+CACHE_VERSION = 1
+# Taille des blocs de début et de fin de log hachés pour l'empreinte
+FINGERPRINT_SIZE = 64 * 1024
+
+# Erreur relative par défaut des sketches (--sketches)
+SKETCH_ERROR = 0.01
+
+# Taille des caches d'enrichissement : les logs répètent peu d'IP et d'user-agents
+GEOIP_CACHE_SIZE = 65_536
+USER_AGENT_CACHE_SIZE = 8_192
+
+# Mois du format de log combiné (toujours en anglais, sur trois lettres)
+MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+SECONDS_PER_DAY = 86_400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def day_start(day_prefix):
+    """Secondes epoch du début d'un jour "17/May/2015" (mémorisé par jour)."""
+    day, month, year = day_prefix.split("/")
+    return timegm((int(year), MONTHS[month], int(day), 0, 0, 0))
+
+
+@lru_cache(maxsize=64)
+def utc_offset(zone):
+    """Décalage "+0100" en secondes."""
+    seconds = int(zone[1:3]) * 3600 + int(zone[3:5]) * 60
+    return -seconds if zone[0] == "-" else seconds
+
+
+def decode_apache_timestamp(value):
+    """Décode un horodatage "17/May/2015:10:05:03 +0000" du format combiné.
+    Format fixe : découpage par positions, sans parser généraliste.
+
+    Returns:
+        (secondes epoch UTC, décalage horaire du log en secondes)
+    """
+    offset = utc_offset(value[21:26])
+    local = (
+        day_start(value[:11])
+        + int(value[12:14]) * 3600
+        + int(value[15:17]) * 60
+        + int(value[18:20])
+    )
+    return local - offset, offset
+
 
 def parser_log_apache_line(ligne):
     """Permet de parser une ligne de log apache.
@@ -34,100 +124,883 @@ def parser_log_apache_line(ligne):
     ]
     match = re.match(regex, ligne)
     if match:
-        return dict(zip(fields, match.groups()))
+        parsed = dict(zip(fields, match.groups()))
+        try:
+            parsed["timestamp"], parsed["utc_offset"] = decode_apache_timestamp(
+                parsed["datetime"]
+            )
+            parsed["ip"] = int.from_bytes(socket.inet_aton(parsed["client_ip"]), "big")
+        except (ValueError, KeyError, OSError):
+            return None
+        parsed["path"] = request_path(parsed["ressource"])
+        return parsed
+
+
+def request_path(ressource):
+    """Chemin de "GET /images/logo.png?v=2 HTTP/1.1", sans la query string."""
+    parts = ressource.split(" ")
+    target = parts[1] if len(parts) > 1 else parts[0]
+    return target.split("?", 1)[0]
+
+
+@lru_cache(maxsize=GEOIP_CACHE_SIZE)
+def country_name(reader, ip):
+    """Nom du pays d'une IP, mémorisé : seul le nom est gardé, pas la réponse."""
+    try:
+        return reader.country(ip).country.names.get("fr", "not found")
+    except geoip2.errors.AddressNotFoundError:
+        return "not found"
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def browser_family(user_agent):
+    """Famille du navigateur, mémorisée : le parsing d'user-agent est le plus coûteux."""
+    return ua_parse(user_agent).browser.family
 
 
 def augment_parsed_line_ip(reader, parsed: dict):
-    response = reader.country(parsed["client_ip"])
-    parsed["ip_infos"] = response
+    parsed["country"] = country_name(reader, parsed["client_ip"])
     return parsed
 
 
 def augment_parsed_line_user_agent(parsed):
-    parsed["ua_infos"] = ua_parse(parsed["user_agent"])
+    parsed["browser"] = browser_family(parsed["user_agent"])
     return parsed
 
 
-def parse_lines(lines):
-    res = []
-    with geoip2.database.Reader(
-        "../../medias/analyseLogs/GeoLite2-Country_20220125/GeoLite2-Country.mmdb"
-    ) as reader:
-        # for line in tqdm(lines):
-        for line in track(lines, description="Parsing lines"):
-            parsed = parser_log_apache_line(line)
-            if not parsed:
-                continue
-            parsed = augment_parsed_line_ip(reader, parsed)
-            parsed = augment_parsed_line_user_agent(parsed)
-            res.append(parsed)
-    return res
-
-
-def analyse(parsed):
-    analyse_countries(parsed)
-    analyse_status_codes(parsed)
-    print(
-        f"Volume transféré : {sum(int(p['weight']) for p in parsed) / (1024 * 1024):.2f} Mio"
+# Caches d'enrichissement, pour les statistiques de succès
+ENRICHMENT_CACHES = {"GeoIP": country_name, "User-agent": browser_family}
+
+
+def enrichment_cache_info():
+    return {name: cache.cache_info() for name, cache in ENRICHMENT_CACHES.items()}
+
+
+def read_log_lines(zip_path, member="apache.log"):
+    """Lit les lignes d'un log compressé une par une.
+    Le membre de l'archive est décompressé au fil de la lecture :
+    le log n'est jamais chargé entièrement en mémoire.
+    """
+    with zipfile.ZipFile(zip_path, "r") as myzip:
+        with myzip.open(member) as myfile:
+            yield from io.TextIOWrapper(myfile, encoding="utf8", newline="")
+
+
+def parse_lines(lines, reader):
+    """Générateur : parse et enrichit les lignes à la volée.
+    Chaque enregistrement est abandonné dès qu'il a été agrégé.
+    """
+    for line in lines:
+        parsed = parser_log_apache_line(line)
+        if not parsed:
+            continue
+        parsed = augment_parsed_line_ip(reader, parsed)
+        parsed = augment_parsed_line_user_agent(parsed)
+        yield parsed
+
+
+# =============================================================================
+# Table en colonnes : un tableau NumPy par champ, chaînes encodées par dictionnaire
+# =============================================================================
+
+# Colonnes de la table : (code du module array, type NumPy)
+NUMERIC_COLUMNS = {
+    "ip": ("I", np.uint32),
+    "timestamp": ("q", np.int64),
+    "utc_offset": ("i", np.int32),
+    "status": ("H", np.uint16),
+    "bytes": ("q", np.int64),
+}
+# Colonnes de chaînes répétées, stockées sous forme de codes int32
+ENCODED_COLUMNS = ("country", "path", "browser")
+
+TOP = 10
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Dictionary:
+    """Valeurs distinctes d'une colonne encodée, dans l'ordre d'apparition.
+    Le code d'une valeur est sa position dans values.
+    """
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class LogTable:
+    """Lignes de log parsées, en colonnes.
+    table["status"] est un tableau NumPy ; pour les colonnes encodées,
+    table.dictionaries["country"].values donne la valeur de chaque code.
+    """
+
+    def __init__(self, columns, dictionaries):
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    def __len__(self):
+        return len(self.columns["timestamp"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @classmethod
+    def concat(cls, tables):
+        """Concatène les tables des morceaux de log, dans l'ordre.
+        Les codes de chaque morceau sont réencodés dans des dictionnaires communs.
+        """
+        dictionaries = {name: Dictionary() for name in ENCODED_COLUMNS}
+        parts = {
+            name: [np.empty(0, dtype)] for name, (_, dtype) in NUMERIC_COLUMNS.items()
+        }
+        parts.update({name: [np.empty(0, np.int32)] for name in ENCODED_COLUMNS})
+        for table in tables:
+            for name in NUMERIC_COLUMNS:
+                parts[name].append(table[name])
+            for name in ENCODED_COLUMNS:
+                values = table.dictionaries[name].values
+                remap = np.array(
+                    [dictionaries[name].encode(value) for value in values],
+                    dtype=np.int32,
+                )
+                parts[name].append(remap[table[name]])
+        columns = {name: np.concatenate(arrays) for name, arrays in parts.items()}
+        return cls(columns, dictionaries)
+
+    def to_arrays(self):
+        """Colonnes et valeurs des dictionnaires, à enregistrer avec np.savez."""
+        arrays = dict(self.columns)
+        for name, dictionary in self.dictionaries.items():
+            arrays[f"{name}_values"] = np.array(dictionary.values, dtype=str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        columns = {name: arrays[name] for name in (*NUMERIC_COLUMNS, *ENCODED_COLUMNS)}
+        dictionaries = {
+            name: Dictionary(arrays[f"{name}_values"].tolist())
+            for name in ENCODED_COLUMNS
+        }
+        return cls(columns, dictionaries)
+
+
+class TableBuilder:
+    """Construit une LogTable au fil du parsing, dans des tableaux typés compacts."""
+
+    def __init__(self):
+        self.columns = {
+            name: array(code) for name, (code, _) in NUMERIC_COLUMNS.items()
+        }
+        self.columns.update({name: array("i") for name in ENCODED_COLUMNS})
+        self.dictionaries = {name: Dictionary() for name in ENCODED_COLUMNS}
+
+    def add(self, parsed):
+        columns = self.columns
+        columns["ip"].append(parsed["ip"])
+        columns["timestamp"].append(parsed["timestamp"])
+        columns["utc_offset"].append(parsed["utc_offset"])
+        columns["status"].append(int(parsed["status"]))
+        columns["bytes"].append(int(parsed["weight"]))
+        for name in ENCODED_COLUMNS:
+            columns[name].append(self.dictionaries[name].encode(parsed[name]))
+
+    def build(self):
+        columns = {
+            name: np.array(values, dtype=NUMERIC_COLUMNS.get(name, (None, np.int32))[1])
+            for name, values in self.columns.items()
+        }
+        return LogTable(columns, self.dictionaries)
+
+
+# =============================================================================
+# Analyses : group-by vectorisés sur la table
+# =============================================================================
+
+
+def top_values(table, name, weights=None, top=TOP):
+    """Valeurs d'une colonne encodée les plus fréquentes (ou les plus lourdes).
+    Un seul np.bincount sur les codes, quel que soit le nombre de lignes ;
+    à égalité, l'ordre d'apparition est conservé.
+    """
+    dictionary = table.dictionaries[name]
+    totals = np.bincount(table[name], weights=weights, minlength=len(dictionary))
+    order = np.argsort(-totals, kind="stable")[:top]
+    return [(dictionary.values[code], totals[code]) for code in order if totals[code]]
+
+
+def local_seconds(table):
+    """Horodatages à l'heure du log (jour et heure tels qu'écrits dans le fichier)."""
+    return table["timestamp"] + table["utc_offset"]
+
+
+def mebibytes(value):
+    return f"{value / (1024 * 1024):.2f} Mio"
+
+
+def print_table(title, headers, rows):
+    print(title)
+    console = Console()
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column(headers[0], style="dim", width=20, justify="right")
+    for header in headers[1:]:
+        table.add_column(header)
+    for row in rows:
+        table.add_row(*(str(value) for value in row))
+    console.print(table)
+
+
+def format_day(day):
+    """Numéro de jour depuis l'epoch → "2015-05-17"."""
+    return date.fromordinal(EPOCH_ORDINAL + int(day)).strftime("%Y-%m-%d")
+
+
+def format_ip(value):
+    return socket.inet_ntoa(int(value).to_bytes(4, "big"))
+
+
+# Affichage des analyses, commun à la table exacte et aux sketches
+
+
+def print_countries(rows):
+    print_table(
+        "Top 10 des pays avec le plus de vues", ("Pays", "Nombre de hits"), rows
     )
-    analyse_calendar(parsed)
 
 
-def analyse_calendar(parsed):
+def print_status_codes(rows):
+    print_table("Status les plus représentés", ("Status", "Nombre de hits"), rows)
+
+
+def print_volume(total_bytes):
+    print(f"Volume transféré : {mebibytes(total_bytes)}")
+
+
+def print_calendar(days, counts):
+    if not len(days):
+        return
     print("Vues selon le jour et le mois ")
-    dates = []
-    for p in parsed:
-        # https://nablux.net/tgp/weblog/2013/10/29/parsing-timestamps-apache-log-files-python/
-        date_str = p["datetime"][:11] + " " + p["datetime"][12:]
-        date = parser.parse(date_str)
-        dates.append(date.date().strftime("%Y-%m-%d"))
-
-    dates_count = dict(Counter(dates))
+    # termgraph attend une série de valeurs par label et une liste de couleurs
     termgraph.calendar_heatmap(
-        data=[i for i in dates_count.values()],
-        labels=list(dates_count.keys()),
+        data=[[count] for count in counts],
+        labels=[format_day(day) for day in days],
         args={
-            "color": "red",
+            "color": ["red"],
             "custom_tick": None,
-            "start_dt": dates[0],
+            "start_dt": format_day(days[0]),
         },
     )
 
 
-def analyse_countries(parsed):
-    print("Top 10 des pays avec le plus de vues")
-    countries = Counter(
-        p["ip_infos"].country.names.get("fr", "not found") for p in parsed
+def print_top_paths(rows):
+    print_table(
+        "Top 10 des ressources les plus demandées",
+        ("Ressource", "Nombre de hits"),
+        rows,
     )
-    console = Console()
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Pays", style="dim", width=20, justify="right")
-    table.add_column("Nombre de hits")
-    for pays, count in countries.most_common(10):
-        table.add_row(pays, str(count))
-    console.print(table)
 
 
-def analyse_status_codes(parsed):
-    print("Status les plus représentés")
-    status = Counter(p["status"] for p in parsed)
-    console = Console()
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Status", style="dim", width=20, justify="right")
-    table.add_column("Nombre de hits")
-    for statu, count in status.most_common(10):
-        table.add_row(statu, str(count))
-    console.print(table)
+def print_bytes_per_country(rows):
+    print_table(
+        "Top 10 des pays par volume transféré",
+        ("Pays", "Volume"),
+        [(country, mebibytes(volume)) for country, volume in rows],
+    )
+
+
+def print_hourly_traffic(hits, volume):
+    print_table(
+        "Trafic selon l'heure de la journée",
+        ("Heure", "Nombre de hits", "Volume"),
+        [(f"{hour:02d}h", hits[hour], mebibytes(volume[hour])) for hour in range(24)],
+    )
+
+
+def print_clients(distinct, rows):
+    print(f"Clients distincts : {distinct}")
+    print_table(
+        "Top 10 des clients les plus actifs",
+        ("IP", "Nombre de hits"),
+        [(format_ip(ip), count) for ip, count in rows],
+    )
+
+
+def print_response_sizes(values):
+    print_table(
+        "Taille des réponses",
+        ("Percentile", "Octets"),
+        [(f"p{percentile}", f"{value:.0f}") for percentile, value in values],
+    )
+
+
+# Analyses exactes sur la table
+
+
+def analyse_countries(table):
+    print_countries(top_values(table, "country"))
+
+
+def analyse_status_codes(table):
+    status, counts = np.unique(table["status"], return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:TOP]
+    print_status_codes(zip(status[order], counts[order]))
+
+
+def analyse_volume(table):
+    print_volume(table["bytes"].sum())
+
+
+def analyse_calendar(table):
+    days = local_seconds(table) // SECONDS_PER_DAY
+    print_calendar(*np.unique(days, return_counts=True))
+
+
+def analyse_top_paths(table):
+    print_top_paths(top_values(table, "path"))
+
+
+def analyse_bytes_per_country(table):
+    print_bytes_per_country(top_values(table, "country", weights=table["bytes"]))
+
+
+def analyse_hourly_traffic(table):
+    hours = local_seconds(table) % SECONDS_PER_DAY // 3600
+    hits = np.bincount(hours, minlength=24)
+    volume = np.bincount(hours, weights=table["bytes"], minlength=24)
+    print_hourly_traffic(hits, volume)
+
+
+def analyse_clients(table):
+    ips, counts = np.unique(table["ip"], return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:TOP]
+    print_clients(len(ips), zip(ips[order], counts[order]))
+
+
+def analyse_response_sizes(table):
+    if not len(table):
+        return
+    values = np.percentile(table["bytes"], PERCENTILES)
+    print_response_sizes(zip(PERCENTILES, values))
+
+
+# Analyses affichées, dans l'ordre
+ANALYSES = [
+    analyse_countries,
+    analyse_status_codes,
+    analyse_volume,
+    analyse_calendar,
+    analyse_top_paths,
+    analyse_bytes_per_country,
+    analyse_hourly_traffic,
+    analyse_clients,
+    analyse_response_sizes,
+]
+
+
+# =============================================================================
+# Sketches : mêmes analyses en mémoire bornée, pour les très gros logs
+# =============================================================================
+
+
+class LogSketches:
+    """Résumé approximatif des logs, fusionnable entre morceaux.
+    Les clés en nombre borné (jours, heures) sont comptées exactement ; les
+    autres sont estimées avec une erreur relative error :
+    - HyperLogLog : nombre de clients distincts ;
+    - Count-Min et tas des plus fréquents : top des pays, status, ressources,
+      IP et volume par pays ;
+    - t-digest : percentiles de la taille des réponses.
+    """
+
+    def __init__(self, error=SKETCH_ERROR):
+        self.error = error
+        self.total_bytes = 0
+        self.days = Counter()
+        self.hits_per_hour = np.zeros(24, dtype=np.int64)
+        self.bytes_per_hour = np.zeros(24)
+        self.clients = HyperLogLog.from_error(error)
+        self.countries = HeavyHitters.from_error(error)
+        self.status = HeavyHitters.from_error(error)
+        self.paths = HeavyHitters.from_error(error)
+        self.ips = HeavyHitters.from_error(error)
+        self.country_bytes = HeavyHitters.from_error(error)
+        self.sizes = TDigest(compression=round(1 / error))
+
+    @classmethod
+    def from_table(cls, table, error=SKETCH_ERROR):
+        """Sketches d'un morceau de log ; sa table peut ensuite être libérée."""
+        sketches = cls(error)
+        sketches.total_bytes = int(table["bytes"].sum())
+        local = local_seconds(table)
+        days, counts = np.unique(local // SECONDS_PER_DAY, return_counts=True)
+        sketches.days.update(dict(zip(days.tolist(), counts.tolist())))
+        hours = local % SECONDS_PER_DAY // 3600
+        sketches.hits_per_hour += np.bincount(hours, minlength=24)
+        sketches.bytes_per_hour += np.bincount(
+            hours, weights=table["bytes"], minlength=24
+        )
+        sketches.clients.add(table["ip"])
+        sketches.ips.add(*np.unique(table["ip"], return_counts=True))
+        sketches.status.add(*np.unique(table["status"], return_counts=True))
+        for name, heavy_hitters in (
+            ("country", sketches.countries),
+            ("path", sketches.paths),
+        ):
+            values = table.dictionaries[name].values
+            heavy_hitters.add(values, np.bincount(table[name], minlength=len(values)))
+        countries = table.dictionaries["country"].values
+        sketches.country_bytes.add(
+            countries,
+            np.bincount(table["country"], table["bytes"], minlength=len(countries)),
+        )
+        sketches.sizes.add(table["bytes"])
+        return sketches
+
+    def merge(self, other):
+        self.total_bytes += other.total_bytes
+        self.days.update(other.days)
+        self.hits_per_hour += other.hits_per_hour
+        self.bytes_per_hour += other.bytes_per_hour
+        self.clients.merge(other.clients)
+        for name in ("countries", "status", "paths", "ips", "country_bytes"):
+            getattr(self, name).merge(getattr(other, name))
+        self.sizes.merge(other.sizes)
+
+    def display(self):
+        print(f"Estimations à {self.error:.1%} près (sketches)")
+        print_countries(estimated(self.countries.top(TOP)))
+        print_status_codes(estimated(self.status.top(TOP)))
+        print_volume(self.total_bytes)
+        days = sorted(self.days)
+        print_calendar(days, [self.days[day] for day in days])
+        print_top_paths(estimated(self.paths.top(TOP)))
+        print_bytes_per_country(self.country_bytes.top(TOP))
+        print_hourly_traffic(self.hits_per_hour, self.bytes_per_hour)
+        print_clients(
+            f"~{self.clients.count():.0f} "
+            f"(erreur type {self.clients.standard_error:.1%})",
+            estimated(self.ips.top(TOP)),
+        )
+        if len(self.sizes.means):
+            print_response_sizes(
+                (percentile, self.sizes.quantile(percentile / 100))
+                for percentile in PERCENTILES
+            )
+
+
+def estimated(rows):
+    """Arrondit les comptes estimés par un Count-Min."""
+    return [(key, f"~{count:.0f}") for key, count in rows]
+
+
+class EnrichmentCacheStats:
+    """Succès et échecs des caches d'enrichissement (GeoIP, user-agent)."""
+
+    def __init__(self):
+        self.counts = {name: Counter() for name in ENRICHMENT_CACHES}
+
+    def measure(self, before):
+        """Compte les accès aux caches depuis l'état before (par processus)."""
+        for name, info in enrichment_cache_info().items():
+            self.counts[name]["hits"] += info.hits - before[name].hits
+            self.counts[name]["misses"] += info.misses - before[name].misses
+
+    def merge(self, other):
+        for name, counts in other.counts.items():
+            self.counts[name].update(counts)
+
+    def display(self):
+        rows = []
+        for name, counts in self.counts.items():
+            total = counts["hits"] + counts["misses"]
+            rate = counts["hits"] / total if total else 0.0
+            rows.append((name, counts["hits"], counts["misses"], f"{rate:.1%}"))
+        print_table(
+            "Caches d'enrichissement",
+            ("Cache", "Succès", "Échecs", "Taux de succès"),
+            rows,
+        )
+
+
+# =============================================================================
+# Analyse parallèle : un morceau de log par tâche, un Reader geoip2 par processus
+# =============================================================================
+
+_reader = None
+# Mode sketches : erreur relative des sketches renvoyés à la place des tables
+_sketch_error = None
+
+
+def init_worker(geoip_path, sketch_error=None):
+    """Ouvre le Reader geoip2 du processus (une fois, pas par morceau)."""
+    global _reader, _sketch_error
+    _reader = geoip2.database.Reader(geoip_path)
+    _sketch_error = sketch_error
+
+
+def build_table(lines):
+    """Parse un morceau de log : sa table (ou ses sketches) et les accès aux
+    caches du processus.
+    """
+    before = enrichment_cache_info()
+    builder = TableBuilder()
+    for parsed in parse_lines(lines, _reader):
+        builder.add(parsed)
+    cache_stats = EnrichmentCacheStats()
+    cache_stats.measure(before)
+    if _sketch_error is not None:
+        return LogSketches.from_table(builder.build(), _sketch_error), cache_stats
+    return builder.build(), cache_stats
+
+
+def read_byte_range(path, start, end):
+    """Lit les lignes d'un fichier texte comprises entre deux positions.
+    Les positions sont alignées sur des débuts de ligne (voir split_file).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            line = f.readline()
+            if not line:
+                break
+            remaining -= len(line)
+            yield line.decode("utf8", errors="replace")
+
+
+def parse_range(task):
+    path, start, end = task
+    return build_table(read_byte_range(path, start, end))
+
+
+def parse_gzip(path):
+    with gzip.open(path, "rt", encoding="utf8", newline="") as f:
+        return build_table(f)
+
+
+def parse_batch(lines):
+    return build_table(lines)
+
+
+def split_file(path, chunk_size, start=0, end=None):
+    """Découpe [start, end) d'un fichier texte en plages d'octets alignées
+    sur les fins de ligne.
+    """
+    end = os.path.getsize(path) if end is None else end
+    if start >= end:
+        return []
+    bounds = [start]
+    with open(path, "rb") as f:
+        while bounds[-1] + chunk_size < end:
+            f.seek(bounds[-1] + chunk_size)
+            f.readline()  # la ligne coupée reste dans le morceau précédent
+            if f.tell() >= end:
+                break
+            bounds.append(f.tell())
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# =============================================================================
+# Cache des tables parsées : un fichier .npz par log
+# =============================================================================
+
+
+def file_fingerprint(path, end):
+    """Empreinte des premiers et des derniers octets de [0, end).
+    Hacher tout le log coûterait une lecture complète à chaque analyse ;
+    ces deux blocs suffisent à distinguer un log complété d'un log tourné
+    ou réécrit.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        digest.update(f.read(min(end, FINGERPRINT_SIZE)))
+        f.seek(max(0, end - FINGERPRINT_SIZE))
+        digest.update(f.read(end - f.tell()))
+    return digest.hexdigest()
+
+
+def complete_lines_end(path, size):
+    """Position qui suit le dernier saut de ligne du fichier.
+    Une ligne en cours d'écriture n'est pas mise en cache.
+    """
+    with open(path, "rb") as f:
+        position = size
+        while position > 0:
+            step = min(FINGERPRINT_SIZE, position)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                return position - step + newline + 1
+            position -= step
+    return 0
+
+
+class LogSource:
+    """Un log à analyser et la partie déjà parsée, lue depuis le cache.
+
+    La table en cache est associée à la taille, à la date de modification et
+    à l'empreinte du log (et à la base GeoIP utilisée pour l'enrichir) :
+    - log inchangé : la table est réutilisée telle quelle ;
+    - log texte complété : seules les lignes ajoutées depuis la position
+      enregistrée (start) sont parsées ;
+    - sinon (log tourné, réécrit, archive modifiée) : tout est reparsé.
+    """
+
+    def __init__(self, path, cache_dir=None, geoip_path=GEOIP_DB_PATH):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.is_text = not (zipfile.is_zipfile(path) or path.endswith(".gz"))
+        # Fin de la partie à mettre en cache
+        self.end = complete_lines_end(path, self.size) if self.is_text else self.size
+        # Début de la partie à parser, table des lignes de [0, start)
+        self.start = 0
+        self.cached = None
+        self.geoip = os.path.basename(geoip_path)
+        self.cache_path = None
+        if cache_dir:
+            digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+            name = f"{os.path.basename(path)}.{digest}.npz"
+            self.cache_path = os.path.join(cache_dir, name)
+            self.load_cache()
+
+    def load_cache(self):
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as arrays:
+                meta = json.loads(str(arrays["meta"]))
+                if not self.is_valid(meta):
+                    return
+                self.cached = LogTable.from_arrays(arrays)
+        except (OSError, KeyError, ValueError):
+            return
+        self.start = meta["end"]
+
+    def is_valid(self, meta):
+        if meta["version"] != CACHE_VERSION or meta["geoip"] != self.geoip:
+            return False
+        if self.is_text:
+            # Un log texte ne peut que grandir : seul le début doit être identique
+            if meta["end"] > self.end:
+                return False
+        elif (meta["size"], meta["mtime_ns"]) != (self.size, self.mtime_ns()):
+            return False
+        return meta["fingerprint"] == file_fingerprint(self.path, meta["end"])
+
+    def mtime_ns(self):
+        return os.stat(self.path).st_mtime_ns
+
+    def save_cache(self, table):
+        """Enregistre la table des lignes de [0, end), par remplacement atomique."""
+        meta = {
+            "version": CACHE_VERSION,
+            "geoip": self.geoip,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns(),
+            "end": self.end,
+            "fingerprint": file_fingerprint(self.path, self.end),
+        }
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        temporary = self.cache_path + ".tmp"
+        with open(temporary, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **table.to_arrays())
+        os.replace(temporary, self.cache_path)
+
+
+def iter_tasks(sources, workers):
+    """Tâches (source, à mettre en cache, fonction, argument) couvrant ce qui
+    n'est pas en cache, dans l'ordre.
+    - fichier texte : plages d'octets depuis la fin du cache, plusieurs par
+      processus, puis la dernière ligne si elle est incomplète ;
+    - fichier .gz : un morceau par fichier (logs tournés) ;
+    - archive zip : lots de lignes décompressées au fil de l'eau.
+    """
+    for index, source in enumerate(sources):
+        for function, argument in source_tasks(source, workers):
+            yield index, True, function, argument
+        if source.end < source.size:
+            yield index, False, parse_range, (source.path, source.end, source.size)
+
+
+def source_tasks(source, workers):
+    path = source.path
+    if source.start >= source.end:
+        return
+    if source.is_text:
+        remaining = source.end - source.start
+        chunk_size = max(MIN_CHUNK_SIZE, remaining // (workers * 4))
+        for start, end in split_file(path, chunk_size, source.start, source.end):
+            yield parse_range, (path, start, end)
+    elif path.endswith(".gz"):
+        yield parse_gzip, path
+    else:
+        with zipfile.ZipFile(path, "r") as myzip:
+            members = myzip.namelist()
+        for member in members:
+            for batch in batched(read_log_lines(path, member), LINES_PER_BATCH):
+                yield parse_batch, batch
+
+
+def run_task(task):
+    index, cacheable, function, argument = task
+    return index, cacheable, function(argument)
+
+
+def ordered_map(executor, function, tasks, max_pending):
+    """Comme executor.map, mais sans soumettre plus de max_pending tâches
+    d'avance : les lots d'une archive zip ne s'accumulent pas en mémoire.
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(function, task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def analyse_logs(paths, workers, geoip_path=GEOIP_DB_PATH, cache_dir=CACHE_DIR):
+    """Parse les logs, en parallèle si plusieurs processus sont demandés.
+    Seule la partie des logs absente du cache est parsée (cache_dir=None :
+    pas de cache). Les tables sont concaténées dans l'ordre du log.
+
+    Returns:
+        (LogTable de toutes les lignes, EnrichmentCacheStats)
+    """
+    sources = [LogSource(path, cache_dir, geoip_path) for path in paths]
+    results = run_tasks(iter_tasks(sources, workers), workers, geoip_path)
+    return collect_tables(sources, results)
+
+
+def sketch_logs(paths, workers, error=SKETCH_ERROR, geoip_path=GEOIP_DB_PATH):
+    """Comme analyse_logs, en mémoire bornée : chaque morceau est résumé par
+    ses sketches, fusionnés dans l'ordre. Le cache des tables n'est pas utilisé.
+
+    Returns:
+        (LogSketches, EnrichmentCacheStats)
+    """
+    sources = [LogSource(path, geoip_path=geoip_path) for path in paths]
+    results = run_tasks(iter_tasks(sources, workers), workers, geoip_path, error)
+    sketches = LogSketches(error)
+    cache_stats = EnrichmentCacheStats()
+    for _, _, (partial, stats) in track(results, description="Parsing chunks"):
+        sketches.merge(partial)
+        cache_stats.merge(stats)
+    return sketches, cache_stats
+
+
+def run_tasks(tasks, workers, geoip_path, sketch_error=None):
+    """Résultats des tâches dans l'ordre, dans ce processus ou dans un pool."""
+    if workers == 1:
+        init_worker(geoip_path, sketch_error)
+        yield from map(run_task, tasks)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(geoip_path, sketch_error),
+    ) as executor:
+        yield from ordered_map(executor, run_task, tasks, workers * 2)
+
+
+def collect_tables(sources, results):
+    """Ajoute les tables parsées à celles du cache, log par log, et met le
+    cache à jour.
+    """
+    parsed = [[] for _ in sources]
+    incomplete = [[] for _ in sources]
+    cache_stats = EnrichmentCacheStats()
+    for index, cacheable, (table, stats) in track(
+        results, description="Parsing chunks"
+    ):
+        (parsed if cacheable else incomplete)[index].append(table)
+        cache_stats.merge(stats)
+
+    tables = []
+    for source, new_tables, tail in zip(sources, parsed, incomplete):
+        cached = [] if source.cached is None else [source.cached]
+        table = LogTable.concat(cached + new_tables)
+        if new_tables and source.cache_path:
+            source.save_cache(table)
+        tables.append(table)
+        tables.extend(tail)
+    return LogTable.concat(tables), cache_stats
+
+
+def analyse(table, cache_stats):
+    for analysis in ANALYSES:
+        analysis(table)
+    cache_stats.display()
 
 
 def main():
-    zip_path = "../../medias/analyseLogs/apache.zip"
-    with zipfile.ZipFile(zip_path, "r") as myzip:
-        with myzip.open("apache.log") as myfile:
-            myfile = io.TextIOWrapper(myfile, encoding="utf8", newline="")
-            lines = myfile.readlines()
-            parsed = parse_lines(lines)
-            analyse(parsed)
+    arg_parser = argparse.ArgumentParser(description="Analyse de logs Apache")
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[LOG_ZIP_PATH],
+        help="Logs à analyser (texte, .gz, .zip ou motif glob de logs tournés)",
+    )
+    arg_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Nombre de processus de parsing",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        default=CACHE_DIR,
+        help="Répertoire des tables déjà parsées",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reparse tous les logs sans lire ni écrire le cache",
+    )
+    arg_parser.add_argument(
+        "--sketches",
+        action="store_true",
+        help="Analyses approximatives en mémoire bornée (sans cache)",
+    )
+    arg_parser.add_argument(
+        "--sketch-error",
+        type=float,
+        default=SKETCH_ERROR,
+        help="Erreur relative des sketches (0.01 : 1 %%)",
+    )
+    args = arg_parser.parse_args()
+    if not 0 < args.sketch_error < 1:
+        arg_parser.error("--sketch-error doit être compris entre 0 et 1")
+
+    paths = []
+    for pattern in args.paths:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    workers = max(1, args.workers)
+    if args.sketches:
+        sketches, cache_stats = sketch_logs(paths, workers, args.sketch_error)
+        sketches.display()
+        cache_stats.display()
+        return
+    cache_dir = None if args.no_cache else args.cache_dir
+    analyse(*analyse_logs(paths, workers, cache_dir=cache_dir))
 
 
 if __name__ == "__main__":
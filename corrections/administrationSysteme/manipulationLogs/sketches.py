@@ -0,0 +1,246 @@
+"""Sketches : résumés approximatifs d'un flux, en mémoire bornée.
+
+La mémoire de chaque sketch ne dépend que de l'erreur choisie, pas du nombre
+de lignes ni du nombre de clés distinctes. Deux sketches de mêmes paramètres
+se fusionnent (merge), ce qui permet d'en construire un par morceau de log,
+dans des processus différents.
+
+- HyperLogLog : nombre de valeurs distinctes ;
+- CountMinSketch : fréquence (ou poids) de chaque clé, surestimée au plus de
+  error * total avec une probabilité confidence ;
+- HeavyHitters : clés les plus fréquentes, estimées par un Count-Min ;
+- TDigest : quantiles (percentiles) d'une distribution.
+"""
+
+import hashlib
+import heapq
+import math
+
+import numpy as np
+
+MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def mix64(values):
+    """Hache des entiers en 64 bits (splitmix64), de façon vectorisée.
+    Contrairement à hash(), le résultat est le même dans tous les processus.
+    """
+    z = np.asarray(values).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def hash_keys(keys):
+    """Hachages 64 bits d'une liste de clés (entiers ou chaînes)."""
+    if len(keys) and isinstance(keys[0], str):
+        digests = (hashlib.blake2b(key.encode(), digest_size=8) for key in keys)
+        return np.array(
+            [int.from_bytes(digest.digest(), "big") for digest in digests],
+            dtype=np.uint64,
+        )
+    return mix64(np.asarray(keys, dtype=np.uint64))
+
+
+class HyperLogLog:
+    """Nombre approximatif de valeurs distinctes.
+    2**precision registres d'un octet ; erreur type 1.04 / sqrt(2**precision).
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Précision HyperLogLog invalide : {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, error):
+        precision = math.ceil(math.log2((1.04 / error) ** 2))
+        return cls(min(18, max(4, precision)))
+
+    @property
+    def standard_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, values):
+        """Ajoute des entiers (tableau NumPy), les doublons ne comptent pas."""
+        self.add_hashes(mix64(values))
+
+    def add_hashes(self, hashes):
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # rang du premier bit à 1 : frexp donne le nombre de bits significatifs
+        _, length = np.frexp(rest.astype(np.float64))
+        rank = (bits - length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # petites cardinalités : comptage linéaire des registres vides
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog de précisions différentes")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+
+class CountMinSketch:
+    """Poids approximatif de chaque clé : depth lignes de width compteurs.
+    L'estimation ne sous-estime jamais ; elle surestime d'au plus
+    error * total avec une probabilité confidence.
+    """
+
+    def __init__(self, width, depth):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width))
+        self.total = 0.0
+
+    @classmethod
+    def from_error(cls, error, confidence=0.99):
+        width = math.ceil(math.e / error)
+        depth = math.ceil(math.log(1 / (1 - confidence)))
+        return cls(width, depth)
+
+    def _columns(self, hashes):
+        # une colonne par ligne, dérivée de deux moitiés du hachage
+        low = (hashes & MASK32)[None, :]
+        high = ((hashes >> np.uint64(32)) | np.uint64(1))[None, :]
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low + rows * high) % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, hashes, weights=None):
+        if weights is None:
+            weights = np.ones(len(hashes))
+        weights = np.asarray(weights, dtype=np.float64)
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            self.table[row] += np.bincount(
+                columns[row], weights=weights, minlength=self.width
+            )
+        self.total += weights.sum()
+
+    def estimate(self, hashes):
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-Min de dimensions différentes")
+        self.table += other.table
+        self.total += other.total
+
+
+class HeavyHitters:
+    """Clés les plus fréquentes (ou les plus lourdes) d'un flux.
+    Un Count-Min estime les poids ; seules les capacity meilleures clés
+    candidates sont conservées, réestimées à chaque ajout et à chaque fusion.
+    """
+
+    def __init__(self, sketch, capacity=100):
+        self.sketch = sketch
+        self.capacity = capacity
+        self.candidates = {}
+
+    @classmethod
+    def from_error(cls, error, confidence=0.99, capacity=100):
+        return cls(CountMinSketch.from_error(error, confidence), capacity)
+
+    def add(self, keys, weights=None):
+        """Ajoute des clés (entiers ou chaînes), avec leur poids (1 par défaut)."""
+        keys = keys.tolist() if isinstance(keys, np.ndarray) else list(keys)
+        self.sketch.add(hash_keys(keys), weights)
+        self._select(keys)
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        self._select(list(other.candidates))
+
+    def _select(self, keys):
+        keys = list(dict.fromkeys([*self.candidates, *keys]))
+        if not keys:
+            return
+        estimates = self.sketch.estimate(hash_keys(keys)).tolist()
+        best = heapq.nlargest(
+            self.capacity, zip(keys, estimates), key=lambda item: item[1]
+        )
+        self.candidates = dict(best)
+
+    def top(self, count):
+        """Les count clés les plus lourdes, avec leur poids estimé."""
+        return heapq.nlargest(count, self.candidates.items(), key=lambda item: item[1])
+
+
+class TDigest:
+    """Quantiles approximatifs d'une distribution.
+    Les valeurs sont regroupées en centroïdes (moyenne, poids), petits aux
+    extrémités et plus gros au centre : les percentiles élevés restent précis.
+    Le nombre de centroïdes est de l'ordre de compression.
+    """
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        means, counts = np.unique(values, return_counts=True)
+        self.min = min(self.min, means[0])
+        self.max = max(self.max, means[-1])
+        self._compress(
+            np.concatenate([self.means, means]),
+            np.concatenate([self.weights, counts.astype(np.float64)]),
+        )
+
+    def merge(self, other):
+        if not len(other.means):
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order].tolist(), weights[order].tolist()
+        total = sum(weights)
+        merged_means, merged_weights = [means[0]], [weights[0]]
+        closed = 0.0  # poids des centroïdes déjà complets
+        for mean, weight in zip(means[1:], weights[1:]):
+            current = merged_weights[-1]
+            q = (closed + (current + weight) / 2) / total
+            if current + weight <= 4 * total * q * (1 - q) / self.compression:
+                merged_weights[-1] = current + weight
+                merged_means[-1] += (mean - merged_means[-1]) * weight / (
+                    current + weight
+                )
+            else:
+                closed += current
+                merged_means.append(mean)
+                merged_weights.append(weight)
+        self.means = np.array(merged_means)
+        self.weights = np.array(merged_weights)
+
+    def quantile(self, q):
+        """Valeur du quantile q (entre 0 et 1), interpolée entre centroïdes."""
+        if not len(self.means):
+            return math.nan
+        cumulative = np.cumsum(self.weights)
+        centers = cumulative - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [cumulative[-1]]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * cumulative[-1], positions, values))
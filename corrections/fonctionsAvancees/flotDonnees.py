@@ -0,0 +1,356 @@
+"""Petit moteur de flot de données : un graphe d'étapes qui traitent des lots.
+
+Chaque étape tourne dans son propre thread et lit ses lots dans une file
+bornée. Une étape lente (affichage, envoi réseau) ne bloque donc ses
+prédécesseurs que lorsque sa file est pleine : c'est la contre-pression.
+Le changement d'étape se paie une fois par lot et non plus par ligne.
+Une étape coûteuse en calcul peut s'exécuter dans un pool de processus.
+
+    graphe = Graphe()
+    graphe.etape("parser", parser_lot, sorties=["404"], execution="process")
+    graphe.etape("404", depuis_coroutine(trouver_erreur_404), sorties=["afficher"])
+    graphe.etape("afficher", depuis_coroutine(lambda sortie: afficher()))
+    graphe.executer(lots)
+    graphe.afficher_statistiques()
+
+Une fonction d'étape reçoit un lot (une liste) et retourne la liste de ses
+résultats, envoyée à toutes ses sorties. Elle ne doit pas modifier le lot
+reçu : il est partagé entre les étapes qui suivent une même étape.
+
+Avec executer(lots, acquitter=...), chaque lot de la source est accompagné
+d'un jeton (une position de lecture par exemple). Le jeton est acquitté
+quand le lot, et tout ce qui en a été tiré, a été traité par toutes les
+étapes : c'est le moment d'enregistrer un checkpoint.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty, Queue
+
+# Nombre de lots en attente devant une étape avant de bloquer ses prédécesseurs
+TAILLE_FILE = 8
+EXECUTIONS = ("thread", "process")
+
+# Avec des lots en vol dans le pool, délai d'attente d'un nouveau lot avant
+# de regarder si des résultats sont prêts à être émis
+ATTENTE_RESULTATS = 0.05
+
+# Marque de fin de flot, envoyée par chaque prédécesseur
+FIN = object()
+
+
+def en_lots(elements, taille):
+    """Regroupe un itérable d'éléments en lots de taille éléments au plus."""
+    lot = []
+    for element in elements:
+        lot.append(element)
+        if len(lot) >= taille:
+            yield lot
+            lot = []
+    if lot:
+        yield lot
+
+
+class _Collecteur:
+    """Sortie donnée à une coroutine enveloppée : accumule ce qu'elle envoie."""
+
+    def __init__(self):
+        self.elements = []
+
+    def send(self, element):
+        self.elements.append(element)
+
+
+def depuis_coroutine(fabrique):
+    """Transforme une coroutine (trouver_erreur_404, poids_images...) en
+    fonction de lot. fabrique reçoit la sortie de la coroutine et retourne la
+    coroutine démarrée ; son état est conservé d'un lot à l'autre.
+    """
+    collecteur = _Collecteur()
+    coroutine = fabrique(collecteur)
+
+    def traiter(lot):
+        for element in lot:
+            coroutine.send(element)
+        sortie, collecteur.elements = collecteur.elements, []
+        return sortie
+
+    return traiter
+
+
+class _Suivi:
+    """Lots de la source encore dans le graphe, dans l'ordre d'envoi.
+    Le jeton acquitté est celui du dernier lot d'une suite de lots terminés :
+    un lot lent retient ceux qui ont été envoyés après lui.
+    """
+
+    def __init__(self, acquitter):
+        self.acquitter = acquitter
+        self.verrou = threading.Lock()
+        self.lots = deque()
+
+    def accuse(self, jeton, restant):
+        accuse = _Accuse(self, jeton, restant)
+        with self.verrou:
+            self.lots.append(accuse)
+        return accuse
+
+
+class _Accuse:
+    """Accusé d'un lot de la source : compte les lots qui en sont tirés et
+    qui attendent encore d'être traités, dans les files ou dans un pool.
+    """
+
+    def __init__(self, suivi, jeton, restant):
+        self.suivi = suivi
+        self.jeton = jeton
+        self.restant = restant
+
+    def prendre(self, nombre):
+        with self.suivi.verrou:
+            self.restant += nombre
+
+    def rendre(self):
+        suivi = self.suivi
+        with suivi.verrou:
+            self.restant -= 1
+            dernier = None
+            while suivi.lots and suivi.lots[0].restant == 0:
+                dernier = suivi.lots.popleft()
+            # sous le verrou : les jetons sont acquittés dans l'ordre
+            if dernier is not None and suivi.acquitter is not None:
+                suivi.acquitter(dernier.jeton)
+
+
+class Statistiques:
+    """Compteurs d'une étape, mis à jour par son thread."""
+
+    def __init__(self):
+        self.lots = 0
+        self.entrees = 0
+        self.sorties = 0
+        self.latence_totale = 0.0
+        self.latence_max = 0.0
+        # attente sur les files pleines des successeurs (contre-pression)
+        self.blocage = 0.0
+        self.debut = None
+        self.fin = None
+
+    def debit(self):
+        """Éléments traités par seconde, entre le premier et le dernier lot."""
+        if self.debut is None or self.fin == self.debut:
+            return 0.0
+        return self.entrees / (self.fin - self.debut)
+
+    def latence_moyenne(self):
+        return self.latence_totale / self.lots if self.lots else 0.0
+
+
+class Etape:
+    """Une étape du graphe, exécutée dans son propre thread."""
+
+    def __init__(self, nom, fonction, sorties, execution, workers, taille_file):
+        if execution not in EXECUTIONS:
+            raise ValueError(
+                f"Exécution invalide pour {nom} : {execution} "
+                f"(valides : {', '.join(EXECUTIONS)})"
+            )
+        self.nom = nom
+        self.fonction = fonction
+        self.sorties = list(sorties)
+        self.execution = execution
+        self.workers = workers
+        self.file = Queue(maxsize=taille_file)
+        self.successeurs = []
+        self.nb_entrees = 0
+        self.stats = Statistiques()
+        self.erreur = None
+        self._pool = None
+        self._en_cours = deque()
+
+    def boucle(self):
+        """Corps du thread : traite les lots jusqu'à la fin de tous ses flots.
+        Après une erreur, les lots sont encore lus (et ignorés) pour ne pas
+        bloquer les étapes précédentes ; ils ne sont jamais acquittés.
+        """
+        if self.execution == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        fins = 0
+        try:
+            while fins < self.nb_entrees:
+                try:
+                    message = self._lire()
+                except Empty:
+                    self._proteger(self._emettre_prets)
+                    continue
+                if message is FIN:
+                    fins += 1
+                elif self.erreur is None:
+                    self._proteger(self._traiter, *message)
+            while self._en_cours and self.erreur is None:
+                self._proteger(self._terminer_premier)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            for successeur in self.successeurs:
+                successeur.file.put(FIN)
+
+    def _lire(self):
+        """Lot suivant ; sans attente indéfinie tant que des résultats du
+        pool restent à émettre, pour ne pas les retenir jusqu'au lot suivant.
+        """
+        if self._en_cours and self.erreur is None:
+            return self.file.get(timeout=ATTENTE_RESULTATS)
+        return self.file.get()
+
+    def _proteger(self, fonction, *args):
+        try:
+            fonction(*args)
+        except Exception as erreur:  # relancée par Graphe.executer
+            self.erreur = erreur
+
+    def _traiter(self, lot, accuse):
+        debut = time.perf_counter()
+        if self.stats.debut is None:
+            self.stats.debut = debut
+        if self._pool is None:
+            self._emettre(lot, accuse, debut, self.fonction(lot))
+            return
+        # résultats émis dans l'ordre, avec au plus 2 lots par processus en vol
+        future = self._pool.submit(self.fonction, lot)
+        self._en_cours.append((lot, accuse, debut, future))
+        while len(self._en_cours) >= self.workers * 2:
+            self._terminer_premier()
+        self._emettre_prets()
+
+    def _emettre_prets(self):
+        while self._en_cours and self._en_cours[0][3].done():
+            self._terminer_premier()
+
+    def _terminer_premier(self):
+        lot, accuse, debut, future = self._en_cours.popleft()
+        self._emettre(lot, accuse, debut, future.result())
+
+    def _emettre(self, lot, accuse, debut, sortie):
+        maintenant = time.perf_counter()
+        stats = self.stats
+        stats.lots += 1
+        stats.entrees += len(lot)
+        stats.latence_totale += maintenant - debut
+        stats.latence_max = max(stats.latence_max, maintenant - debut)
+        if sortie:
+            stats.sorties += len(sortie)
+            accuse.prendre(len(self.successeurs))
+            for successeur in self.successeurs:
+                successeur.file.put((sortie, accuse))
+            stats.blocage += time.perf_counter() - maintenant
+        accuse.rendre()
+        stats.fin = time.perf_counter()
+
+
+class Graphe:
+    """Graphe orienté acyclique d'étapes, déclarées par leur nom."""
+
+    def __init__(self, taille_file=TAILLE_FILE):
+        self.taille_file = taille_file
+        self.etapes = {}
+
+    def etape(self, nom, fonction, sorties=(), execution="thread", workers=1):
+        """Déclare une étape.
+
+        Args:
+            nom: Nom de l'étape, utilisé dans les sorties des autres étapes
+            fonction: Fonction de lot (picklable si execution="process")
+            sorties: Noms des étapes qui reçoivent ses résultats
+            execution: "thread" ou "process" (pool de workers processus)
+            workers: Nombre de processus en exécution "process"
+        """
+        if nom in self.etapes:
+            raise ValueError(f"Étape déjà déclarée : {nom}")
+        self.etapes[nom] = Etape(
+            nom, fonction, sorties, execution, workers, self.taille_file
+        )
+        return self
+
+    def _relier(self):
+        """Résout les sorties et retourne les étapes racines (sans entrée)."""
+        for etape in self.etapes.values():
+            etape.successeurs = []
+            etape.nb_entrees = 0
+            etape.stats = Statistiques()
+            etape.erreur = None
+        for etape in self.etapes.values():
+            for nom in etape.sorties:
+                if nom not in self.etapes:
+                    raise ValueError(f"Sortie inconnue pour {etape.nom} : {nom}")
+                etape.successeurs.append(self.etapes[nom])
+                self.etapes[nom].nb_entrees += 1
+
+        # tri topologique : toutes les étapes doivent être atteintes
+        entrees = {etape.nom: etape.nb_entrees for etape in self.etapes.values()}
+        a_visiter = [nom for nom, nombre in entrees.items() if nombre == 0]
+        racines = [self.etapes[nom] for nom in a_visiter]
+        visitees = 0
+        while a_visiter:
+            visitees += 1
+            for successeur in self.etapes[a_visiter.pop()].successeurs:
+                entrees[successeur.nom] -= 1
+                if entrees[successeur.nom] == 0:
+                    a_visiter.append(successeur.nom)
+        if visitees != len(self.etapes):
+            raise ValueError("Le graphe d'étapes contient un cycle")
+
+        for racine in racines:
+            racine.nb_entrees = 1  # la source
+        return racines
+
+    def executer(self, lots, acquitter=None):
+        """Envoie chaque lot aux étapes racines et attend la fin du traitement.
+        L'envoi bloque quand les files des racines sont pleines.
+
+        Args:
+            lots: Itérable de lots, ou de tuples (lot, jeton) avec acquitter
+            acquitter: Fonction appelée, dans l'ordre des lots, avec le jeton
+                du dernier lot entièrement traité
+        """
+        racines = self._relier()
+        suivi = _Suivi(acquitter)
+        threads = [
+            threading.Thread(target=etape.boucle, name=f"etape-{nom}", daemon=True)
+            for nom, etape in self.etapes.items()
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for lot in lots:
+                if any(etape.erreur for etape in self.etapes.values()):
+                    break
+                jeton = None
+                if acquitter is not None:
+                    lot, jeton = lot
+                accuse = suivi.accuse(jeton, len(racines))
+                for racine in racines:
+                    racine.file.put((lot, accuse))
+        finally:
+            for racine in racines:
+                racine.file.put(FIN)
+            for thread in threads:
+                thread.join()
+        for etape in self.etapes.values():
+            if etape.erreur is not None:
+                raise RuntimeError(f"Échec de l'étape {etape.nom}") from etape.erreur
+
+    def afficher_statistiques(self):
+        print(
+            f"{'Étape':<12}{'Lots':>8}{'Entrées':>10}{'Sorties':>10}"
+            f"{'Débit/s':>12}{'Lat. moy. ms':>14}{'Lat. max ms':>13}{'Blocage s':>11}"
+        )
+        for nom, etape in self.etapes.items():
+            stats = etape.stats
+            print(
+                f"{nom:<12}{stats.lots:>8}{stats.entrees:>10}{stats.sorties:>10}"
+                f"{stats.debit():>12.0f}{stats.latence_moyenne() * 1000:>14.2f}"
+                f"{stats.latence_max * 1000:>13.2f}{stats.blocage:>11.2f}"
+            )
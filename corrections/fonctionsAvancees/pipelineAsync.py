@@ -0,0 +1,303 @@
+"""Variante asyncio du pipeline de pipelineConsommateur.py.
+
+Chaque étape est une tâche qui lit des lots dans une asyncio.Queue bornée :
+
+    sources (une par log) › parser › filtres (404, images) › puits
+
+Les puits (affichage, webhook d'alerte...) sont des fonctions async appelées
+avec une concurrence bornée. Un puits lent n'empêche pas les autres
+d'avancer ; il ne ralentit le parsing que lorsque sa file est pleine.
+Plusieurs logs sont suivis dans le même processus, par la même boucle.
+
+Chaque lot circule avec son accusé : la position qui le suit n'est
+enregistrée qu'une fois le lot traité par toutes les étapes et tous ses
+messages envoyés par tous les puits. Un arrêt brutal fait relire les lots
+qui étaient en vol, il n'en perd aucun.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import urllib.request
+from collections import deque
+
+from flotDonnees import depuis_coroutine
+from pipelineConsommateur import (
+    ATTENTE_INACTIVITE,
+    TAILLE_LOT,
+    fichier_remplace,
+    lire_checkpoint,
+    lire_lot,
+    parser_lot,
+    poids_images,
+    sauver_checkpoint,
+    trouver_erreur_404,
+)
+
+# Nombre de lots en attente devant une étape avant de bloquer la précédente
+TAILLE_FILE = 8
+
+# Marque de fin de flot, envoyée par chaque étape précédente
+FIN = None
+
+
+class Avancement:
+    """Lots d'un log encore en vol, dans l'ordre de lecture.
+    La position enregistrée est celle qui suit le dernier lot d'une suite
+    de lots terminés : un lot lent retient ceux qui ont été lus après lui.
+    """
+
+    def __init__(self, chemin_checkpoint=None):
+        self.chemin_checkpoint = chemin_checkpoint
+        self.lots = deque()
+
+    def accuse(self, inode, offset):
+        accuse = Accuse(self, inode, offset)
+        self.lots.append(accuse)
+        return accuse
+
+    def avancer(self):
+        dernier = None
+        while self.lots and self.lots[0].restant == 0:
+            dernier = self.lots.popleft()
+        if dernier is not None and self.chemin_checkpoint:
+            sauver_checkpoint(self.chemin_checkpoint, dernier.inode, dernier.offset)
+
+
+class Accuse:
+    """Accusé d'un lot : compte les traitements qui restent à faire (lots
+    dérivés en attente dans une file, envois en cours dans un puits).
+    """
+
+    def __init__(self, avancement, inode, offset):
+        self.avancement = avancement
+        self.inode = inode
+        self.offset = offset
+        self.restant = 1
+
+    def prendre(self, nombre=1):
+        self.restant += nombre
+
+    def rendre(self):
+        self.restant -= 1
+        if self.restant == 0:
+            self.avancement.avancer()
+
+
+async def ouvrir_async(chemin, attente):
+    """Ouvre le fichier suivi (en attendant qu'il existe) et retourne son inode."""
+    while True:
+        try:
+            f = open(chemin, "rb")
+        except FileNotFoundError:
+            await asyncio.sleep(attente)
+            continue
+        return f, os.fstat(f.fileno()).st_ino
+
+
+async def suivre_fichier_async(
+    chemin,
+    chemin_checkpoint=None,
+    taille_lot=TAILLE_LOT,
+    attente=ATTENTE_INACTIVITE,
+    suivre=True,
+):
+    """Version asynchrone de suivre_positions (rotation, reprise, lots).
+    Les lectures se font dans un thread (asyncio.to_thread) et les attentes
+    avec asyncio.sleep : la boucle reste libre pour les autres logs et les
+    puits. Avec suivre=False, le log est lu une fois jusqu'à sa fin.
+
+    Produit des tuples (lot, inode, position après le lot). La lecture
+    reprend au checkpoint, mais c'est à l'appelant de l'enregistrer, quand
+    le lot a vraiment été traité.
+    """
+    f, inode = await ouvrir_async(chemin, attente)
+    reprise = lire_checkpoint(chemin_checkpoint) if chemin_checkpoint else None
+    if reprise and reprise[0] == inode and reprise[1] <= os.fstat(f.fileno()).st_size:
+        f.seek(reprise[1])
+    try:
+        while True:
+            lot = await asyncio.to_thread(lire_lot, f, taille_lot)
+            if lot:
+                yield lot, inode, f.tell()
+            elif not suivre:
+                return
+            elif fichier_remplace(chemin, inode, f.tell()):
+                f.close()
+                f, inode = await ouvrir_async(chemin, attente)
+            else:
+                await asyncio.sleep(attente)
+    finally:
+        f.close()
+
+
+async def source(chemin, sortie, chemin_checkpoint=None, **options):
+    avancement = Avancement(chemin_checkpoint)
+    lots = suivre_fichier_async(chemin, chemin_checkpoint, **options)
+    async for lot, inode, offset in lots:
+        await sortie.put((lot, avancement.accuse(inode, offset)))
+    await sortie.put(FIN)
+
+
+async def etape(entree, fonction, sorties, nb_entrees=1):
+    """Applique une fonction de lot (synchrone et rapide) et diffuse son
+    résultat à toutes les sorties, avec l'accusé du lot d'origine.
+    """
+    fins = 0
+    while fins < nb_entrees:
+        message = await entree.get()
+        if message is FIN:
+            fins += 1
+            continue
+        lot, accuse = message
+        resultat = fonction(lot)
+        if resultat:
+            accuse.prendre(len(sorties))
+            for sortie in sorties:
+                await sortie.put((resultat, accuse))
+        accuse.rendre()
+    for sortie in sorties:
+        await sortie.put(FIN)
+
+
+async def puits(entree, envoyer, concurrence=1, nb_entrees=1):
+    """Envoie chaque message avec envoyer, au plus concurrence à la fois.
+    Quand toutes les places sont prises, le puits ne lit plus sa file : la
+    contre-pression remonte jusqu'aux sources. Un envoi en échec est signalé
+    sans arrêter le pipeline (ni le relire au redémarrage).
+    """
+    limite = asyncio.Semaphore(concurrence)
+    en_cours = set()
+
+    async def envoyer_message(message, accuse):
+        try:
+            await envoyer(message)
+        except Exception as erreur:
+            print(f"Échec de l'envoi de {message!r} : {erreur!r}", file=sys.stderr)
+        finally:
+            limite.release()
+            accuse.rendre()
+
+    fins = 0
+    while fins < nb_entrees:
+        recu = await entree.get()
+        if recu is FIN:
+            fins += 1
+            continue
+        lot, accuse = recu
+        for message in lot:
+            await limite.acquire()
+            accuse.prendre()
+            tache = asyncio.create_task(envoyer_message(message, accuse))
+            en_cours.add(tache)
+            tache.add_done_callback(en_cours.discard)
+        accuse.rendre()
+    await asyncio.gather(*en_cours)
+
+
+async def afficher_async(message):
+    print(message)
+
+
+def webhook(url, timeout=5):
+    """Puits qui poste chaque alerte en JSON sur url.
+    urllib est bloquant : l'appel tourne dans un thread.
+    """
+
+    def poster(message):
+        requete = urllib.request.Request(
+            url,
+            data=json.dumps({"message": message}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(requete, timeout=timeout) as reponse:
+            reponse.read()
+
+    async def envoyer(message):
+        await asyncio.to_thread(poster, message)
+
+    return envoyer
+
+
+def alerte_simulee(delai):
+    """Puits qui simule un service d'alerte lent (delai secondes par appel)."""
+
+    async def envoyer(message):
+        await asyncio.sleep(delai)
+
+    return envoyer
+
+
+async def executer(chemins, sorties, suivre=False, taille_lot=TAILLE_LOT):
+    """Construit et exécute le graphe pour plusieurs logs.
+
+    Args:
+        chemins: Logs à lire (ou à suivre)
+        sorties: Puits sous la forme (fonction async d'envoi, concurrence)
+        suivre: Suit les logs (avec checkpoint <chemin du log>.offset, à
+            côté de chaque log) au lieu de les lire une seule fois
+        taille_lot: Nombre maximal de lignes par lot
+    """
+    lignes = asyncio.Queue(TAILLE_FILE)
+    vers_404 = asyncio.Queue(TAILLE_FILE)
+    vers_images = asyncio.Queue(TAILLE_FILE)
+    files_puits = [asyncio.Queue(TAILLE_FILE) for _ in sorties]
+
+    taches = [
+        source(
+            chemin,
+            lignes,
+            chemin_checkpoint=chemin + ".offset" if suivre else None,
+            taille_lot=taille_lot,
+            suivre=suivre,
+        )
+        for chemin in chemins
+    ]
+    taches += [
+        etape(lignes, parser_lot, [vers_404, vers_images], nb_entrees=len(chemins)),
+        etape(vers_404, depuis_coroutine(trouver_erreur_404), files_puits),
+        etape(vers_images, depuis_coroutine(poids_images), files_puits),
+    ]
+    taches += [
+        puits(file, envoyer, concurrence, nb_entrees=2)
+        for file, (envoyer, concurrence) in zip(files_puits, sorties)
+    ]
+    await asyncio.gather(*taches)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Pipeline asyncio de logs")
+    arg_parser.add_argument("chemins", nargs="+", help="Logs Apache à analyser")
+    arg_parser.add_argument(
+        "-f", "--suivre", action="store_true", help="Suit les logs (tail -F)"
+    )
+    arg_parser.add_argument("--lot", type=int, default=TAILLE_LOT)
+    arg_parser.add_argument("--webhook", help="URL qui reçoit les alertes en JSON")
+    arg_parser.add_argument(
+        "--latence-simulee",
+        type=float,
+        help="Ajoute un puits d'alerte simulé qui prend ce délai par appel",
+    )
+    arg_parser.add_argument(
+        "--concurrence",
+        type=int,
+        default=10,
+        help="Appels simultanés maximum par puits d'alerte",
+    )
+    args = arg_parser.parse_args()
+
+    sorties = [(afficher_async, 1)]
+    if args.webhook:
+        sorties.append((webhook(args.webhook), args.concurrence))
+    if args.latence_simulee:
+        sorties.append((alerte_simulee(args.latence_simulee), args.concurrence))
+    try:
+        asyncio.run(executer(args.chemins, sorties, args.suivre, args.lot))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
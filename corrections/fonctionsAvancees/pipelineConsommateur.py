@@ -1,7 +1,19 @@
 import re
+import os
+import json
+import argparse
 from itertools import cycle
 import time
 
+from flotDonnees import Graphe, depuis_coroutine, en_lots
+
+LOG_EXEMPLE = "../../media/logs_apache_exemple.txt"
+
+# Nombre maximal de lignes lues d'un coup en mode suivi
+TAILLE_LOT = 500
+# Attente quand le fichier suivi n'a pas de nouvelles lignes (secondes)
+ATTENTE_INACTIVITE = 0.2
+
 
 def parser_ligne_log_apache(ligne):
     """Permet de parser une ligne de log apache.
@@ -86,9 +98,36 @@ def build_pipeline():
     return parser
 
 
-def main():
-    f = open("../../media/logs_apache_exemple.txt")
-    pipeline = build_pipeline()
+def parser_lot(lot):
+    """Parseur par lot pour le moteur de flot de données.
+    Fonction de module : elle peut être envoyée à un pool de processus.
+    """
+    return [ligne for ligne in map(parser_ligne_log_apache, lot) if ligne]
+
+
+def build_graphe(processus=0):
+    """Le même graphe que build_pipeline, déclaré pour le moteur de flot.
+    Les filtres et l'affichage réutilisent les coroutines ; le parsing,
+    le plus coûteux, peut tourner dans un pool de processus.
+    """
+    graphe = Graphe()
+    graphe.etape(
+        "parser",
+        parser_lot,
+        sorties=["erreur404", "images"],
+        execution="process" if processus else "thread",
+        workers=max(1, processus),
+    )
+    graphe.etape(
+        "erreur404", depuis_coroutine(trouver_erreur_404), sorties=["afficher"]
+    )
+    graphe.etape("images", depuis_coroutine(poids_images), sorties=["afficher"])
+    graphe.etape("afficher", depuis_coroutine(lambda sortie: afficher()))
+    return graphe
+
+
+def simuler(chemin, pipeline):
+    f = open(chemin)
     # on simule un fichier infini
     for line in cycle(f):
         # on simule des connexions "lentes"
@@ -96,6 +135,167 @@ def main():
         pipeline.send(line)
 
 
+def lire_checkpoint(chemin_checkpoint):
+    """Position de lecture enregistrée : (inode, offset), ou None."""
+    try:
+        with open(chemin_checkpoint) as f:
+            donnees = json.load(f)
+        return donnees["inode"], donnees["offset"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def sauver_checkpoint(chemin_checkpoint, inode, offset):
+    """Enregistre la position de lecture.
+    Remplacement atomique : un arrêt brutal ne laisse pas de fichier à moitié écrit.
+    """
+    temporaire = chemin_checkpoint + ".tmp"
+    with open(temporaire, "w") as f:
+        json.dump({"inode": inode, "offset": offset}, f)
+    os.replace(temporaire, chemin_checkpoint)
+
+
+def ouvrir(chemin, attente):
+    """Ouvre le fichier suivi (en attendant qu'il existe) et retourne son inode."""
+    while True:
+        try:
+            f = open(chemin, "rb")
+        except FileNotFoundError:
+            time.sleep(attente)
+            continue
+        return f, os.fstat(f.fileno()).st_ino
+
+
+def lire_lot(f, taille_lot):
+    """Lit au plus taille_lot lignes complètes.
+    Une ligne en cours d'écriture (sans saut de ligne) est relue plus tard.
+    """
+    lot = []
+    while len(lot) < taille_lot:
+        position = f.tell()
+        ligne = f.readline()
+        if not ligne.endswith(b"\n"):
+            f.seek(position)
+            break
+        lot.append(ligne.decode("utf8", errors="replace"))
+    return lot
+
+
+def fichier_remplace(chemin, inode, position):
+    """Vrai si le log a tourné (nouveau fichier au même chemin) ou est tronqué."""
+    try:
+        stat = os.stat(chemin)
+    except FileNotFoundError:
+        # ancien fichier déplacé, le nouveau n'est pas encore créé
+        return False
+    return stat.st_ino != inode or stat.st_size < position
+
+
+def suivre_positions(
+    chemin, chemin_checkpoint=None, taille_lot=TAILLE_LOT, attente=ATTENTE_INACTIVITE
+):
+    """Suit un log qui grandit, comme tail -F, et produit des tuples
+    (lot de lignes, inode, position après le lot).
+
+    Tant que des lignes sont disponibles, elles sont lues sans attente ; on
+    n'attend que lorsque le fichier n'a rien de nouveau. La lecture reprend
+    à la position du checkpoint, mais c'est à l'appelant de l'enregistrer,
+    quand le lot a vraiment été traité.
+    Si le log tourne ou est tronqué, la fin de l'ancien fichier est lue puis
+    la lecture reprend au début du nouveau.
+    """
+    f, inode = ouvrir(chemin, attente)
+    reprise = lire_checkpoint(chemin_checkpoint) if chemin_checkpoint else None
+    if reprise and reprise[0] == inode and reprise[1] <= os.fstat(f.fileno()).st_size:
+        f.seek(reprise[1])
+    try:
+        while True:
+            lot = lire_lot(f, taille_lot)
+            if lot:
+                yield lot, inode, f.tell()
+            elif fichier_remplace(chemin, inode, f.tell()):
+                f.close()
+                f, inode = ouvrir(chemin, attente)
+            else:
+                time.sleep(attente)
+    finally:
+        f.close()
+
+
+def suivre_fichier(
+    chemin, chemin_checkpoint=None, taille_lot=TAILLE_LOT, attente=ATTENTE_INACTIVITE
+):
+    """Suit un log comme suivre_positions et produit des lots de lignes.
+
+    La position qui suit un lot est enregistrée quand le lot suivant est
+    demandé. Pour un consommateur synchrone (le pipeline de coroutines),
+    c'est après son traitement : un redémarrage reprend là où on s'était
+    arrêté. Le moteur de flot, qui met les lots en file, acquitte lui-même
+    les positions (voir main).
+    """
+    lots = suivre_positions(chemin, chemin_checkpoint, taille_lot, attente)
+    for lot, inode, offset in lots:
+        yield lot
+        if chemin_checkpoint:
+            sauver_checkpoint(chemin_checkpoint, inode, offset)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Pipeline de coroutines")
+    arg_parser.add_argument("chemin", nargs="?", default=LOG_EXEMPLE)
+    arg_parser.add_argument(
+        "-f",
+        "--suivre",
+        action="store_true",
+        help="Suit le log au fil de l'eau (tail -F) au lieu de simuler un log infini",
+    )
+    arg_parser.add_argument(
+        "--checkpoint",
+        help="Fichier de la position de lecture (défaut : <chemin du log>.offset)",
+    )
+    arg_parser.add_argument("--lot", type=int, default=TAILLE_LOT)
+    arg_parser.add_argument(
+        "--moteur",
+        action="store_true",
+        help="Utilise le moteur de flot de données (lots, files bornées, "
+        "statistiques) ; sans -f, le log est lu une seule fois",
+    )
+    arg_parser.add_argument(
+        "--processus",
+        type=int,
+        default=0,
+        help="Avec --moteur : nombre de processus de parsing (0 : un thread)",
+    )
+    args = arg_parser.parse_args()
+    checkpoint = args.checkpoint or args.chemin + ".offset"
+
+    if args.moteur:
+        graphe = build_graphe(args.processus)
+        try:
+            if args.suivre:
+                # position enregistrée quand toutes les branches ont traité le lot
+                lots = suivre_positions(args.chemin, checkpoint, args.lot)
+                graphe.executer(
+                    ((lot, (inode, offset)) for lot, inode, offset in lots),
+                    acquitter=lambda position: sauver_checkpoint(checkpoint, *position),
+                )
+            else:
+                with open(args.chemin) as f:
+                    graphe.executer(en_lots(f, args.lot))
+        except KeyboardInterrupt:
+            pass
+        graphe.afficher_statistiques()
+        return
+
+    pipeline = build_pipeline()
+    if not args.suivre:
+        simuler(args.chemin, pipeline)
+        return
+    for lot in suivre_fichier(args.chemin, checkpoint, args.lot):
+        for ligne in lot:
+            pipeline.send(ligne)
+
+
 if __name__ == "__main__":
     main()
 
@@ -4,14 +4,36 @@ Script de génération de documentation avec pydoc.
 
 Ce script utilise pydoc pour générer automatiquement la documentation
 HTML de tous les modules Python du projet.
+
+Les modules sont documentés en parallèle (un processus par cœur) et seuls
+ceux dont le source a changé depuis la dernière génération sont refaits :
+les empreintes sont conservées dans html/.pydoc_manifest.json. L'empreinte
+d'un module couvre aussi les modules du projet qu'il importe, directement ou
+non (classes de base, fonctions réexportées). Les imports dynamiques et les
+fichiers qui ne sont pas des modules ne sont pas suivis : utiliser --force
+pour tout régénérer.
 """
 
+import argparse
+import ast
+import hashlib
+import importlib
+import json
 import os
 import sys
 import pydoc
-import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
+
+# Feuille de style commune, copiée à côté des pages générées
+STYLESHEET = Path(__file__).parent / "pydoc.css"
+
+# Empreintes des sources de la dernière génération
+MANIFEST_NAME = ".pydoc_manifest.json"
+
+# Empreinte du générateur : une modification de la mise en page invalide tout
+GENERATOR_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
 
 
 def find_python_modules(root_dir: Path, exclude_dirs: set = None) -> List[Dict]:
@@ -57,19 +79,178 @@ def find_python_modules(root_dir: Path, exclude_dirs: set = None) -> List[Dict]:
     return sorted(modules, key=lambda x: x["name"])
 
 
-def generate_pydoc_html(module_name: str, output_dir: Path, project_root: Path) -> None:
+def module_file(project_root: Path, module_name: str) -> Optional[Path]:
+    """
+    Retrouve le fichier source d'un module du projet.
+
+    Args:
+        project_root: Racine du projet
+        module_name: Nom du module (ex: utils.api.transport)
+
+    Returns:
+        Fichier du module ou __init__.py du paquet, None hors du projet
+    """
+    base = project_root.joinpath(*module_name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def module_imports(path: Path, module_name: str) -> Set[str]:
+    """
+    Liste les modules importés par un source, imports relatifs résolus.
+
+    Pour "from paquet import nom", paquet et paquet.nom sont retenus : nom
+    peut être un sous-module.
+
+    Args:
+        path: Fichier source du module
+        module_name: Nom du module
+
+    Returns:
+        Noms des modules importés (vide si le source ne s'analyse pas)
+    """
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (SyntaxError, ValueError):
+        return set()
+
+    package = module_name.split(".")
+    if path.name != "__init__.py":
+        package = package[:-1]
+
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            parts = package[: len(package) - node.level + 1] if node.level else []
+            if node.module:
+                parts = parts + node.module.split(".")
+            base = ".".join(parts)
+            if base:
+                names.add(base)
+            names.update(
+                f"{base}.{alias.name}" if base else alias.name for alias in node.names
+            )
+    return names
+
+
+def source_hashes(modules: List[Dict], project_root: Path) -> Dict[str, str]:
+    """
+    Calcule l'empreinte de chaque module.
+
+    L'empreinte couvre le source du module, celui des modules du projet
+    qu'il importe (directement ou non) et le générateur lui-même : modifier
+    une classe de base, ou la mise en page des documents, invalide les
+    pages concernées.
+
+    Args:
+        modules: Liste des modules trouvés
+        project_root: Racine du projet
+
+    Returns:
+        Empreinte SHA-256 hexadécimale par nom de module
+    """
+    files: Dict[str, Optional[Path]] = {
+        module["name"]: module["path"] for module in modules
+    }
+    own: Dict[str, str] = {}
+    imports: Dict[str, Set[str]] = {}
+
+    def dependencies(name: str) -> Set[str]:
+        if name not in imports:
+            path = files[name]
+            imports[name] = {
+                imported
+                for imported in module_imports(path, name)
+                if files.setdefault(imported, module_file(project_root, imported))
+            }
+            own[name] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return imports[name]
+
+    hashes = {}
+    for module in modules:
+        seen = {module["name"]}
+        to_visit = [module["name"]]
+        while to_visit:
+            for imported in dependencies(to_visit.pop()):
+                if imported not in seen:
+                    seen.add(imported)
+                    to_visit.append(imported)
+
+        digest = hashlib.sha256(GENERATOR_HASH.encode("ascii"))
+        for name in sorted(seen):
+            digest.update(f"{name}:{own[name]}\n".encode("utf-8"))
+        hashes[module["name"]] = digest.hexdigest()
+    return hashes
+
+
+def load_manifest(output_dir: Path) -> Dict[str, str]:
+    """
+    Lit les empreintes des modules de la dernière génération.
+
+    Args:
+        output_dir: Répertoire de sortie
+
+    Returns:
+        Empreinte par nom de module (vide si pas de génération précédente)
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir: Path, hashes: Dict[str, str]) -> None:
+    """
+    Enregistre les empreintes des modules générés.
+
+    Args:
+        output_dir: Répertoire de sortie
+        hashes: Empreinte par nom de module
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest_path.write_text(
+        json.dumps(hashes, indent=2, sort_keys=True), encoding="utf-8"
+    )
+
+
+def copy_stylesheet(output_dir: Path) -> None:
+    """
+    Copie la feuille de style commune si elle a changé.
+
+    Args:
+        output_dir: Répertoire de sortie
+    """
+    target = output_dir / STYLESHEET.name
+    content = STYLESHEET.read_bytes()
+    if not target.exists() or target.read_bytes() != content:
+        target.write_bytes(content)
+        print(f"✓ Généré: {target}")
+
+
+def generate_pydoc_html(
+    module_name: str, output_dir: Path, project_root: Path
+) -> Tuple[str, bool, str]:
     """
     Génère la documentation HTML pour un module avec pydoc.
 
+    Exécutée dans un processus de travail : le résultat est renvoyé au lieu
+    d'être affiché pour que les messages ne se mélangent pas.
+
     Args:
         module_name: Nom du module
         output_dir: Répertoire de sortie
         project_root: Racine du projet
+
+    Returns:
+        Tuple (module_name, succès, message)
     """
     try:
         # Ajouter le répertoire du projet au PYTHONPATH
-        import sys
-
         if str(project_root) not in sys.path:
             sys.path.insert(0, str(project_root))
 
@@ -78,10 +259,9 @@ def generate_pydoc_html(module_name: str, output_dir: Path, project_root: Path)
         html_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Générer la documentation HTML avec pydoc
+        imported = True
         try:
             # Essayer d'importer le module pour vérifier qu'il existe
-            import importlib
-
             module = importlib.import_module(module_name)
 
             # Générer la documentation HTML avec pydoc
@@ -89,235 +269,21 @@ def generate_pydoc_html(module_name: str, output_dir: Path, project_root: Path)
             html_content = html_doc.document(module)
         except Exception as import_error:
             # Si l'import échoue, générer une documentation basique
+            imported = False
             html_content = f"""
             <h1>Module: {module_name}</h1>
             <p><strong>Erreur d'import:</strong> {import_error}</p>
             <p>Ce module n'a pas pu être importé correctement.</p>
             """
 
-        # Ajouter un en-tête HTML complet avec CSS complet pour pydoc
+        # En-tête HTML complet, la mise en forme est dans la feuille commune
         full_html = f"""<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{module_name} - Documentation pydoc</title>
-    <style>
-        /* Reset et styles de base */
-        body {{ 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', sans-serif; 
-            margin: 20px; 
-            line-height: 1.6; 
-            background-color: #fff;
-            color: #333;
-        }}
-        
-        /* Styles pour la navigation */
-        .back-link {{ 
-            margin-bottom: 20px; 
-            padding: 10px;
-            background-color: #f8f9fa;
-            border-radius: 5px;
-        }}
-        .back-link a {{ 
-            color: #0066cc; 
-            text-decoration: none; 
-            font-weight: 500;
-        }}
-        .back-link a:hover {{ 
-            text-decoration: underline; 
-        }}
-        
-        /* Styles pour les titres pydoc */
-        h1, h2, h3, h4, h5, h6 {{
-            color: #333;
-            margin-top: 30px;
-            margin-bottom: 15px;
-        }}
-        
-        /* Styles pour les tableaux pydoc */
-        table.heading {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 30px;
-            background-color: #f8f9fa;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        
-        .heading-text {{
-            padding: 15px 20px;
-        }}
-        
-        .title {{
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        
-        .extra {{
-            text-align: right;
-            vertical-align: top;
-            padding: 15px 20px;
-        }}
-        
-        .extra a {{
-            color: #6c757d;
-            text-decoration: none;
-            font-size: 0.9em;
-        }}
-        
-        .extra a:hover {{
-            color: #0066cc;
-        }}
-        
-        /* Sections pydoc */
-        table.section {{
-            width: 100%;
-            margin: 20px 0;
-            border-collapse: collapse;
-            background-color: white;
-            border: 1px solid #dee2e6;
-            border-radius: 5px;
-            overflow: hidden;
-        }}
-        
-        .section-title {{
-            background-color: #e9ecef;
-            padding: 12px 15px;
-            font-weight: bold;
-            color: #495057;
-            border-bottom: 1px solid #dee2e6;
-        }}
-        
-        .bigsection {{
-            font-size: 1.1em;
-        }}
-        
-        /* Styles pour les éléments de contenu */
-        .code {{
-            background-color: transparent;
-            font-family: 'Monaco', 'Consolas', 'Courier New', monospace;
-            white-space: pre-wrap;
-            color: #444;
-            font-size: 0.95em;
-        }}
-        
-        pre {{
-            background-color: #f8f9fa; 
-            padding: 15px; 
-            border-radius: 8px; 
-            overflow-x: auto;
-            border: 1px solid #e9ecef;
-            font-family: 'Monaco', 'Consolas', 'Courier New', monospace;
-        }}
-        
-        code {{
-            background-color: #f1f3f4; 
-            padding: 3px 6px; 
-            border-radius: 4px; 
-            font-family: 'Monaco', 'Consolas', 'Courier New', monospace;
-            font-size: 0.9em;
-            color: #d73a49;
-        }}
-        
-        /* Styles pour les fonctions et classes */
-        .function {{ 
-            margin: 20px 0; 
-            padding: 15px;
-            background-color: #f8f9fa;
-            border-left: 4px solid #0066cc;
-            border-radius: 0 5px 5px 0;
-        }}
-        
-        .class {{ 
-            margin: 25px 0; 
-            border: 1px solid #dee2e6; 
-            padding: 20px; 
-            border-radius: 8px;
-            background-color: #fff;
-        }}
-        
-        /* Styles pour les liens */
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        
-        a:hover {{
-            text-decoration: underline;
-        }}
-        
-        /* Styles pour les listes */
-        ul, ol {{
-            margin-left: 20px;
-        }}
-        
-        li {{
-            margin-bottom: 5px;
-        }}
-        
-        /* Styles pour les descriptions */
-        p {{
-            margin-bottom: 15px;
-            color: #555;
-        }}
-        
-        /* Styles spécifiques pour les decorators pydoc */
-        .decor {{
-            vertical-align: top;
-            width: 20px;
-        }}
-        
-        .pkg-content-decor, .index-decor {{
-            background-color: #f8f9fa;
-            border-right: 1px solid #dee2e6;
-            width: 30px;
-        }}
-        
-        .multicolumn {{
-            width: 25%;
-            vertical-align: top;
-        }}
-        
-        .multicolumn a {{
-            color: #0066cc;
-        }}
-        
-        /* Responsive design */
-        @media (max-width: 768px) {{
-            body {{
-                margin: 10px;
-            }}
-            
-            table.heading {{
-                font-size: 0.9em;
-            }}
-            
-            .extra {{
-                text-align: left;
-                padding-top: 10px;
-            }}
-        }}
-        
-        /* Amélioration de lisibilité */
-        .singlecolumn {{
-            padding: 15px;
-        }}
-        
-        dt.heading-text {{
-            font-weight: bold;
-            color: #2c3e50;
-            margin-top: 15px;
-        }}
-        
-        dd {{
-            margin-left: 0;
-            margin-bottom: 20px;
-            padding-left: 20px;
-        }}
-    </style>
+    <link rel="stylesheet" href="{STYLESHEET.name}">
 </head>
 <body>
     <div class="back-link">
@@ -330,10 +296,84 @@ def generate_pydoc_html(module_name: str, output_dir: Path, project_root: Path)
         # Écrire le fichier HTML complet
         html_file.write_text(full_html, encoding="utf-8")
 
-        print(f"✓ Généré: {html_file}")
+        if not imported:
+            return module_name, False, f"Erreur d'import, page minimale: {html_file}"
+        return module_name, True, f"Généré: {html_file}"
 
     except Exception as e:
-        print(f"✗ Erreur pour {module_name}: {e}")
+        return module_name, False, f"Erreur pour {module_name}: {e}"
+
+
+def build_modules(
+    modules: List[Dict],
+    output_dir: Path,
+    project_root: Path,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    Génère en parallèle les pages des modules modifiés depuis la dernière fois.
+
+    Les modules dont l'empreinte n'a pas changé (et dont la page existe)
+    sont sautés ; les pages des modules disparus depuis la dernière
+    génération sont supprimées, y compris avec force.
+
+    Args:
+        modules: Liste des modules trouvés
+        output_dir: Répertoire de sortie
+        project_root: Racine du projet
+        workers: Nombre de processus (défaut: nombre de cœurs)
+        force: Régénérer tous les modules
+
+    Returns:
+        Compteurs "generated", "skipped", "failed" et "removed"
+    """
+    previous = load_manifest(output_dir)
+    hashes = source_hashes(modules, project_root)
+
+    todo = [
+        name
+        for name, digest in hashes.items()
+        if force
+        or previous.get(name) != digest
+        or not (output_dir / f"{name}.html").exists()
+    ]
+    counts = {
+        "generated": 0,
+        "skipped": len(hashes) - len(todo),
+        "failed": 0,
+        "removed": 0,
+    }
+
+    # Pages des modules supprimés ou renommés depuis la dernière génération
+    for name in set(previous) - set(hashes):
+        (output_dir / f"{name}.html").unlink(missing_ok=True)
+        counts["removed"] += 1
+
+    built: Dict[str, str] = {
+        name: digest for name, digest in hashes.items() if name not in todo
+    }
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        print(f"⚙️  {len(todo)} module(s) à générer avec {workers} processus")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(generate_pydoc_html, name, output_dir, project_root)
+                for name in todo
+            ]
+            for future in as_completed(futures):
+                name, success, message = future.result()
+                if success:
+                    # Seuls les succès sont mémorisés : un échec est retenté
+                    built[name] = hashes[name]
+                    counts["generated"] += 1
+                    print(f"✓ {message}")
+                else:
+                    counts["failed"] += 1
+                    print(f"✗ {message}")
+
+    save_manifest(output_dir, built)
+    return counts
 
 
 def generate_index_html(modules: List[Dict], output_dir: Path) -> None:
@@ -350,16 +390,7 @@ def generate_index_html(modules: List[Dict], output_dir: Path) -> None:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Demo API - Documentation pydoc</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 40px; }
-        h1 { color: #333; }
-        .module-list { list-style-type: none; padding: 0; }
-        .module-list li { margin: 10px 0; }
-        .module-list a { text-decoration: none; color: #0066cc; }
-        .module-list a:hover { text-decoration: underline; }
-        .module-category { margin-top: 30px; }
-        .module-category h2 { color: #666; border-bottom: 2px solid #eee; }
-    </style>
+    <link rel="stylesheet" href="pydoc.css">
 </head>
 <body>
     <h1>Demo API - Documentation pydoc</h1>
@@ -434,8 +465,29 @@ def generate_index_html(modules: List[Dict], output_dir: Path) -> None:
     print(f"✓ Généré: {index_path}")
 
 
+def parse_args() -> argparse.Namespace:
+    """Lit les options de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Génère la documentation pydoc des modules du projet"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Régénérer tous les modules, même inchangés",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre de processus (défaut: nombre de cœurs)",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Fonction principale."""
+    args = parse_args()
+
     # Définir les chemins
     project_root = Path(__file__).parent.parent.parent
     output_dir = Path(__file__).parent / "html"
@@ -448,22 +500,25 @@ def main():
 
     # Trouver tous les modules Python
     modules = find_python_modules(project_root)
+    print(f"📦 {len(modules)} modules trouvés")
 
-    print(f"📦 {len(modules)} modules trouvés:")
-    for module in modules:
-        print(f"  - {module['name']}")
-
-    # Générer la documentation HTML pour chaque module
+    # Générer la documentation HTML des modules modifiés
     print("\n📝 Génération de la documentation HTML...")
-    for module in modules:
-        generate_pydoc_html(module["name"], output_dir, project_root)
+    copy_stylesheet(output_dir)
+    counts = build_modules(
+        modules, output_dir, project_root, args.workers, args.force
+    )
 
     # Générer le fichier index
     print("\n📋 Génération du fichier index...")
     generate_index_html(modules, output_dir)
 
-    print(f"\n✅ Documentation pydoc générée avec succès!")
-    print(f"📖 {len(modules)} modules documentés dans {output_dir}")
+    print("\n✅ Documentation pydoc générée!")
+    print(
+        f"📖 {counts['generated']} module(s) générés, "
+        f"{counts['skipped']} inchangé(s), {counts['failed']} en erreur, "
+        f"{counts['removed']} page(s) supprimée(s) dans {output_dir}"
+    )
     print(f"🌐 Ouvrez {output_dir / 'index.html'} dans votre navigateur")
 
 
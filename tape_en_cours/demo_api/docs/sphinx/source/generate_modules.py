@@ -54,6 +54,26 @@ def find_python_modules(root_dir: Path, exclude_dirs: set = None) -> list:
     return sorted(modules, key=lambda x: x["name"])
 
 
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Écrit un fichier seulement si son contenu change.
+
+    Sphinx reconstruit les pages dont le source a été modifié : réécrire un
+    .rst identique forcerait la reconstruction de toute la documentation.
+
+    Args:
+        path: Fichier à écrire
+        content: Contenu attendu
+
+    Returns:
+        True si le fichier a été écrit
+    """
+    if path.exists() and path.read_text(encoding="utf-8") == content:
+        return False
+    path.write_text(content, encoding="utf-8")
+    return True
+
+
 def generate_module_rst(module_info: dict, output_dir: Path) -> None:
     """
     Génère un fichier .rst pour un module donné.
@@ -80,9 +100,9 @@ def generate_module_rst(module_info: dict, output_dir: Path) -> None:
    :special-members: __init__
 """
 
-    # Écrire le fichier
-    rst_path.write_text(content, encoding="utf-8")
-    print(f"✓ Généré: {rst_path}")
+    # Écrire le fichier (seulement s'il a changé)
+    if write_if_changed(rst_path, content):
+        print(f"✓ Généré: {rst_path}")
 
 
 def generate_index_rst(modules: list, output_dir: Path) -> None:
@@ -123,8 +143,8 @@ def generate_index_rst(modules: list, output_dir: Path) -> None:
 
     # Écrire le fichier index
     index_path = output_dir / "index.rst"
-    index_path.write_text("\n".join(content), encoding="utf-8")
-    print(f"✓ Généré: {index_path}")
+    if write_if_changed(index_path, "\n".join(content)):
+        print(f"✓ Généré: {index_path}")
 
 
 def main():
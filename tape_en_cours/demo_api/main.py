@@ -6,13 +6,16 @@ Interface d'orchestration avec Typer pour le management des utilisateurs et VMs.
 """
 
 import typer
+from typing import Any, Dict, List, Optional
 from utils.logging_config import get_logger
 from report_manager import generate_reports, ReportType, ReportFormat
 from vm_manager import create_vm
 from utils.data_generator import DataGenerator
-import json
+from utils import json_codec
 from pathlib import Path
 from utils.password_utils import save_token_to_env
+from utils.profiling import add_profile_option
+from utils.config import config
 
 logger = get_logger(__name__)
 
@@ -23,20 +26,58 @@ app = typer.Typer(
     add_completion=False,
     no_args_is_help=True,
 )
+add_profile_option(app)
 
 
 @app.command()
 def report(
     report_type: str = typer.Option(
-        "all", "--type", "-t", help="Type de rapport à générer (all, users-vms, status)"
+        "all",
+        "--type",
+        "-t",
+        help="Type de rapport à générer (all, users-vms, status, capacity, trend)",
     ),
     report_format: str = typer.Option(
-        "all", "--format", "-f", help="Format de rapport (all, json, markdown, html)"
+        "all",
+        "--format",
+        "-f",
+        help="Format de rapport (all, json, markdown, html, parquet, arrow)",
     ),
     output_dir: str = typer.Option(
         "outputs", "--output-dir", "-o", help="Répertoire de sortie pour les rapports"
     ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
+    users_per_page: Optional[int] = typer.Option(
+        None,
+        "--users-per-page",
+        help="Découpe les rapports Markdown/HTML utilisateurs/VMs en pages",
+        min=1,
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Nombre de processus pour le rendu des pages",
+        min=1,
+    ),
+    top_users: int = typer.Option(
+        10,
+        "--top-users",
+        help="Nombre d'utilisateurs dans le classement du rapport de capacité",
+        min=1,
+    ),
+    snapshot: bool = typer.Option(
+        config.DEMO_API_REPORT_SNAPSHOTS,
+        "--snapshot/--no-snapshot",
+        help="Ajouter un instantané de la flotte à l'historique "
+        "(défaut: DEMO_API_REPORT_SNAPSHOTS)",
+    ),
+    trend_limit: Optional[int] = typer.Option(
+        None,
+        "--trend-limit",
+        help="Nombre d'instantanés récents inclus dans le rapport de tendance",
+        min=1,
+    ),
 ) -> None:
     """
     📊 Générer des rapports
@@ -48,24 +89,38 @@ def report(
     python main.py report --type users-vms --format markdown
     python main.py report -t status -f html -o ./rapports --verbose
     python main.py report --format all --type all
+    python main.py report -t users-vms -f html --users-per-page 500 --workers 8
+    python main.py report -t capacity -f markdown --top-users 20
+    python main.py report -t trend -f html --trend-limit 30
     """
     # Convertir les strings en enums
     try:
         report_type_enum = ReportType(report_type)
     except ValueError as exc:
         typer.echo(f"❌ Type de rapport invalide: {report_type}")
-        typer.echo("Types valides: all, users-vms, status")
+        typer.echo("Types valides: all, users-vms, status, capacity, trend")
         raise typer.Exit(1) from exc
 
     try:
         format_enum = ReportFormat(report_format)
     except ValueError as exc:
         typer.echo(f"❌ Format de rapport invalide: {report_format}")
-        typer.echo("Formats valides: all, json, markdown, html")
+        typer.echo("Formats valides: all, json, markdown, html, parquet, arrow")
         raise typer.Exit(1) from exc
 
     # Appeler directement la fonction
-    generate_reports(report_type_enum, format_enum, output_dir, verbose)
+    generate_reports(
+        report_type_enum,
+        format_enum,
+        output_dir,
+        verbose,
+        users_per_page,
+        workers,
+        top_users,
+        snapshot,
+        trend_limit,
+        None,
+    )
 
 
 @app.command()
@@ -324,8 +379,7 @@ def generate(
 
         # Sauvegarder dans le fichier JSON
         output_path = Path(output_file)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(users_data, f, indent=4, ensure_ascii=False, default=str)
+        json_codec.dump_file(users_data, output_path)
 
         # Statistiques
         total_vms = sum(len(user["vms"]) for user in users_data)
@@ -354,6 +408,173 @@ def generate(
         raise typer.Exit(1)
 
 
+def _parse_updates(assignments: List[str]) -> Dict[str, Any]:
+    """
+    Convertit des affectations "champ=valeur" en champs à modifier
+
+    Les valeurs entières sont converties, les alias de champs (os, ram...)
+    sont acceptés comme dans les filtres et un champ inconnu est refusé.
+
+    Raises:
+        ValueError: Si une affectation est invalide ou vise un champ inconnu
+    """
+    from utils.vm_filter import resolve_field
+
+    updates: Dict[str, Any] = {}
+    for assignment in assignments:
+        field, separator, value = assignment.partition("=")
+        if not separator or not field.strip():
+            raise ValueError(
+                f"Affectation invalide (champ=valeur attendu): {assignment}"
+            )
+        field = resolve_field(field)
+        value = value.strip()
+        updates[field] = int(value) if value.lstrip("-").isdigit() else value
+    return updates
+
+
+@app.command()
+def bulk(
+    action: str = typer.Argument(
+        ..., help="Action à appliquer (stop, attach, update)"
+    ),
+    filter_expression: str = typer.Option(
+        "",
+        "--filter",
+        "-F",
+        help='Sélection des VMs, ex: "status=running and os~Ubuntu" (vide: toutes)',
+    ),
+    user_id: Optional[int] = typer.Option(
+        None, "--user-id", "-u", help="Utilisateur cible (action attach)"
+    ),
+    assignments: List[str] = typer.Option(
+        [], "--set", "-s", help="Champ à modifier, ex: --set ram=8 (action update)"
+    ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Nombre d'appels API en parallèle", min=1, max=16
+    ),
+    interval: float = typer.Option(
+        0.1,
+        "--interval",
+        "-i",
+        help="Délai minimal entre deux appels API, tous threads confondus (s)",
+        min=0.0,
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", "-n", help="Afficher les VMs sélectionnées sans agir"
+    ),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Ne pas demander confirmation"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
+) -> None:
+    """
+    🧰 Appliquer une action à un ensemble de VMs
+
+    Sélectionne les VMs par une expression de filtre, puis envoie les appels
+    Stop_VM, Attach_VM_to_user ou PATCH en parallèle, à débit limité.
+    Utilise le token sauvegardé dans la session.
+
+    Opérateurs de filtre: = != ~ (contient) !~ < <= > >=, reliés par "and".
+
+    Exemples:
+
+    \b
+    python main.py bulk stop --filter "status=running and os~Ubuntu" --dry-run
+    python main.py bulk stop -F "status=running" --workers 8 --yes
+    python main.py bulk attach -F "user_id=12" --user-id 42
+    python main.py bulk update -F "os~Debian and ram<4" --set ram=4 --set status=stopped
+    """
+    from utils.api import ApiClient
+    from utils.password_utils import get_token_from_config
+    from utils.services import VMBulkService
+    from utils.services.vm_bulk_service import BULK_ACTIONS, summarize_outcomes
+    from utils.vm_filter import VMFilterError
+
+    if action not in BULK_ACTIONS:
+        typer.echo(f"❌ Action invalide: {action}")
+        typer.echo(f"Actions valides: {', '.join(BULK_ACTIONS)}")
+        raise typer.Exit(1)
+    if action == "attach" and user_id is None:
+        typer.echo("❌ L'action attach nécessite --user-id")
+        raise typer.Exit(1)
+
+    try:
+        updates = _parse_updates(assignments) if action == "update" else None
+    except ValueError as exc:
+        typer.echo(f"❌ {exc}")
+        raise typer.Exit(1) from exc
+    if action == "update" and not updates:
+        typer.echo("❌ L'action update nécessite au moins un --set champ=valeur")
+        raise typer.Exit(1)
+
+    token = get_token_from_config()
+    if not token and not dry_run:
+        typer.echo("❌ Aucun token sauvegardé trouvé")
+        typer.echo("💡 Créez d'abord un utilisateur avec 'signup'")
+        raise typer.Exit(1)
+
+    service = VMBulkService(ApiClient(token=token))
+
+    typer.echo("📥 Récupération de la flotte...")
+    try:
+        vms = service.select(filter_expression)
+    except VMFilterError as exc:
+        typer.echo(f"❌ {exc}")
+        raise typer.Exit(1) from exc
+
+    typer.echo(f"🎯 {len(vms)} VM(s) sélectionnée(s)")
+    if verbose or dry_run:
+        for vm in vms[:20]:
+            typer.echo(
+                f"   • {vm.get('id')} {vm.get('name')} "
+                f"({vm.get('operating_system')}, {vm.get('status')})"
+            )
+        if len(vms) > 20:
+            typer.echo(f"   ... et {len(vms) - 20} autres VMs")
+    if not vms or dry_run:
+        return
+    if not yes:
+        typer.confirm(f"Appliquer '{action}' à {len(vms)} VM(s) ?", abort=True)
+
+    logger.info(
+        "Action en masse demandée",
+        action=action,
+        filter=filter_expression,
+        vms_count=len(vms),
+    )
+    with typer.progressbar(length=len(vms), label=f"⚙️ {action}") as progress:
+        results = service.run(
+            action,
+            vms,
+            user_id=user_id,
+            updates=updates,
+            workers=workers,
+            interval=interval,
+            on_report=lambda batch: progress.update(len(batch)),
+        )
+
+    typer.echo("📊 Résultats:")
+    for outcome, count in summarize_outcomes(results).items():
+        icon = "✅" if outcome == "ok" else "❌"
+        typer.echo(f"   {icon} {outcome}: {count}")
+    envoi = service.stats["envoi"]
+    typer.echo(f"⏱️ {envoi.elapsed:.1f}s ({envoi.throughput:.1f} VMs/s)")
+    for endpoint, breaker in service.api.resilience_stats()["breakers"].items():
+        if breaker["rejected"]:
+            typer.echo(
+                f"   🔌 {endpoint}: {breaker['rejected']} appel(s) rejeté(s) "
+                f"par le disjoncteur ({breaker['state']})"
+            )
+
+    if verbose:
+        for result in results:
+            if result["error"] is not None:
+                vm_id = result["payload"].get("id")
+                typer.echo(f"   ⚠️ VM {vm_id}: {result['error']}")
+
+    if any(result["error"] is not None for result in results):
+        raise typer.Exit(1)
+
+
 @app.command()
 def debug() -> None:
     """🔍 Afficher les informations de debug sur la configuration"""
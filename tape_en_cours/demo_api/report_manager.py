@@ -3,11 +3,15 @@
 Gestionnaire de rapports pour demo_api
 """
 
+import os
 import typer
 from enum import Enum
+from typing import Optional
 from utils.api import Api
-from utils.services import ReportService, DataManager
+from utils.services import ReportService, DataManager, SnapshotStore
+from reports.capacity import numpy_available
 from utils.logging_config import get_logger
+from utils.profiling import ProfileMode, start_profile
 from utils.config import config
 
 logger = get_logger(__name__)
@@ -18,6 +22,8 @@ class ReportType(str, Enum):
 
     USERS_VMS = "users-vms"
     STATUS = "status"
+    CAPACITY = "capacity"
+    TREND = "trend"
     ALL = "all"
 
 
@@ -27,9 +33,15 @@ class ReportFormat(str, Enum):
     JSON = "json"
     MARKDOWN = "markdown"
     HTML = "html"
+    PARQUET = "parquet"
+    ARROW = "arrow"
     ALL = "all"
 
 
+# Formats d'export columnaire (instantané de la flotte, dépendance pyarrow)
+COLUMNAR_FORMATS = (ReportFormat.PARQUET, ReportFormat.ARROW)
+
+
 def generate_reports(
     report_type: ReportType = typer.Option(
         ReportType.ALL, "--type", "-t", help="Type de rapport à générer"
@@ -38,12 +50,49 @@ def generate_reports(
         ReportFormat.ALL,
         "--format",
         "-f",
-        help="Format de rapport (json, markdown, html, all)",
+        help="Format de rapport (json, markdown, html, parquet, arrow, all)",
     ),
     output_dir: str = typer.Option(
         "outputs", "--output-dir", "-o", help="Répertoire de sortie pour les rapports"
     ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
+    users_per_page: Optional[int] = typer.Option(
+        None,
+        "--users-per-page",
+        help="Découpe les rapports Markdown/HTML utilisateurs/VMs en pages",
+        min=1,
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-w",
+        help="Nombre de processus pour le rendu des pages",
+        min=1,
+    ),
+    top_users: int = typer.Option(
+        10,
+        "--top-users",
+        help="Nombre d'utilisateurs dans le classement du rapport de capacité",
+        min=1,
+    ),
+    snapshot: bool = typer.Option(
+        config.DEMO_API_REPORT_SNAPSHOTS,
+        "--snapshot/--no-snapshot",
+        help="Ajouter un instantané de la flotte à l'historique "
+        "(défaut: DEMO_API_REPORT_SNAPSHOTS)",
+    ),
+    trend_limit: Optional[int] = typer.Option(
+        None,
+        "--trend-limit",
+        help="Nombre d'instantanés récents inclus dans le rapport de tendance",
+        min=1,
+    ),
+    profile: Optional[ProfileMode] = typer.Option(
+        None,
+        "--profile",
+        help="Profile la génération (cprofile, sampling ou memory)",
+        case_sensitive=False,
+    ),
 ) -> None:
     """
     📊 Générer des rapports
@@ -55,13 +104,21 @@ def generate_reports(
     python report_manager.py --type users-vms --format markdown
     python report_manager.py -t status -f html -o ./rapports --verbose
     python report_manager.py --format all --type all
+    python report_manager.py -t users-vms -f html --users-per-page 500 --workers 8
+    python report_manager.py -t users-vms -f parquet
+    python report_manager.py -t capacity -f html --top-users 20
+    python report_manager.py -t trend -f markdown --trend-limit 30
+    python report_manager.py -t users-vms -f html --profile sampling
     """
+    start_profile(profile, os.path.join(output_dir, "profiles"), "report")
 
     if verbose:
         typer.echo("🔧 Configuration:")
         typer.echo(f"   Type de rapport: {report_type.value}")
         typer.echo(f"   Format: {report_format.value}")
         typer.echo(f"   Répertoire de sortie: {output_dir}")
+        if users_per_page:
+            typer.echo(f"   Utilisateurs par page: {users_per_page}")
         typer.echo()
 
     logger.info(
@@ -87,6 +144,19 @@ def generate_reports(
     typer.echo(f"   ✅ {len(users)} utilisateur(s) et {len(vms)} VM(s) récupéré(s)")
     typer.echo()
 
+    # Historique des instantanés (seule la différence avec le précédent est écrite)
+    history_dir = os.path.join(output_dir, "history")
+    if snapshot:
+        snapshot_entry = report_service.record_snapshot(users, vms, history_dir)
+        if snapshot_entry and verbose:
+            churn = snapshot_entry["churn"]
+            typer.echo(
+                f"🗂️ Instantané #{snapshot_entry['snapshot_id']} enregistré "
+                f"(VMs +{churn['vms_added']} ~{churn['vms_changed']} "
+                f"-{churn['vms_removed']})"
+            )
+            typer.echo()
+
     # Génération des rapports selon le type et format demandés
     generated_files = []
 
@@ -113,12 +183,22 @@ def generate_reports(
                 )
             elif fmt == ReportFormat.MARKDOWN:
                 report_file = report_service.generate_users_vms_report_markdown(
-                    users, vms, "vm_users.md"
+                    users, vms, "vm_users.md", users_per_page, workers
                 )
             elif fmt == ReportFormat.HTML:
                 report_file = report_service.generate_users_vms_report_html(
-                    users, vms, "vm_users.html"
+                    users, vms, "vm_users.html", users_per_page, workers
                 )
+            elif fmt in COLUMNAR_FORMATS:
+                snapshot_files = report_service.generate_fleet_snapshot(
+                    users, vms, fmt.value, "vm_users"
+                )
+                if snapshot_files:
+                    generated_files.extend(snapshot_files)
+                    if verbose:
+                        for snapshot_file in snapshot_files:
+                            typer.echo(f"   ✅ Généré ({fmt.value}): {snapshot_file}")
+                    continue
 
             if report_file:
                 generated_files.append(report_file)
@@ -135,6 +215,13 @@ def generate_reports(
 
         for fmt in formats_to_generate:
             status_file = None
+            if fmt in COLUMNAR_FORMATS:
+                if verbose:
+                    typer.echo(
+                        f"   ⏭️ Format {fmt.value} ignoré pour le rapport de statut"
+                    )
+                continue
+
             if fmt == ReportFormat.JSON:
                 status_file = report_service.generate_status_report(
                     users, vms, "vm_status_report.json"
@@ -157,6 +244,70 @@ def generate_reports(
                     f"❌ Échec de la génération du rapport de statut ({fmt.value})"
                 )
 
+    # Génération des rapports de capacité (numpy requis)
+    if report_type == ReportType.CAPACITY or (
+        report_type == ReportType.ALL and numpy_available()
+    ):
+        typer.echo("🧮 Génération du rapport de capacité...")
+
+        # Statistiques calculées une seule fois, rendues dans chaque format
+        capacity_data = report_service.compute_capacity(users, vms, top_n=top_users)
+
+        for fmt in formats_to_generate:
+            if fmt in COLUMNAR_FORMATS:
+                if verbose:
+                    typer.echo(
+                        f"   ⏭️ Format {fmt.value} ignoré pour le rapport de capacité"
+                    )
+                continue
+
+            capacity_file = None
+            if capacity_data is not None:
+                capacity_file = report_service.generate_capacity_report(
+                    capacity_data, fmt.value
+                )
+
+            if capacity_file:
+                generated_files.append(capacity_file)
+                if verbose:
+                    typer.echo(f"   ✅ Généré ({fmt.value}): {capacity_file}")
+            else:
+                typer.echo(
+                    f"❌ Échec de la génération du rapport de capacité ({fmt.value})"
+                )
+    elif report_type == ReportType.ALL and verbose:
+        typer.echo("⏭️ Rapport de capacité ignoré (numpy non installé)")
+
+    # Génération des rapports de tendance (à partir de l'historique, qui
+    # n'est alimenté qu'avec --snapshot)
+    if report_type == ReportType.TREND or (
+        report_type == ReportType.ALL and SnapshotStore(history_dir).entries()
+    ):
+        typer.echo("📉 Génération du rapport de tendance...")
+
+        for fmt in formats_to_generate:
+            if fmt in COLUMNAR_FORMATS:
+                if verbose:
+                    typer.echo(
+                        f"   ⏭️ Format {fmt.value} ignoré pour le rapport de tendance"
+                    )
+                continue
+
+            trend_file = report_service.generate_trend_report(
+                fmt.value, history_dir=history_dir, limit=trend_limit
+            )
+
+            if trend_file:
+                generated_files.append(trend_file)
+                if verbose:
+                    typer.echo(f"   ✅ Généré ({fmt.value}): {trend_file}")
+            else:
+                typer.echo(
+                    f"❌ Échec de la génération du rapport de tendance ({fmt.value})"
+                )
+    elif report_type == ReportType.ALL:
+        typer.echo("⏭️ Rapport de tendance ignoré (historique vide, voir --snapshot)")
+
     # Résumé
     typer.echo()
     if generated_files:
@@ -5,11 +5,24 @@ Ce module contient tous les générateurs de rapports :
 - JSON : Rapports structurés pour l'API
 - HTML : Rapports web interactifs
 - Markdown : Documentation et rapports texte
+- Parquet / Arrow : Exports columnaires typés pour l'analyse (pyarrow)
+- Capacité : Statistiques de capacité vectorisées (numpy)
+- Tendance : Évolution de la flotte à partir de l'historique des instantanés
 - CSV : Données tabulaires
 """
 
 from .json_reports import JSONReportGenerator
 from .markdown_reports import MarkdownReportGenerator
 from .html_reports import HTMLReportGenerator
+from .columnar_reports import ColumnarReportGenerator
+from .capacity import compute_capacity_report
+from .trend import compute_trend_report
 
-__all__ = ["JSONReportGenerator", "MarkdownReportGenerator", "HTMLReportGenerator"]
+__all__ = [
+    "JSONReportGenerator",
+    "MarkdownReportGenerator",
+    "HTMLReportGenerator",
+    "ColumnarReportGenerator",
+    "compute_capacity_report",
+    "compute_trend_report",
+]
@@ -0,0 +1,301 @@
+"""
+Calcul vectorisé des statistiques de capacité de la flotte pour demo_api
+
+Les colonnes utiles (CPU, RAM, disque, statut, OS, propriétaire, date de
+création) sont extraites une seule fois de la liste des VMs, puis toutes
+les agrégations sont faites par group-by NumPy (bincount, tri lexicographique)
+sans boucle Python par VM. Nécessite la dépendance optionnelle numpy.
+"""
+
+import datetime
+from typing import Dict, Any, List, Tuple
+from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
+
+logger = get_logger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    np = None
+
+# Métriques de capacité agrégées
+CAPACITY_METRICS = ("cpu_cores", "ram_gb", "disk_gb")
+
+# Percentiles calculés pour chaque groupe
+PERCENTILES = (50, 90, 99)
+
+# Granularités acceptées pour l'histogramme des créations (unités datetime64)
+HISTOGRAM_BUCKETS = {"hour": "h", "day": "D", "month": "M"}
+
+# Ordinal du 1er janvier 1970 et valeur entière de NaT (date absente)
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_NAT = -(2**63)
+
+
+def numpy_available() -> bool:
+    """Indique si numpy est installé (rapport de capacité disponible)"""
+    return np is not None
+
+
+def _epoch_hours(value: Any) -> int:
+    """
+    Convertit une date de création en heures écoulées depuis 1970
+
+    Beaucoup plus rapide que la conversion d'objets datetime par numpy ;
+    la résolution à l'heure suffit pour l'histogramme des créations.
+    """
+    if value is None:
+        return _NAT
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return (value.toordinal() - _EPOCH_ORDINAL) * 24 + getattr(value, "hour", 0)
+
+
+def _factorize(values: Any) -> Tuple[List[Any], "np.ndarray"]:
+    """
+    Encode des valeurs répétées en entiers (une passe, sans tri d'objets)
+
+    Returns:
+        Tuple (libellés distincts, code de chaque valeur)
+    """
+    mapping: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (mapping.setdefault(value, len(mapping)) for value in values), dtype=np.int64
+    )
+    return list(mapping), codes
+
+
+def _extract_columns(vms: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Extrait les colonnes utiles de la liste des VMs (une passe par colonne)
+
+    Les valeurs numériques absentes valent 0, les statuts et OS absents
+    "unknown". Statuts et OS sont encodés en (libellés, codes) ; les dates
+    absentes deviennent NaT et sont ignorées dans l'histogramme.
+    """
+    count = len(vms)
+    columns: Dict[str, Any] = {
+        metric: np.fromiter(
+            (vm.get(metric) or 0 for vm in vms), dtype=np.int64, count=count
+        )
+        for metric in CAPACITY_METRICS
+    }
+    columns["user_id"] = np.fromiter(
+        (vm.get("user_id") or 0 for vm in vms), dtype=np.int64, count=count
+    )
+    columns["status"] = _factorize(vm.get("status") or "unknown" for vm in vms)
+    columns["operating_system"] = _factorize(
+        vm.get("operating_system") or "unknown" for vm in vms
+    )
+    columns["created_at"] = np.fromiter(
+        (_epoch_hours(vm.get("created_at")) for vm in vms), dtype=np.int64, count=count
+    ).view("datetime64[h]")
+    return columns
+
+
+def _grouped_stats(
+    codes: "np.ndarray", n_groups: int, values: "np.ndarray"
+) -> Dict[str, "np.ndarray"]:
+    """
+    Calcule total, moyenne, percentiles et maximum d'une métrique par groupe
+
+    Un seul tri lexicographique (groupe, valeur) suffit pour obtenir tous les
+    percentiles de tous les groupes par interpolation linéaire, comme
+    np.percentile.
+
+    Args:
+        codes: Indice de groupe de chaque ligne (0 <= code < n_groups)
+        n_groups: Nombre de groupes
+        values: Valeurs de la métrique
+
+    Returns:
+        Dictionnaire de tableaux indexés par groupe
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    totals = np.bincount(codes, weights=values, minlength=n_groups)
+    sorted_values = values[np.lexsort((values, codes))].astype(np.float64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    stats = {
+        "total": totals,
+        "mean": totals / np.maximum(counts, 1),
+        "max": sorted_values[starts + counts - 1],
+    }
+    for q in PERCENTILES:
+        position = starts + (counts - 1) * (q / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        stats[f"p{q}"] = (
+            sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+        )
+    return stats
+
+
+def _group_by(
+    keys: Tuple[List[Any], "np.ndarray"], columns: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Agrège les métriques de capacité par valeur de clé
+
+    Args:
+        keys: Clé de regroupement factorisée (libellés, codes) : statut, OS...
+        columns: Colonnes extraites des VMs
+
+    Returns:
+        Une entrée par groupe, triée par nombre de VMs décroissant
+    """
+    labels, codes = keys
+    counts = np.bincount(codes, minlength=len(labels))
+    metrics = {
+        metric: _grouped_stats(codes, len(labels), columns[metric])
+        for metric in CAPACITY_METRICS
+    }
+
+    groups = []
+    for index in np.argsort(-counts, kind="stable"):
+        entry: Dict[str, Any] = {"key": str(labels[index]), "vms": int(counts[index])}
+        for metric, stats in metrics.items():
+            entry[metric] = {
+                name: round(float(values[index]), 2) for name, values in stats.items()
+            }
+        groups.append(entry)
+    return groups
+
+
+def _users_capacity(
+    users: List[Dict[str, Any]], columns: Dict[str, Any], top_n: int
+) -> Dict[str, Any]:
+    """
+    Agrège la capacité par utilisateur : distribution et plus gros consommateurs
+
+    Args:
+        users: Liste des utilisateurs (pour les noms)
+        columns: Colonnes extraites des VMs
+        top_n: Nombre d'utilisateurs à retenir dans le classement
+
+    Returns:
+        Distribution des totaux par utilisateur et top-N par RAM allouée
+    """
+    user_ids, codes = np.unique(columns["user_id"], return_inverse=True)
+    n_users = len(user_ids)
+    vm_counts = np.bincount(codes, minlength=n_users)
+    totals = {
+        metric: np.bincount(codes, weights=columns[metric], minlength=n_users)
+        for metric in CAPACITY_METRICS
+    }
+
+    distribution = {}
+    for metric, per_user in totals.items():
+        percentiles = np.percentile(per_user, PERCENTILES)
+        distribution[metric] = {
+            f"p{q}": round(float(value), 2)
+            for q, value in zip(PERCENTILES, percentiles)
+        }
+        distribution[metric]["max"] = float(per_user.max())
+
+    # Sélection partielle puis tri des seuls N premiers
+    ranking = totals["ram_gb"]
+    top_n = min(top_n, n_users)
+    top = np.argpartition(-ranking, top_n - 1)[:top_n]
+    top = top[np.argsort(-ranking[top], kind="stable")]
+
+    names = {user.get("id"): user.get("name") for user in users}
+    top_users = []
+    for index in top:
+        user_id = int(user_ids[index])
+        entry = {
+            "user_id": user_id,
+            "name": names.get(user_id, "unknown"),
+            "vms": int(vm_counts[index]),
+        }
+        for metric in CAPACITY_METRICS:
+            entry[metric] = int(totals[metric][index])
+        top_users.append(entry)
+
+    return {
+        "users_with_vms": n_users,
+        "distribution": distribution,
+        "top_users": top_users,
+    }
+
+
+def _creation_histogram(created_at: "np.ndarray", bucket: str) -> Dict[str, Any]:
+    """
+    Compte les créations de VMs par période
+
+    Args:
+        created_at: Dates de création (datetime64 à l'heure)
+        bucket: Granularité (hour, day, month)
+
+    Returns:
+        Histogramme trié par période et période de pic
+    """
+    valid = created_at[~np.isnat(created_at)]
+    periods, counts = np.unique(
+        valid.astype(f"datetime64[{HISTOGRAM_BUCKETS[bucket]}]"), return_counts=True
+    )
+
+    histogram = [
+        {"period": str(period), "vms": int(count)}
+        for period, count in zip(periods, counts)
+    ]
+    peak = histogram[int(np.argmax(counts))] if histogram else None
+
+    return {"bucket": bucket, "histogram": histogram, "peak": peak}
+
+
+@traced()
+@stage("aggregate")
+def compute_capacity_report(
+    users: List[Dict[str, Any]],
+    vms: List[Dict[str, Any]],
+    top_n: int = 10,
+    bucket: str = "day",
+) -> Dict[str, Any]:
+    """
+    Calcule les statistiques de capacité de la flotte
+
+    Args:
+        users: Liste des utilisateurs
+        vms: Liste des VMs
+        top_n: Nombre d'utilisateurs dans le classement des plus gros consommateurs
+        bucket: Granularité de l'histogramme des créations (hour, day, month)
+
+    Returns:
+        Données du rapport de capacité
+
+    Raises:
+        ImportError: Si numpy n'est pas installé
+        ValueError: Si la granularité est invalide ou s'il n'y a aucune VM
+    """
+    if np is None:
+        raise ImportError(
+            "numpy est requis pour le rapport de capacité (pip install numpy)"
+        )
+    if bucket not in HISTOGRAM_BUCKETS:
+        raise ValueError(f"Granularité d'histogramme invalide: {bucket}")
+    if not vms:
+        raise ValueError("Aucune VM pour calculer la capacité")
+
+    logger.info("Calcul des statistiques de capacité", vms_count=len(vms))
+
+    columns = _extract_columns(vms)
+    users_capacity = _users_capacity(users, columns, top_n)
+
+    return {
+        "summary": {
+            "total_vms": len(vms),
+            "total_users": len(users),
+            "users_with_vms": users_capacity["users_with_vms"],
+            "totals": {
+                metric: int(columns[metric].sum()) for metric in CAPACITY_METRICS
+            },
+        },
+        "by_status": _group_by(columns["status"], columns),
+        "by_operating_system": _group_by(columns["operating_system"], columns),
+        "by_user": users_capacity,
+        "creation_rate": _creation_histogram(columns["created_at"], bucket),
+    }
@@ -0,0 +1,212 @@
+"""
+Générateur d'exports columnaires (Parquet / Arrow IPC) pour demo_api
+
+Les utilisateurs et les VMs sont écrits sous forme de tables typées,
+directement chargeables avec pandas (pd.read_parquet / pd.read_feather).
+Nécessite la dépendance optionnelle pyarrow.
+"""
+
+import json
+import os
+from typing import Dict, Any, List, Optional
+from .base import BaseReportGenerator
+from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = None
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def _dictionary(value_type: "pa.DataType") -> "pa.DataType":
+    """Type dictionnaire (colonne catégorielle) pour les valeurs très répétées"""
+    return pa.dictionary(pa.int32(), value_type)
+
+
+def users_schema() -> "pa.Schema":
+    """Schéma de la table des utilisateurs"""
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("created_at", pa.timestamp("ms")),
+        ]
+    )
+
+
+def vms_schema() -> "pa.Schema":
+    """Schéma de la table des VMs"""
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("user_id", pa.int64()),
+            ("name", pa.string()),
+            ("operating_system", _dictionary(pa.string())),
+            ("cpu_cores", pa.int32()),
+            ("ram_gb", pa.int32()),
+            ("disk_gb", pa.int32()),
+            ("status", _dictionary(pa.string())),
+            ("created_at", pa.timestamp("ms")),
+        ]
+    )
+
+
+class ColumnarReportGenerator(BaseReportGenerator):
+    """Générateur d'exports columnaires au format Parquet ou Arrow IPC"""
+
+    def __init__(
+        self,
+        output_directory: str = "outputs",
+        file_format: str = "parquet",
+        compression: str = "zstd",
+    ):
+        """
+        Initialise le générateur d'exports columnaires
+
+        Args:
+            output_directory: Dossier de sortie pour les exports
+            file_format: Format des fichiers ("parquet" ou "arrow")
+            compression: Codec de compression (zstd, lz4, snappy...)
+
+        Raises:
+            ImportError: Si pyarrow n'est pas installé
+            ValueError: Si le format demandé n'est pas supporté
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow est requis pour les exports Parquet/Arrow "
+                "(pip install pyarrow)"
+            )
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Format columnaire invalide: {file_format}")
+
+        super().__init__(output_directory)
+        self.file_format = file_format
+        self.compression = compression
+        self.columnar_directory = os.path.join(output_directory, file_format)
+        self._ensure_columnar_directory()
+
+    def _ensure_columnar_directory(self) -> None:
+        """Crée le dossier de sortie du format s'il n'existe pas"""
+        if not os.path.exists(self.columnar_directory):
+            os.makedirs(self.columnar_directory, exist_ok=True)
+            logger.info(f"Dossier {self.file_format} créé: {self.columnar_directory}")
+
+    def get_extension(self) -> str:
+        """Retourne l'extension des fichiers columnaires"""
+        return self.file_format
+
+    def _build_table(
+        self, records: List[Dict[str, Any]], schema: "pa.Schema"
+    ) -> "pa.Table":
+        """
+        Construit une table typée à partir d'une liste de dictionnaires
+
+        Seules les colonnes du schéma sont conservées ; les champs absents
+        d'un enregistrement deviennent des valeurs nulles.
+        """
+        columns = [
+            pa.array([record.get(field.name) for record in records], type=field.type)
+            for field in schema
+        ]
+
+        table = pa.Table.from_arrays(columns, schema=schema)
+        return table.replace_schema_metadata(
+            {"report_metadata": json.dumps(self._get_metadata())}
+        )
+
+    @stage("write")
+    def _write_table(self, table: "pa.Table", filename: str) -> None:
+        """Écrit une table dans le format configuré avec compression"""
+        if self.file_format == "parquet":
+            pq.write_table(table, filename, compression=self.compression)
+        else:
+            feather.write_feather(table, filename, compression=self.compression)
+
+    @traced()
+    def generate(
+        self,
+        data: Any,
+        filename: Optional[str] = None,
+        schema: Optional["pa.Schema"] = None,
+    ) -> str:
+        """
+        Génère un fichier columnaire à partir d'une liste d'enregistrements
+
+        Args:
+            data: Liste de dictionnaires à écrire
+            filename: Nom de fichier personnalisé (optionnel)
+            schema: Schéma de la table (inféré par pyarrow si absent)
+
+        Returns:
+            str: Chemin vers le fichier généré
+        """
+        if filename is None:
+            filename = self._generate_filename("report", self.get_extension())
+        else:
+            # S'assurer que le fichier a la bonne extension
+            if not filename.endswith(f".{self.get_extension()}"):
+                filename = f"{filename}.{self.get_extension()}"
+            filename = os.path.join(self.columnar_directory, filename)
+
+        try:
+            if schema is not None:
+                table = self._build_table(data, schema)
+            else:
+                table = pa.Table.from_pylist(data)
+            self._write_table(table, filename)
+
+            logger.info(
+                "Export columnaire généré avec succès",
+                filename=filename,
+                file_format=self.file_format,
+                rows=table.num_rows,
+            )
+
+            return filename
+
+        except Exception as e:
+            logger.error(
+                "Erreur lors de la génération de l'export columnaire",
+                filename=filename,
+                error=str(e),
+            )
+            raise
+
+    def generate_fleet_snapshot(
+        self,
+        users: List[Dict[str, Any]],
+        vms: List[Dict[str, Any]],
+        basename: str = "fleet",
+    ) -> List[str]:
+        """
+        Exporte un instantané de la flotte : une table utilisateurs et une table VMs
+
+        Args:
+            users: Liste des utilisateurs
+            vms: Liste des VMs
+            basename: Préfixe des fichiers générés
+
+        Returns:
+            Liste des chemins générés (utilisateurs puis VMs)
+        """
+        logger.info(
+            "Génération de l'instantané columnaire de la flotte",
+            users_count=len(users),
+            vms_count=len(vms),
+            file_format=self.file_format,
+        )
+
+        return [
+            self.generate(users, f"{basename}_users", users_schema()),
+            self.generate(vms, f"{basename}_vms", vms_schema()),
+        ]
@@ -6,7 +6,10 @@ import os
 from typing import Dict, Any, List, Optional
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from .base import BaseReportGenerator
+from .pagination import paginate, build_page_jobs, render_pages
 from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -26,11 +29,11 @@ class HTMLReportGenerator(BaseReportGenerator):
         self._ensure_html_directory()
 
         # Configuration de Jinja2
-        template_dir = os.path.join(
+        self.template_dir = os.path.join(
             os.path.dirname(__file__), "..", "templates", "html"
         )
         self.jinja_env = Environment(
-            loader=FileSystemLoader(template_dir),
+            loader=FileSystemLoader(self.template_dir),
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
@@ -53,6 +56,7 @@ class HTMLReportGenerator(BaseReportGenerator):
         """Retourne l'extension des fichiers HTML"""
         return "html"
 
+    @traced()
     def generate(
         self,
         data: Any,
@@ -84,9 +88,10 @@ class HTMLReportGenerator(BaseReportGenerator):
         # Générer le fichier HTML
         try:
             template = self.jinja_env.get_template(template_name)
-            content = template.render(**report_data)
+            with stage("render"):
+                content = template.render(**report_data)
 
-            with open(filename, "w", encoding="utf-8") as f:
+            with stage("write"), open(filename, "w", encoding="utf-8") as f:
                 f.write(content)
 
             logger.info(
@@ -106,22 +111,33 @@ class HTMLReportGenerator(BaseReportGenerator):
             raise
 
     def generate_users_vms_report(
-        self, users: List[Dict[str, Any]], filename: str = "vm_users.html"
+        self,
+        users: List[Dict[str, Any]],
+        filename: str = "vm_users.html",
+        users_per_page: Optional[int] = None,
+        workers: Optional[int] = None,
     ) -> str:
         """
         Génère un rapport spécifique pour les utilisateurs et VMs
 
+        Si users_per_page est fourni et dépassé, le rapport est découpé en
+        pages rendues en parallèle, et le fichier principal devient un index
+        contenant le résumé et les liens vers chaque page.
+
         Args:
             users: Liste des utilisateurs avec leurs VMs associées
             filename: Nom du fichier de sortie
+            users_per_page: Nombre d'utilisateurs par page (optionnel)
+            workers: Nombre de processus de rendu (défaut: nombre de cœurs)
 
         Returns:
-            str: Chemin vers le fichier généré
+            str: Chemin vers le fichier généré (l'index en mode paginé)
         """
         logger.info(
             "Génération du rapport utilisateurs/VMs HTML",
             users_count=len(users),
             filename=filename,
+            users_per_page=users_per_page,
         )
 
         # Statistiques supplémentaires
@@ -138,8 +154,43 @@ class HTMLReportGenerator(BaseReportGenerator):
             "users": users,
         }
 
+        if users_per_page and len(users) > users_per_page:
+            return self._generate_paginated_users_vms_report(
+                report_data, filename, users_per_page, workers
+            )
+
         return self.generate(report_data, filename, "users_vms_report.html.j2")
 
+    def _generate_paginated_users_vms_report(
+        self,
+        report_data: Dict[str, Any],
+        filename: str,
+        users_per_page: int,
+        workers: Optional[int],
+    ) -> str:
+        """Génère les pages du rapport utilisateurs/VMs puis l'index"""
+        if not filename.endswith(f".{self.get_extension()}"):
+            filename = f"{filename}.{self.get_extension()}"
+
+        pages = paginate(report_data["users"], users_per_page)
+        jobs, entries = build_page_jobs(
+            pages,
+            "users_vms_page.html.j2",
+            self._get_metadata(),
+            filename,
+            self.html_directory,
+            self.get_extension(),
+        )
+        render_pages(self.template_dir, jobs, workers)
+
+        index_data = {
+            "summary": report_data["summary"],
+            "users_per_page": users_per_page,
+            "pages": entries,
+        }
+
+        return self.generate(index_data, filename, "users_vms_index.html.j2")
+
     def generate_status_report(
         self, status_data: Dict[str, Any], filename: str = "vm_status_report.html"
     ) -> str:
@@ -157,6 +208,41 @@ class HTMLReportGenerator(BaseReportGenerator):
 
         return self.generate(status_data, filename, "vm_status_report.html.j2")
 
+    def generate_capacity_report(
+        self, capacity_data: Dict[str, Any], filename: str = "vm_capacity_report.html"
+    ) -> str:
+        """
+        Génère un rapport de capacité de la flotte
+
+        Args:
+            capacity_data: Statistiques de capacité (voir reports.capacity)
+            filename: Nom du fichier de sortie
+
+        Returns:
+            str: Chemin vers le fichier généré
+        """
+        logger.info("Génération du rapport de capacité HTML", filename=filename)
+
+        return self.generate(capacity_data, filename, "capacity_report.html.j2")
+
+    def generate_trend_report(
+        self, trend_data: Dict[str, Any], filename: str = "vm_trend_report.html"
+    ) -> str:
+        """
+        Génère un rapport de tendance de la flotte
+
+        Args:
+            trend_data: Évolution de la flotte (voir reports.trend)
+            filename: Nom du fichier de sortie
+
+        Returns:
+            str: Chemin vers le fichier généré
+        """
+        logger.info("Génération du rapport de tendance HTML", filename=filename)
+
+        return self.generate(trend_data, filename, "trend_report.html.j2")
+
+    @stage("aggregate")
     def _calculate_users_vms_stats(self, users: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calcule les statistiques des utilisateurs et VMs"""
         total_vms: int = 0
@@ -2,11 +2,13 @@
 Générateur de rapports JSON pour demo_api
 """
 
-import json
 import os
 from typing import Dict, Any, List, Optional
 from .base import BaseReportGenerator
+from utils import json_codec
 from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -35,6 +37,7 @@ class JSONReportGenerator(BaseReportGenerator):
         """Retourne l'extension des fichiers JSON"""
         return "json"
 
+    @traced()
     def generate(self, data: Any, filename: Optional[str] = None) -> str:
         """
         Génère un rapport JSON
@@ -59,17 +62,16 @@ class JSONReportGenerator(BaseReportGenerator):
 
         # Générer le fichier JSON
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(
-                    report_data,
-                    f,
-                    indent=4,
-                    sort_keys=True,
-                    default=str,
-                    ensure_ascii=False,
-                )
-
-            logger.info("Rapport JSON généré avec succès", filename=filename, data_size=len(str(data)))
+            data_size = json_codec.dump_file(
+                report_data, filename, indent=True, sort_keys=True
+            )
+
+            logger.info(
+                "Rapport JSON généré avec succès",
+                filename=filename,
+                data_size=data_size,
+                json_backend=json_codec.backend.name,
+            )
 
             return filename
 
@@ -108,6 +110,7 @@ class JSONReportGenerator(BaseReportGenerator):
 
         return self.generate(report_data, filename)
 
+    @stage("aggregate")
     def _calculate_users_vms_stats(self, users: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calcule les statistiques des utilisateurs et VMs"""
         total_vms: int = 0
@@ -135,6 +138,40 @@ class JSONReportGenerator(BaseReportGenerator):
             "users_without_vms": users_without_vms,
         }
 
+    def generate_capacity_report(
+        self, capacity_data: Dict[str, Any], filename: str = "vm_capacity_report.json"
+    ) -> str:
+        """
+        Génère un rapport de capacité de la flotte
+
+        Args:
+            capacity_data: Statistiques de capacité (voir reports.capacity)
+            filename: Nom du fichier de sortie
+
+        Returns:
+            str: Chemin vers le fichier généré
+        """
+        logger.info("Génération du rapport de capacité JSON", filename=filename)
+
+        return self.generate(capacity_data, filename)
+
+    def generate_trend_report(
+        self, trend_data: Dict[str, Any], filename: str = "vm_trend_report.json"
+    ) -> str:
+        """
+        Génère un rapport de tendance de la flotte
+
+        Args:
+            trend_data: Évolution de la flotte (voir reports.trend)
+            filename: Nom du fichier de sortie
+
+        Returns:
+            str: Chemin vers le fichier généré
+        """
+        logger.info("Génération du rapport de tendance JSON", filename=filename)
+
+        return self.generate(trend_data, filename)
+
     def generate_api_summary_report(
         self, api_data: Dict[str, Any], filename: str = "api_summary.json"
     ) -> str:
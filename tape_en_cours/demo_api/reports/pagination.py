@@ -0,0 +1,184 @@
+"""
+Pagination des rapports volumineux pour demo_api
+
+Découpe la liste des utilisateurs en pages de taille fixe et rend chaque
+page dans un processus de travail séparé. Les fonctions exécutées dans les
+processus sont définies au niveau du module pour pouvoir être sérialisées.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
+
+logger = get_logger(__name__)
+
+# Environnements Jinja2 déjà construits dans le processus courant
+_environments: Dict[str, Environment] = {}
+
+
+def _pad_filter(text: str, width: int) -> str:
+    """Filtre Jinja2 pour padding de texte"""
+    return text.ljust(width)
+
+
+def _get_environment(template_dir: str) -> Environment:
+    """Retourne l'environnement Jinja2 du dossier, construit une seule fois par processus"""
+    env = _environments.get(template_dir)
+    if env is None:
+        env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(["html", "xml"]),
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        env.filters["pad"] = _pad_filter
+        _environments[template_dir] = env
+    return env
+
+
+def paginate(items: List[Any], per_page: int) -> List[List[Any]]:
+    """
+    Découpe une liste en pages de taille fixe
+
+    Args:
+        items: Éléments à découper
+        per_page: Nombre d'éléments par page
+
+    Returns:
+        Liste des pages (la dernière peut être incomplète)
+    """
+    if per_page <= 0:
+        raise ValueError(f"Taille de page invalide: {per_page}")
+    return [items[i : i + per_page] for i in range(0, len(items), per_page)]
+
+
+def page_filename(base_filename: str, page_number: int, extension: str) -> str:
+    """
+    Construit le nom de fichier d'une page à partir du nom de l'index
+
+    Args:
+        base_filename: Nom du fichier index (ex: "vm_users.html")
+        page_number: Numéro de la page (à partir de 1)
+        extension: Extension des fichiers générés
+
+    Returns:
+        str: Nom du fichier de la page (ex: "vm_users_page_0001.html")
+    """
+    stem = os.path.basename(base_filename)
+    if stem.endswith(f".{extension}"):
+        stem = stem[: -len(extension) - 1]
+    return f"{stem}_page_{page_number:04d}.{extension}"
+
+
+def build_page_jobs(
+    pages: List[List[Dict[str, Any]]],
+    template_name: str,
+    metadata: Dict[str, Any],
+    index_filename: str,
+    output_directory: str,
+    extension: str,
+) -> Tuple[List[Tuple[str, Dict[str, Any], str]], List[Dict[str, Any]]]:
+    """
+    Prépare les jobs de rendu des pages et les entrées de l'index
+
+    Args:
+        pages: Utilisateurs découpés en pages
+        template_name: Template Jinja2 d'une page
+        metadata: Métadonnées communes au rapport
+        index_filename: Nom du fichier index (pour les liens de navigation)
+        output_directory: Dossier de sortie des pages
+        extension: Extension des fichiers générés
+
+    Returns:
+        Tuple (jobs de rendu, entrées de l'index)
+    """
+    index_name = os.path.basename(index_filename)
+    names = [page_filename(index_name, n, extension) for n in range(1, len(pages) + 1)]
+
+    jobs = []
+    entries = []
+    for number, (name, page_users) in enumerate(zip(names, pages), start=1):
+        navigation = {
+            "page": number,
+            "total_pages": len(pages),
+            "index": index_name,
+            "previous": names[number - 2] if number > 1 else None,
+            "next": names[number] if number < len(pages) else None,
+        }
+        context = {
+            "metadata": metadata,
+            "data": {"navigation": navigation, "users": page_users},
+        }
+        jobs.append((template_name, context, os.path.join(output_directory, name)))
+        entries.append(
+            {
+                "page": number,
+                "filename": name,
+                "first_user": page_users[0].get("name"),
+                "last_user": page_users[-1].get("name"),
+                "users_count": len(page_users),
+                "vms_count": sum(len(u.get("vms", [])) for u in page_users),
+            }
+        )
+
+    return jobs, entries
+
+
+def render_page(
+    template_dir: str, template_name: str, context: Dict[str, Any], filename: str
+) -> str:
+    """
+    Rend un template dans un fichier (exécuté dans un processus de travail)
+
+    Args:
+        template_dir: Dossier contenant les templates
+        template_name: Nom du template Jinja2
+        context: Variables passées au template
+        filename: Chemin du fichier de sortie
+
+    Returns:
+        str: Chemin du fichier généré
+    """
+    template = _get_environment(template_dir).get_template(template_name)
+    content = template.render(**context)
+
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(content)
+
+    return filename
+
+
+@traced()
+@stage("render")
+def render_pages(
+    template_dir: str,
+    jobs: List[Tuple[str, Dict[str, Any], str]],
+    workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Rend plusieurs pages, en parallèle si plusieurs processus sont demandés
+
+    Args:
+        template_dir: Dossier contenant les templates
+        jobs: Liste de tuples (template_name, context, filename)
+        workers: Nombre de processus (défaut: nombre de cœurs)
+
+    Returns:
+        Liste des fichiers générés, dans l'ordre des jobs
+    """
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    logger.info("Rendu des pages du rapport", pages=len(jobs), workers=workers)
+
+    if workers == 1:
+        return [render_page(template_dir, *job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_page, template_dir, *job) for job in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,93 @@
+"""
+Calcul des tendances de la flotte pour demo_api
+
+Les tendances sont calculées à partir des seules entrées d'index de
+l'historique (agrégats précalculés à chaque instantané, voir
+utils.services.snapshot_store) : aucun instantané complet n'est relu.
+"""
+
+from typing import Dict, Any, List, Optional
+from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
+
+logger = get_logger(__name__)
+
+# Métriques de capacité suivies dans l'historique
+CAPACITY_METRICS = ("cpu_cores", "ram_gb", "disk_gb")
+
+
+def _evolution(first: int, last: int) -> Dict[str, Any]:
+    """Évolution d'une valeur entre le premier et le dernier instantané"""
+    return {
+        "first": first,
+        "last": last,
+        "change": last - first,
+        "change_pct": round((last - first) * 100 / first, 1) if first else None,
+    }
+
+
+@traced()
+@stage("aggregate")
+def compute_trend_report(
+    entries: List[Dict[str, Any]], limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Calcule l'évolution de la flotte à partir des entrées d'index
+
+    Args:
+        entries: Entrées d'index de l'historique (de la plus ancienne à la plus
+            récente)
+        limit: Ne conserver que les N derniers instantanés (optionnel)
+
+    Returns:
+        Données du rapport de tendance
+
+    Raises:
+        ValueError: Si l'historique est vide
+    """
+    if limit:
+        entries = entries[-limit:]
+    if not entries:
+        raise ValueError("Aucun instantané dans l'historique")
+
+    logger.info("Calcul des tendances de la flotte", snapshots=len(entries))
+
+    statuses = sorted({status for e in entries for status in e["vms_by_status"]})
+    series = [
+        {
+            "snapshot_id": entry["snapshot_id"],
+            "taken_at": entry["taken_at"],
+            "users": entry["users"],
+            "vms": entry["vms"],
+            "vms_by_status": {
+                status: entry["vms_by_status"].get(status, 0) for status in statuses
+            },
+            "totals": entry["totals"],
+            "churn": entry["churn"],
+        }
+        for entry in entries
+    ]
+    first, last = series[0], series[-1]
+
+    return {
+        "summary": {
+            "snapshots": len(series),
+            "first_snapshot": first["taken_at"],
+            "last_snapshot": last["taken_at"],
+            "users": _evolution(first["users"], last["users"]),
+            "vms": _evolution(first["vms"], last["vms"]),
+            "vms_by_status": {
+                status: _evolution(
+                    first["vms_by_status"][status], last["vms_by_status"][status]
+                )
+                for status in statuses
+            },
+            "totals": {
+                metric: _evolution(first["totals"][metric], last["totals"][metric])
+                for metric in CAPACITY_METRICS
+            },
+        },
+        "statuses": statuses,
+        "series": series,
+    }
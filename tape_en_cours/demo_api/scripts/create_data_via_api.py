@@ -8,11 +8,9 @@ avec des données réalistes.
 """
 
 import typer
-import time
 import sys
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from pathlib import Path
-import json
 from datetime import datetime
 from rich.console import Console
 from rich.progress import (
@@ -29,8 +27,17 @@ from rich.panel import Panel
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.api import ApiClient, create_authenticated_client
+from utils.bulk_pipeline import BulkPipeline, RateLimiter, StageStats
+from utils.creation_journal import (
+    CreationJournal,
+    UnfinishedJournalError,
+    USER,
+    VM,
+)
 from utils.data_generator import UserDataGenerator, VMDataGenerator
+from utils import json_codec
 from utils.logging_config import get_logger
+from utils.profiling import add_profile_option, stage
 
 logger = get_logger(__name__)
 console = Console()
@@ -42,6 +49,7 @@ app = typer.Typer(
     add_completion=False,
     no_args_is_help=True,
 )
+add_profile_option(app)
 
 
 # =============================================================================
@@ -127,6 +135,28 @@ def display_statistics(title: str, stats: Dict[str, Any]) -> None:
     console.print()
 
 
+def display_pipeline_stats(stats: Dict[str, StageStats]) -> None:
+    """Affiche les compteurs de débit de chaque étage du pipeline"""
+    stats_table = Table(title="⚙️ Débit du pipeline")
+    stats_table.add_column("Étage", style="cyan")
+    stats_table.add_column("Éléments", style="green")
+    stats_table.add_column("Erreurs", style="red")
+    stats_table.add_column("Temps actif", style="magenta")
+    stats_table.add_column("Débit", style="green")
+
+    for stage_stats in stats.values():
+        stats_table.add_row(
+            stage_stats.name,
+            str(stage_stats.items),
+            str(stage_stats.errors),
+            f"{stage_stats.busy:.2f}s",
+            f"{stage_stats.throughput:.1f}/s",
+        )
+
+    console.print(stats_table)
+    console.print()
+
+
 def display_preview(
     title: str, items: List[Dict[str, Any]], max_items: int = 5
 ) -> None:
@@ -188,11 +218,99 @@ def display_api_status(all_data: Dict[str, Any], api_url: str) -> None:
 # =============================================================================
 
 
+def _progress_bar() -> Progress:
+    """Barre de progression commune aux créations en masse"""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TimeElapsedColumn(),
+        console=console,
+    )
+
+
+@stage("create")
+def _run_creation_pipeline(
+    item_type: str,
+    description: str,
+    total: int,
+    already_created: Dict[int, Dict[str, Any]],
+    produce: Callable[[int], Dict[str, Any]],
+    send: Callable[[int, Dict[str, Any]], Dict[str, Any]],
+    batch_size: int,
+    delay_between_batches: float,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """
+    Exécute une création en masse dans le pipeline génération → envoi → rapport
+
+    Le rythme des appels reste celui des lots (délai/2 entre deux éléments,
+    délai entre deux lots), mais la génération, les appels réseau des
+    différents threads et l'affichage se recouvrent.
+
+    Args:
+        item_type: Libellé des éléments pour les messages d'erreur
+        description: Libellé de la barre de progression
+        total: Nombre total d'éléments
+        already_created: Éléments déjà créés (index -> enregistrement)
+        produce: Construit les données d'un élément à partir de son index
+        send: Crée un élément via l'API et retourne l'enregistrement
+        batch_size: Nombre d'éléments par lot
+        delay_between_batches: Délai entre les lots (en secondes)
+        workers: Nombre de threads d'envoi
+
+    Returns:
+        Enregistrements créés, dans l'ordre des éléments
+    """
+    created = dict(already_created)
+    todo = [index for index in range(total) if index not in created]
+
+    pipeline = BulkPipeline(
+        produce,
+        send,
+        workers=workers,
+        queue_size=batch_size * 4,
+        rate_limiter=RateLimiter(
+            delay_between_batches / 2, batch_size, delay_between_batches
+        ),
+        report_every=batch_size,
+    )
+
+    with _progress_bar() as progress:
+        task = progress.add_task(description, total=total, completed=len(created))
+        batch_num = 0
+
+        def report(results: List[Dict[str, Any]]) -> None:
+            nonlocal batch_num
+            batch_num += 1
+            done = int(progress.tasks[task].completed)
+            display_batch_progress(batch_num, done, done + len(results), total)
+            for result in results:
+                if result["error"] is not None:
+                    error = result["error"]
+                    display_error_message(
+                        item_type, result["index"], f"{type(error).__name__}: {error}"
+                    )
+            progress.update(task, advance=len(results))
+
+        results = pipeline.run(todo, report)
+
+    for result in results:
+        if result["error"] is None:
+            created[result["index"]] = result["record"]
+
+    display_pipeline_stats(pipeline.stats)
+    return [created[index] for index in sorted(created)]
+
+
 def create_users_via_api(
     api_client: ApiClient,
     user_count: int,
     batch_size: int = 10,
     delay_between_batches: float = 0.5,
+    journal: Optional[CreationJournal] = None,
+    workers: int = 4,
 ) -> List[Dict[str, Any]]:
     """
     Crée des utilisateurs via l'API en utilisant le générateur Faker.
@@ -202,90 +320,77 @@ def create_users_via_api(
         user_count: Nombre d'utilisateurs à créer
         batch_size: Nombre d'utilisateurs à créer par lot
         delay_between_batches: Délai entre les lots (en secondes)
+        journal: Journal de reprise (les utilisateurs déjà créés sont sautés)
+        workers: Nombre de threads d'envoi vers l'API
 
     Returns:
         Liste des utilisateurs créés
     """
     logger.info(
-        "Création d'utilisateurs via API", count=user_count, batch_size=batch_size
+        "Création d'utilisateurs via API",
+        count=user_count,
+        batch_size=batch_size,
+        workers=workers,
     )
 
-    created_users = []
-    created_count = 0
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        TimeElapsedColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task(
-            f"Création de {user_count} utilisateurs...", total=user_count
-        )
-
-        for batch_start in range(0, user_count, batch_size):
-            batch_end = min(batch_start + batch_size, user_count)
-            batch_size_actual = batch_end - batch_start
-
-            display_batch_progress(
-                batch_start // batch_size + 1, batch_start, batch_end, user_count
+    # Utilisateurs déjà créés lors d'une exécution précédente
+    already_created = {}
+    if journal:
+        for index in range(user_count):
+            if journal.created(USER, index):
+                already_created[index] = journal.created(USER, index)
+
+    def produce(index: int) -> Dict[str, Any]:
+        # Reprendre les données journalisées ou les générer avec Faker
+        user_data = journal.planned(USER, index) if journal else None
+        if user_data is None:
+            user_data = UserDataGenerator.generate_user(index + 1)
+            if journal:
+                journal.record_planned(USER, index, user_data)
+        return user_data
+
+    def send(index: int, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            created_user = api_client.users.create_user(
+                name=user_data["name"],
+                email=user_data["email"],
+                password="password123",  # Mot de passe par défaut
             )
-
-            for i in range(batch_size_actual):
-                try:
-                    # Générer les données utilisateur avec Faker
-                    user_data = UserDataGenerator.generate_user(created_count + 1)
-                    created_user = api_client.users.create_user(
-                        name=user_data["name"],
-                        email=user_data["email"],
-                        password="password123",  # Mot de passe par défaut
-                    )
-
-                    # Vérifier que l'utilisateur a été créé avec succès
-                    if (
-                        created_user
-                        and isinstance(created_user, dict)
-                        and "id" in created_user
-                    ):
-                        created_users.append(created_user)
-                        created_count += 1
-                        display_success_message(
-                            "Utilisateur", user_data["name"], user_data["email"]
-                        )
-                    else:
-                        logger.error(
-                            "Échec de création d'utilisateur - données invalides",
-                            user_data=user_data,
-                            created_user=created_user,
-                            created_user_type=type(created_user),
-                        )
-                        display_error_message(
-                            "utilisateur",
-                            i,
-                            f"Données utilisateur invalides: {created_user}",
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        "Erreur lors de la création d'un utilisateur",
-                        error=str(e),
-                        error_type=type(e).__name__,
-                    )
-                    display_error_message(
-                        "utilisateur", i, f"{type(e).__name__}: {str(e)}"
-                    )
-
-                progress.update(task, advance=1)
-
-                # Délai entre chaque création d'utilisateur
-                if i < batch_size_actual - 1 or batch_end < user_count:
-                    time.sleep(delay_between_batches / 2)
-
-            # Délai entre les lots pour éviter de surcharger l'API
-            if batch_end < user_count:
-                time.sleep(delay_between_batches)
+        except Exception as e:
+            logger.error(
+                "Erreur lors de la création d'un utilisateur",
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            raise
+
+        # Vérifier que l'utilisateur a été créé avec succès
+        if not (
+            created_user and isinstance(created_user, dict) and "id" in created_user
+        ):
+            logger.error(
+                "Échec de création d'utilisateur - données invalides",
+                user_data=user_data,
+                created_user=created_user,
+                created_user_type=type(created_user),
+            )
+            raise ValueError(f"Données utilisateur invalides: {created_user}")
+
+        if journal:
+            journal.record_created(USER, index, created_user)
+        return created_user
+
+    created_users = _run_creation_pipeline(
+        "utilisateur",
+        f"Création de {user_count} utilisateurs...",
+        user_count,
+        already_created,
+        produce,
+        send,
+        batch_size,
+        delay_between_batches,
+        workers,
+    )
 
     logger.info("Utilisateurs créés avec succès", count=len(created_users))
     return created_users
@@ -297,6 +402,8 @@ def create_vms_via_api(
     user_ids: List[int],
     batch_size: int = 10,
     delay_between_batches: float = 0.5,
+    journal: Optional[CreationJournal] = None,
+    workers: int = 4,
 ) -> List[Dict[str, Any]]:
     """
     Crée des VMs via l'API en utilisant le générateur Faker.
@@ -307,6 +414,8 @@ def create_vms_via_api(
         user_ids: Liste des IDs d'utilisateurs disponibles
         batch_size: Nombre de VMs à créer par lot
         delay_between_batches: Délai entre les lots (en secondes)
+        journal: Journal de reprise (les VMs déjà créées sont sautées)
+        workers: Nombre de threads d'envoi vers l'API
 
     Returns:
         Liste des VMs créées
@@ -317,98 +426,80 @@ def create_vms_via_api(
         raise ValueError("Aucun ID d'utilisateur valide fourni pour la création de VMs")
 
     logger.info(
-        "Création de VMs via API", count=vm_count, available_users=len(user_ids)
+        "Création de VMs via API",
+        count=vm_count,
+        available_users=len(user_ids),
+        workers=workers,
     )
 
-    created_vms = []
-    created_count = 0
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        TimeElapsedColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task(f"Création de {vm_count} VMs...", total=vm_count)
-
-        for batch_start in range(0, vm_count, batch_size):
-            batch_end = min(batch_start + batch_size, vm_count)
-            batch_size_actual = batch_end - batch_start
-
-            display_batch_progress(
-                batch_start // batch_size + 1, batch_start, batch_end, vm_count
+    # VMs déjà créées lors d'une exécution précédente
+    already_created = {}
+    if journal:
+        for index in range(vm_count):
+            if journal.created(VM, index):
+                already_created[index] = journal.created(VM, index)
+
+    def produce(index: int) -> Dict[str, Any]:
+        # Reprendre les données journalisées ou les générer avec Faker
+        vm_data = journal.planned(VM, index) if journal else None
+        if vm_data is None:
+            selected_user_id = user_ids[index % len(user_ids)]
+            if selected_user_id is None:
+                logger.error(f"ID utilisateur None trouvé dans user_ids: {user_ids}")
+                raise ValueError("ID utilisateur None trouvé")
+
+            vm_data = VMDataGenerator.generate_vm(
+                user_id=selected_user_id,
+                vm_id=index + 1,
             )
-
-            for i in range(batch_size_actual):
-                try:
-                    # Vérifier que user_ids est valide avant utilisation
-                    if not user_ids or len(user_ids) == 0:
-                        logger.error(f"user_ids invalide: {user_ids}")
-                        raise ValueError("Liste d'IDs d'utilisateurs vide ou None")
-
-                    selected_user_id = user_ids[created_count % len(user_ids)]
-
-                    if selected_user_id is None:
-                        logger.error(
-                            f"ID utilisateur None trouvé dans user_ids: {user_ids}"
-                        )
-                        raise ValueError("ID utilisateur None trouvé")
-
-                    # Générer les données VM avec Faker
-                    vm_data = VMDataGenerator.generate_vm(
-                        user_id=selected_user_id,
-                        vm_id=created_count + 1,
-                    )
-                    created_vm = api_client.vms.create(
-                        user_id=vm_data["user_id"],
-                        name=vm_data["name"],
-                        operating_system=vm_data["operating_system"],
-                        cpu_cores=vm_data["cpu_cores"],
-                        ram_gb=vm_data["ram_gb"],
-                        disk_gb=vm_data["disk_gb"],
-                        status=vm_data["status"],
-                    )
-
-                    # Vérifier que la VM a été créée avec succès
-                    if (
-                        created_vm
-                        and isinstance(created_vm, dict)
-                        and "id" in created_vm
-                    ):
-                        created_vms.append(created_vm)
-                        created_count += 1
-                        vm_details = f"{vm_data['operating_system']} - {vm_data['cpu_cores']}c/{vm_data['ram_gb']}GB"
-                        display_success_message("VM", vm_data["name"], vm_details)
-                    else:
-                        logger.error(
-                            "Échec de création de VM - données invalides",
-                            vm_data=vm_data,
-                            created_vm=created_vm,
-                            created_vm_type=type(created_vm),
-                        )
-                        display_error_message(
-                            "VM", i, f"Données VM invalides: {created_vm}"
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        "Erreur lors de la création d'une VM",
-                        error=str(e),
-                        error_type=type(e).__name__,
-                    )
-                    display_error_message("VM", i, f"{type(e).__name__}: {str(e)}")
-
-                progress.update(task, advance=1)
-
-                # Délai entre chaque création de VM
-                if i < batch_size_actual - 1 or batch_end < vm_count:
-                    time.sleep(delay_between_batches / 2)
-
-            # Délai entre les lots pour éviter de surcharger l'API
-            if batch_end < vm_count:
-                time.sleep(delay_between_batches)
+            if journal:
+                journal.record_planned(VM, index, vm_data)
+        return vm_data
+
+    def send(index: int, vm_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            created_vm = api_client.vms.create(
+                user_id=vm_data["user_id"],
+                name=vm_data["name"],
+                operating_system=vm_data["operating_system"],
+                cpu_cores=vm_data["cpu_cores"],
+                ram_gb=vm_data["ram_gb"],
+                disk_gb=vm_data["disk_gb"],
+                status=vm_data["status"],
+            )
+        except Exception as e:
+            logger.error(
+                "Erreur lors de la création d'une VM",
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            raise
+
+        # Vérifier que la VM a été créée avec succès
+        if not (created_vm and isinstance(created_vm, dict) and "id" in created_vm):
+            logger.error(
+                "Échec de création de VM - données invalides",
+                vm_data=vm_data,
+                created_vm=created_vm,
+                created_vm_type=type(created_vm),
+            )
+            raise ValueError(f"Données VM invalides: {created_vm}")
+
+        if journal:
+            journal.record_created(VM, index, created_vm)
+        return created_vm
+
+    created_vms = _run_creation_pipeline(
+        "VM",
+        f"Création de {vm_count} VMs...",
+        vm_count,
+        already_created,
+        produce,
+        send,
+        batch_size,
+        delay_between_batches,
+        workers,
+    )
 
     logger.info("VMs créées avec succès", count=len(created_vms))
     return created_vms
@@ -430,6 +521,9 @@ def users(
     delay: float = typer.Option(
         2.0, "--delay", "-d", help="Délai entre les lots (secondes)", min=0.5, max=10.0
     ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Nombre de threads d'envoi vers l'API", min=1, max=16
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
 ) -> None:
     """
@@ -443,6 +537,7 @@ def users(
     python create_data_via_api.py users --count 20
     python create_data_via_api.py users -c 50 --batch-size 10 --delay 3.0 --max-retries 7
     python create_data_via_api.py users --verbose
+    python create_data_via_api.py users -c 100 --workers 8
     """
     display_header(
         "👥 Création d'utilisateurs via l'API",
@@ -480,6 +575,7 @@ def users(
             user_count=count,
             batch_size=batch_size,
             delay_between_batches=delay,
+            workers=workers,
         )
 
         # Statistiques
@@ -521,6 +617,9 @@ def vms(
     delay: float = typer.Option(
         2.0, "--delay", "-d", help="Délai entre les lots (secondes)", min=0.5, max=10.0
     ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Nombre de threads d'envoi vers l'API", min=1, max=16
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
 ) -> None:
     """
@@ -535,6 +634,7 @@ def vms(
     python create_data_via_api.py vms --count 50
     python create_data_via_api.py vms -c 100 --batch-size 10 --delay 3.0
     python create_data_via_api.py vms --verbose
+    python create_data_via_api.py vms -c 200 --workers 8
     """
     display_header(
         "🖥️ Création de VMs via l'API", f"Génération de {count} VMs avec Faker"
@@ -593,6 +693,7 @@ def vms(
             user_ids=user_ids,
             batch_size=batch_size,
             delay_between_batches=delay,
+            workers=workers,
         )
 
         # Statistiques
@@ -644,6 +745,26 @@ def full_dataset(
         "-o",
         help="Fichier de sortie pour sauvegarder les données créées",
     ),
+    journal_file: str = typer.Option(
+        "outputs/journal/full_dataset.jsonl",
+        "--journal",
+        "-j",
+        help="Journal de reprise (données générées et IDs créés)",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        "-r",
+        help="Reprendre une exécution interrompue à partir du journal",
+    ),
+    fresh: bool = typer.Option(
+        False,
+        "--fresh",
+        help="Repartir de zéro même si le journal contient des éléments en cours",
+    ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", help="Nombre de threads d'envoi vers l'API", min=1, max=16
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Mode verbeux"),
 ) -> None:
     """
@@ -652,18 +773,40 @@ def full_dataset(
     Crée des utilisateurs et des VMs réalistes avec Faker via l'API.
     Optionnellement sauvegarde les données créées dans un fichier JSON.
 
+    Chaque élément généré puis créé est écrit dans un journal : après une
+    interruption, --resume saute les éléments déjà créés et réutilise les IDs
+    des utilisateurs pour la création des VMs. Un journal interrompu n'est
+    jamais écrasé sans --fresh.
+
     Exemples:
 
     \b
     python create_data_via_api.py full-dataset --users 20 --vms 50
     python create_data_via_api.py full-dataset -u 30 -v 100 --delay 3.0 --output dataset.json
     python create_data_via_api.py full-dataset --verbose
+    python create_data_via_api.py full-dataset -u 30 -v 100 --resume
+    python create_data_via_api.py full-dataset -u 30 -v 100 --fresh
     """
     display_header(
         "🎯 Création d'un dataset complet",
         f"{user_count} utilisateurs + {vm_count} VMs avec Faker",
     )
 
+    if resume and fresh:
+        console.print("[bold red]❌ --resume et --fresh sont incompatibles[/bold red]")
+        raise typer.Exit(1)
+
+    # Journal de reprise, vérifié avant tout appel à l'API
+    try:
+        journal = CreationJournal(journal_file, resume=resume, fresh=fresh)
+    except UnfinishedJournalError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
+        console.print(
+            "[dim]💡 --resume pour reprendre l'exécution interrompue, "
+            "--fresh pour repartir de zéro[/dim]"
+        )
+        raise typer.Exit(1) from e
+
     try:
         # Créer le client API avec authentification automatique
         console.print(
@@ -691,6 +834,21 @@ def full_dataset(
             "Dataset complet", user_count + vm_count, batch_size, delay
         )
 
+        # Reprise à partir du journal
+        if resume:
+            # Éléments envoyés sans confirmation : les retrouver dans l'API
+            if journal.pending(USER):
+                journal.reconcile(USER, api_client.users.get(), ("email",))
+            if journal.pending(VM):
+                journal.reconcile(VM, api_client.vms.get(), ("user_id", "name"))
+
+            console.print(
+                f"[bold cyan]♻️ Reprise depuis {journal_file}:[/bold cyan] "
+                f"{len(journal.created_records(USER))} utilisateur(s) et "
+                f"{len(journal.created_records(VM))} VM(s) déjà créé(s)"
+            )
+            console.print()
+
         # Étape 1: Créer les utilisateurs
         console.print(
             Panel.fit(
@@ -703,6 +861,8 @@ def full_dataset(
             user_count=user_count,
             batch_size=batch_size,
             delay_between_batches=delay,
+            journal=journal,
+            workers=workers,
         )
 
         # Étape 2: Créer les VMs
@@ -761,6 +921,8 @@ def full_dataset(
             user_ids=user_ids,
             batch_size=batch_size,
             delay_between_batches=delay,
+            journal=journal,
+            workers=workers,
         )
 
         # Statistiques finales
@@ -787,8 +949,7 @@ def full_dataset(
             }
 
             output_path = Path(output_file)
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(dataset, f, indent=4, ensure_ascii=False, default=str)
+            json_codec.dump_file(dataset, output_path)
 
             display_dataset_saved(output_path)
 
@@ -813,6 +974,9 @@ def full_dataset(
         )
         raise typer.Exit(1)
 
+    finally:
+        journal.close()
+
 
 @app.command()
 def status() -> None:
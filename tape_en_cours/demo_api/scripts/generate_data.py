@@ -4,7 +4,6 @@ Script utilitaire pour générer des données factices avec Faker.
 Permet de générer des utilisateurs et VMs réalistes pour les tests et démonstrations.
 """
 
-import json
 import typer
 import sys
 from pathlib import Path
@@ -13,7 +12,9 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.data_generator import DataGenerator
+from utils import json_codec
 from utils.logging_config import get_logger
+from utils.profiling import add_profile_option
 
 logger = get_logger(__name__)
 
@@ -24,6 +25,7 @@ app = typer.Typer(
     add_completion=False,
     no_args_is_help=True,
 )
+add_profile_option(app)
 
 
 @app.command()
@@ -71,8 +73,7 @@ def users_with_vms(
 
         # Sauvegarder dans le fichier JSON
         output_path = Path(output_file)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(users_data, f, indent=4, ensure_ascii=False, default=str)
+        json_codec.dump_file(users_data, output_path)
 
         # Statistiques
         total_vms = sum(len(user["vms"]) for user in users_data)
@@ -146,8 +147,7 @@ def vms_only(
 
         # Sauvegarder dans le fichier JSON
         output_path = Path(output_file)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(vms_data, f, indent=4, ensure_ascii=False, default=str)
+        json_codec.dump_file(vms_data, output_path)
 
         # Statistiques par utilisateur
         user_vm_counts: dict[int, int] = {}
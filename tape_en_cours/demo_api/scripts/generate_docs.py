@@ -3,8 +3,13 @@
 Script de génération de documentation complète.
 
 Ce script génère automatiquement la documentation avec Sphinx et pydoc.
+
+Les deux générations sont incrémentales : Sphinx ne reconstruit que les
+pages dont le source a changé (en parallèle, -j auto) et pydoc ne refait que
+les modules modifiés. Utiliser --force pour tout reconstruire.
 """
 
+import argparse
 import subprocess
 import sys
 from pathlib import Path
@@ -39,8 +44,22 @@ def run_command(command: str, description: str) -> bool:
         return False
 
 
+def parse_args() -> argparse.Namespace:
+    """Lit les options de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Génère la documentation Sphinx et pydoc du projet"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Tout reconstruire au lieu de ne refaire que ce qui a changé",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Fonction principale."""
+    args = parse_args()
     project_root = Path(__file__).parent.parent
 
     print("📚 Génération de la documentation Demo API")
@@ -65,7 +84,8 @@ def main():
     # 2. Générer la documentation Sphinx
     total_commands += 1
     if run_command(
-        f"cd {project_root}/docs/sphinx && sphinx-build -b html source build",
+        f"cd {project_root}/docs/sphinx && sphinx-build -b html -j auto"
+        f"{' -E' if args.force else ''} source build",
         "Génération de la documentation Sphinx",
     ):
         success_count += 1
@@ -73,7 +93,8 @@ def main():
     # 3. Générer la documentation pydoc
     total_commands += 1
     if run_command(
-        f"cd {project_root} && python docs/pydoc/generate_pydoc.py",
+        f"cd {project_root} && python docs/pydoc/generate_pydoc.py"
+        f"{' --force' if args.force else ''}",
         "Génération de la documentation pydoc",
     ):
         success_count += 1
@@ -27,6 +27,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.api import create_authenticated_client
 from utils.logging_config import get_logger
+from utils.profiling import ProfileMode, stage, start_profile
 
 # Configuration
 app = typer.Typer(
@@ -114,6 +115,7 @@ def connect_to_api(
     return client
 
 
+@stage("fetch")
 def fetch_data(client) -> Tuple[list, list]:
     """Récupère les données VMs et utilisateurs"""
     # Récupération VMs
@@ -387,6 +389,7 @@ def delete_single_user_with_display(client, user: dict) -> bool:
 # =============================================================================
 
 
+@stage("delete")
 def cleanup_data(client, vms: list, users: list, delay: float) -> Tuple[int, int]:
     """Logique métier principale de nettoyage avec barre de progression globale
 
@@ -528,6 +531,12 @@ def cleanup(
     delay: float = typer.Option(
         0, "--delay", "-d", help="Délai en secondes entre les opérations"
     ),
+    profile: Optional[ProfileMode] = typer.Option(
+        None,
+        "--profile",
+        help="Profile le nettoyage (cprofile, sampling ou memory)",
+        case_sensitive=False,
+    ),
 ) -> None:
     """
     Script de nettoyage pour les VMs et utilisateurs
@@ -542,7 +551,11 @@ def cleanup(
 
     • Avec délai personnalisé:
        python quick_cleanup_simplified.py --real --delay 3
+
+    • Avec profilage (fichier dans outputs/profiles):
+       python quick_cleanup_simplified.py --profile sampling
     """
+    start_profile(profile, name="cleanup")
     simulate = not real
     quick_cleanup(base_url, email, password, simulate, delay)
 
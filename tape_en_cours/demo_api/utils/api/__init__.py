@@ -10,6 +10,7 @@ Interface fluide pour accéder aux fonctionnalités de l'API :
 
 from typing import Optional, Dict, Any, List
 from .auth import Auth
+from . import transport
 from .user import (
     get_users,
     add_vms_to_users,
@@ -27,6 +28,7 @@ from .vm import (
     attach_vm_to_user,
     stop_vm,
 )
+from .transport import CircuitOpenError
 from .exceptions import (
     UserCreationError,
     UserLoginError,
@@ -53,6 +55,7 @@ __all__ = [
     "VMsAPI",
     "AuthAPI",
     "create_authenticated_client",
+    "CircuitOpenError",
     # Exceptions principales
     "UserCreationError",
     "UserLoginError",
@@ -410,6 +413,41 @@ class ApiClient:
         self.token = None
         logger.info("Token supprimé du client API")
 
+    @property
+    def circuit_breakers(self) -> Dict[str, "transport.CircuitBreaker"]:
+        """Disjoncteurs des endpoints de cette API (/vm, /user, /auth)"""
+        return transport.breakers(self.base_url)
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """État des disjoncteurs, du budget de retry et des latences observées
+
+        Returns:
+            Dict avec l'état de chaque disjoncteur, du budget de retry et les
+            latences (p95, requêtes de couverture) par chemin
+        """
+        return {
+            "breakers": {
+                endpoint: breaker.as_dict()
+                for endpoint, breaker in self.circuit_breakers.items()
+            },
+            "retry_budget": transport.retry_budget.as_dict(),
+            "latency": {
+                path: tracker.as_dict()
+                for path, tracker in transport.latencies(self.base_url).items()
+            },
+        }
+
+    def transfer_stats(self) -> Dict[str, Any]:
+        """Volumes transférés par chemin (compression, réponses 304)
+
+        Returns:
+            Dict des volumes transférés et décompressés, par chemin
+        """
+        return {
+            path: stats.as_dict()
+            for path, stats in transport.transfers(self.base_url).items()
+        }
+
     # Méthodes de convenance pour un accès direct aux fonctionnalités principales
     def get_all_data(self) -> Dict[str, Any]:
         """Récupère toutes les données (utilisateurs et VMs) et les associe
@@ -1,5 +1,7 @@
 import requests
 from utils.logging_config import get_logger
+from . import transport
+from .responses import response_json
 from .exceptions import UserCreationError, UserLoginError, UserInfoError, TokenError
 
 # Logger pour ce module
@@ -48,8 +50,9 @@ class Auth:
             base_url=self.base_url,
         )
 
+        resp = None
         try:
-            resp = requests.post(
+            resp = transport.post(
                 f"{self.base_url}/auth/signup", json=payload, timeout=5
             )
             resp.raise_for_status()
@@ -60,7 +63,7 @@ class Auth:
                 status_code=resp.status_code,
             )
 
-            token = resp.json()["authToken"]
+            token = response_json(resp)["authToken"]
             logger.debug(
                 "Token généré pour nouveau utilisateur",
                 email=email,
@@ -121,8 +124,9 @@ class Auth:
         )
         headers = {"accept": "application/json", "Content-Type": "application/json"}
 
+        resp = None
         try:
-            resp = requests.post(
+            resp = transport.post(
                 f"{self.base_url}/auth/login", json=payload, headers=headers, timeout=5
             )
             resp.raise_for_status()
@@ -133,7 +137,7 @@ class Auth:
                 status_code=resp.status_code,
             )
 
-            token = resp.json()["authToken"]
+            token = response_json(resp)["authToken"]
             logger.debug(
                 "Token généré pour connexion", email=email, token_length=len(token)
             )
@@ -183,11 +187,12 @@ class Auth:
         )
         headers = {"accept": "application/json", "Authorization": f"Bearer {token}"}
 
+        resp = None
         try:
-            resp = requests.get(f"{self.base_url}/auth/me", headers=headers, timeout=5)
+            resp = transport.get(f"{self.base_url}/auth/me", headers=headers, timeout=5)
             resp.raise_for_status()
 
-            user_info = resp.json()
+            user_info = response_json(resp)
             logger.info(
                 "Informations utilisateur récupérées",
                 user_id=user_info.get("id"),
@@ -7,6 +7,8 @@ from functools import wraps
 from typing import Callable
 from utils.logging_config import get_logger
 from utils.config import Config
+from utils import tracing
+from . import transport
 
 # Logger pour ce module
 logger = get_logger(__name__)
@@ -20,6 +22,10 @@ def retry_on_429(max_retries: int | None = None, base_delay: float = 7.0):
     Décorateur pour gérer automatiquement les erreurs 429 (Too Many Requests)
     avec retry et backoff exponentiel.
 
+    Chaque retry consomme le budget de retry global (voir transport) : quand
+    il est épuisé, ou quand l'échéance de l'opération (DEMO_API_DEADLINE)
+    tomberait pendant l'attente, l'erreur est remontée immédiatement.
+
     Args:
         max_retries: Nombre maximum de tentatives (défaut: utilise DEMO_API_MAX_RETRIES de la config)
         base_delay: Délai de base en secondes (défaut: 7.0)
@@ -35,31 +41,50 @@ def retry_on_429(max_retries: int | None = None, base_delay: float = 7.0):
                 max_retries if max_retries is not None else config.DEMO_API_MAX_RETRIES
             )
 
-            for attempt in range(actual_max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    error_str = str(e).lower()
+            # L'échéance de l'opération couvre tous les essais
+            with transport.deadline(config.DEMO_API_DEADLINE):
+                for attempt in range(actual_max_retries + 1):
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        last_exception = e
+                        error_str = str(e).lower()
 
-                    # Si c'est une erreur 429 (Too Many Requests), on retry avec backoff
-                    if "429" in error_str and "too many requests" in error_str:
-                        if attempt < actual_max_retries:
-                            # Backoff exponentiel avec délai maximum de 30s
-                            delay = min(base_delay * (2**attempt), 30.0)
-                            logger.warning(
-                                f"Limite API atteinte pour {func.__name__}, "
-                                f"attente {delay:.1f}s avant retry {attempt + 1}/{actual_max_retries}"
-                            )
-                            time.sleep(delay)
-                            continue
-                    else:
-                        # Pour les autres erreurs, on ne retry pas
-                        raise e
+                        # Si c'est une erreur 429 (Too Many Requests), on retry avec backoff
+                        if "429" in error_str and "too many requests" in error_str:
+                            if attempt < actual_max_retries:
+                                # Backoff exponentiel avec délai maximum de 30s
+                                delay = min(base_delay * (2**attempt), 30.0)
+                                left = transport.remaining()
+                                if left is not None and left < delay:
+                                    logger.warning(
+                                        f"Échéance trop proche pour {func.__name__}, "
+                                        "abandon sans nouvel essai",
+                                        remaining_s=round(left, 2),
+                                        delay_s=delay,
+                                    )
+                                    raise e
+                                if not transport.retry_budget.try_spend():
+                                    logger.warning(
+                                        f"Budget de retry épuisé pour {func.__name__}, "
+                                        "abandon sans nouvel essai",
+                                        **transport.retry_budget.as_dict(),
+                                    )
+                                    raise e
+                                logger.warning(
+                                    f"Limite API atteinte pour {func.__name__}, "
+                                    f"attente {delay:.1f}s avant retry {attempt + 1}/{actual_max_retries}"
+                                )
+                                time.sleep(delay)
+                                continue
+                        else:
+                            # Pour les autres erreurs, on ne retry pas
+                            raise e
 
             # Si on arrive ici, toutes les tentatives ont échoué
             raise last_exception
 
-        return wrapper
+        # Un span par opération, parent des requêtes HTTP de chaque essai
+        return tracing.traced(func.__name__)(wrapper)
 
     return decorator
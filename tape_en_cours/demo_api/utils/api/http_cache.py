@@ -0,0 +1,169 @@
+"""
+Cache des réponses GET conditionnelles de l'API.
+
+Pour chaque URL, le cache conserve les validateurs renvoyés par le serveur
+(ETag, Last-Modified) et le corps de la dernière réponse. Les requêtes
+suivantes envoient If-None-Match / If-Modified-Since : une réponse 304 est
+alors servie depuis la copie locale, sans retélécharger le corps.
+
+Le cache est gardé en mémoire et, si un dossier est configuré
+(DEMO_API_HTTP_CACHE_DIR), sur disque pour profiter d'une exécution à l'autre.
+La clé d'une entrée contient le jeton d'authentification : sur disque, seule
+son empreinte SHA-256 est écrite.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from utils import json_codec
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# En-têtes de réponse conservés avec le corps
+_KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+class ConditionalCache:
+    """Validateurs et corps des dernières réponses GET, par URL"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialise le cache
+
+        Args:
+            directory: Dossier de persistance (None : mémoire seulement)
+        """
+        self.directory = directory
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        """Empreinte SHA-256 d'une clé (la clé contient le jeton)"""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Préfixe des fichiers d'une entrée sur disque (.json et .body)"""
+        return os.path.join(self.directory, self._digest(key)[:32])
+
+    def _key(self, url: str, headers: Dict[str, str]) -> str:
+        """Clé d'une requête : l'URL et le jeton, qui peut changer la réponse"""
+        return f"{headers.get('Authorization', '')} {url}"
+
+    def get(self, url: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Entrée connue pour une requête (None si absente)
+
+        Returns:
+            Dict avec "url", "headers" (ETag, Last-Modified...) et "body"
+        """
+        key = self._key(url, headers)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or not self.directory:
+            return entry
+
+        path = self._path(key)
+        if not os.path.exists(f"{path}.json"):
+            return None
+        try:
+            with open(f"{path}.json", "rb") as f:
+                stored = json_codec.loads(f.read())
+            with open(f"{path}.body", "rb") as f:
+                body = f.read()
+        except (OSError, json_codec.JSONCodecError) as e:
+            logger.warning("Entrée de cache HTTP illisible", path=path, error=str(e))
+            return None
+        if stored.get("key_digest") != self._digest(key):
+            return None
+        if len(body) != stored.get("size"):
+            return None
+
+        entry = {"url": stored["url"], "headers": stored["headers"], "body": body}
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def validators(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """En-têtes conditionnels à envoyer pour revalider une entrée"""
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def store(self, url: str, headers: Dict[str, str], resp: requests.Response) -> None:
+        """
+        Conserve une réponse 200 si elle porte un validateur
+
+        Args:
+            url: URL demandée
+            headers: En-têtes de la requête
+            resp: Réponse reçue
+        """
+        kept = {
+            name: resp.headers[name] for name in _KEPT_HEADERS if name in resp.headers
+        }
+        if "ETag" not in kept and "Last-Modified" not in kept:
+            return
+
+        key = self._key(url, headers)
+        entry = {"url": url, "headers": kept, "body": resp.content}
+        with self._lock:
+            self._entries[key] = entry
+        if not self.directory:
+            return
+
+        # Le corps d'abord, puis les métadonnées qui le valident (taille)
+        meta = {
+            "key_digest": self._digest(key),
+            "url": url,
+            "headers": kept,
+            "size": len(resp.content),
+        }
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for suffix, content in (
+                (".body", resp.content),
+                (".json", json_codec.dumps(meta)),
+            ):
+                with open(f"{path}{suffix}.tmp", "wb") as f:
+                    f.write(content)
+                os.replace(f"{path}{suffix}.tmp", f"{path}{suffix}")
+        except OSError as e:
+            logger.warning("Impossible d'écrire le cache HTTP", url=url, error=str(e))
+
+    def replay(
+        self, entry: Dict[str, Any], resp: requests.Response
+    ) -> requests.Response:
+        """
+        Construit la réponse servie pour un 304 à partir de la copie locale
+
+        Args:
+            entry: Entrée du cache
+            resp: Réponse 304 reçue (ses nouveaux validateurs sont repris)
+
+        Returns:
+            Réponse 200 avec le corps en cache (attribut from_cache=True)
+        """
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.reason = "OK"
+        cached.url = resp.url
+        cached.request = resp.request
+        cached.elapsed = resp.elapsed
+        cached.encoding = resp.encoding
+        cached.headers = CaseInsensitiveDict(entry["headers"])
+        for name in ("ETag", "Last-Modified"):
+            if name in resp.headers:
+                entry["headers"][name] = cached.headers[name] = resp.headers[name]
+        cached._content = entry["body"]
+        cached.from_cache = True
+        return cached
@@ -0,0 +1,28 @@
+"""
+Décodage des réponses HTTP de l'API.
+"""
+
+import requests
+from utils import json_codec
+
+
+def response_json(resp: requests.Response):
+    """Décode le corps JSON d'une réponse à partir des octets bruts.
+
+    Remplace resp.json() en passant par le codec JSON du projet, sans
+    décodage texte intermédiaire.
+
+    Args:
+        resp (requests.Response): Réponse HTTP
+
+    Returns:
+        Objet Python décodé
+
+    Raises:
+        requests.exceptions.JSONDecodeError: Si le corps n'est pas un JSON valide
+            (sous-classe de RequestException, comme avec resp.json())
+    """
+    try:
+        return json_codec.loads(resp.content)
+    except json_codec.JSONCodecError as e:
+        raise requests.exceptions.JSONDecodeError(str(e), resp.text, 0) from e
@@ -0,0 +1,685 @@
+"""
+Transport HTTP commun aux appels de l'API.
+
+Tous les appels passent par request() (ou get/post/patch/delete), qui ajoute :
+- un disjoncteur par endpoint (/vm, /user, /auth) : il s'ouvre quand le taux
+  d'erreur dépasse un seuil, fait échouer immédiatement les appels tant qu'il
+  est ouvert, puis laisse passer des requêtes de test (semi-ouvert) ;
+- un budget de retry global : chaque requête alimente le budget, chaque retry
+  le consomme, ce qui limite les retries à un pourcentage du trafic ;
+- une échéance par opération (deadline()) : le timeout de chaque requête est
+  réduit au temps restant, retries compris ;
+- pour les GET, sur option, une requête de couverture (hedging) : si la
+  réponse tarde au-delà du p95 observé pour cette URL, une seconde requête
+  identique part et la première réponse reçue l'emporte ;
+- pour les GET de collections, des requêtes conditionnelles (voir
+  http_cache) et la négociation de la compression (gzip, et brotli si le
+  module est installé), avec les volumes transférés et décompressés.
+
+Quand l'API est dégradée, les traitements en masse échouent donc vite au lieu
+d'enchaîner les attentes de backoff sur chaque appel.
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import re
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+from utils import tracing
+from utils.config import config
+from utils.logging_config import get_logger
+from .http_cache import ConditionalCache
+
+logger = get_logger(__name__)
+
+# Segment d'URL → groupe d'endpoints partageant un disjoncteur
+ENDPOINT_GROUPS = {
+    "vm": "/vm",
+    "Stop_VM": "/vm",
+    "Attach_VM_to_user": "/vm",
+    "user": "/user",
+    "auth": "/auth",
+}
+
+# Percentile de latence au-delà duquel une requête de couverture est envoyée
+HEDGE_PERCENTILE = 95
+
+# Nombre minimal de latences observées avant d'envoyer des couvertures
+HEDGE_MIN_SAMPLES = 20
+
+# Nombre de latences conservées par URL
+LATENCY_WINDOW = 200
+
+# En-têtes de validation d'un GET conditionnel
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+# Identifiants numériques dans les chemins (/vm/42 → /vm/{id})
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Échéance (horloge monotone) de l'opération en cours dans ce contexte
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "demo_api_deadline", default=None
+)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Exception levée quand le disjoncteur d'un endpoint est ouvert"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Circuit ouvert pour {endpoint}, nouvel essai dans {retry_in:.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Exception levée quand l'échéance de l'opération est dépassée"""
+
+
+class CircuitBreaker:
+    """Disjoncteur fermé / ouvert / semi-ouvert d'un endpoint"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        error_rate: float = 0.5,
+        min_requests: int = 10,
+        window: int = 20,
+        cooldown: float = 15.0,
+        half_open_probes: int = 1,
+    ):
+        """
+        Initialise le disjoncteur
+
+        Args:
+            name: Nom de l'endpoint (pour les logs)
+            error_rate: Taux d'erreur qui ouvre le circuit (0 à 1)
+            min_requests: Nombre minimal d'appels observés avant de juger
+            window: Nombre d'appels récents pris en compte
+            cooldown: Durée d'ouverture avant les requêtes de test (secondes)
+            half_open_probes: Requêtes de test simultanées en semi-ouvert
+        """
+        self.name = name
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)
+        self._probes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[int]:
+        """
+        Autorise un appel ou le rejette immédiatement
+
+        Returns:
+            Jeton à repasser à record : la période semi-ouverte pour une
+            requête de test, None pour un appel ordinaire
+
+        Raises:
+            CircuitOpenError: Si le circuit est ouvert (ou si les requêtes
+                de test sont déjà en cours)
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                retry_in = self.opened_at + self.cooldown - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_in)
+                self.state = self.HALF_OPEN
+                self._probes = 0
+                self._generation += 1
+                logger.info("Disjoncteur semi-ouvert", endpoint=self.name)
+
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes += 1
+                return self._generation
+            return None
+
+    def record(self, success: bool, probe: Optional[int] = None) -> None:
+        """
+        Enregistre le résultat d'un appel autorisé
+
+        Seules les requêtes de test de la période semi-ouverte en cours
+        décident de l'état. Un appel ordinaire qui se termine après
+        l'ouverture du circuit, ou une requête de test d'une période
+        précédente, est ignoré.
+
+        Args:
+            success: Résultat de l'appel
+            probe: Jeton renvoyé par allow pour cet appel
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if probe != self._generation:
+                    return
+                self._probes -= 1
+                if success:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("Disjoncteur refermé", endpoint=self.name)
+                else:
+                    self._open()
+                return
+
+            if self.state != self.CLOSED or probe is not None:
+                return
+            self._outcomes.append(success)
+            if len(self._outcomes) >= self.min_requests:
+                errors = self._outcomes.count(False)
+                if errors / len(self._outcomes) >= self.error_rate:
+                    self._open()
+
+    def _open(self) -> None:
+        """Ouvre le circuit (verrou déjà pris)"""
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(
+            "Disjoncteur ouvert",
+            endpoint=self.name,
+            errors=self._outcomes.count(False),
+            calls=len(self._outcomes),
+            cooldown_s=self.cooldown,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """État du disjoncteur sous forme de dictionnaire"""
+        return {
+            "state": self.state,
+            "calls": len(self._outcomes),
+            "errors": self._outcomes.count(False),
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """
+    Budget de retry partagé par tous les appels
+
+    Chaque requête dépose ratio jeton, chaque retry en retire un : sur la
+    durée, les retries ne dépassent pas ratio x le nombre de requêtes. Une
+    réserve initiale permet quelques retries avant tout trafic.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0):
+        """
+        Args:
+            ratio: Part maximale de retries par rapport aux requêtes (0 à 1)
+            reserve: Jetons disponibles au départ (et plafond du budget)
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Comptabilise une requête"""
+        with self._lock:
+            self.requests += 1
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Consomme un jeton pour un retry (False si le budget est épuisé)"""
+        with self._lock:
+            if self.tokens < 1:
+                self.denied += 1
+                return False
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """État du budget sous forme de dictionnaire"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "denied": self.denied,
+            "tokens": round(self.tokens, 2),
+        }
+
+
+class LatencyTracker:
+    """Latences récentes des GET d'une URL et compteurs de couverture"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.hedged = 0
+        self.hedges_won = 0
+        self._samples: Deque[float] = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency: float) -> None:
+        """Enregistre la latence d'une réponse (secondes)"""
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentile des latences récentes (None si trop peu de mesures)"""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Latences et couvertures sous forme de dictionnaire"""
+        p95 = self.percentile(HEDGE_PERCENTILE)
+        return {
+            "samples": len(self._samples),
+            "p95_s": round(p95, 3) if p95 is not None else None,
+            "hedged": self.hedged,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class TransferStats:
+    """Volumes transférés des GET d'une URL (compression, réponses 304)"""
+
+    def __init__(self):
+        self.responses = 0
+        self.not_modified = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.encodings: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, resp: requests.Response) -> None:
+        """Comptabilise une réponse reçue (corps déjà lu)"""
+        body = len(resp.content or b"")
+        # Octets lus sur le réseau, avant décompression par urllib3
+        wire = getattr(resp.raw, "tell", lambda: body)() or body
+        encoding = resp.headers.get("Content-Encoding", "identity")
+        with self._lock:
+            self.responses += 1
+            self.not_modified += resp.status_code == 304
+            self.wire_bytes += wire
+            self.body_bytes += body
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Volumes sous forme de dictionnaire"""
+        return {
+            "responses": self.responses,
+            "not_modified": self.not_modified,
+            "wire_bytes": self.wire_bytes,
+            "body_bytes": self.body_bytes,
+            "compression_ratio": (
+                round(self.body_bytes / self.wire_bytes, 2) if self.wire_bytes else None
+            ),
+            "encodings": dict(self.encodings),
+        }
+
+
+retry_budget = RetryBudget(config.DEMO_API_RETRY_BUDGET)
+
+http_cache = ConditionalCache(config.DEMO_API_HTTP_CACHE_DIR or None)
+
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+_latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+_transfers: Dict[Tuple[str, str], TransferStats] = {}
+_hedge_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def endpoint_of(url: str) -> Tuple[str, str]:
+    """
+    Identifie le disjoncteur d'une URL
+
+    Returns:
+        Tuple (hôte, groupe d'endpoints), le groupe valant "other" si
+        l'URL ne correspond à aucun endpoint connu
+    """
+    parts = urlsplit(url)
+    for segment in parts.path.split("/"):
+        if segment in ENDPOINT_GROUPS:
+            return parts.netloc, ENDPOINT_GROUPS[segment]
+    return parts.netloc, "other"
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Disjoncteur de l'endpoint d'une URL (créé au premier appel)"""
+    key = endpoint_of(url)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(
+                key[1],
+                error_rate=config.DEMO_API_BREAKER_ERROR_RATE,
+                min_requests=config.DEMO_API_BREAKER_MIN_REQUESTS,
+                window=config.DEMO_API_BREAKER_WINDOW,
+                cooldown=config.DEMO_API_BREAKER_COOLDOWN,
+            )
+        return breaker
+
+
+def breakers(base_url: Optional[str] = None) -> Dict[str, CircuitBreaker]:
+    """
+    Disjoncteurs créés, par groupe d'endpoints
+
+    Args:
+        base_url: Ne retenir que les disjoncteurs de l'hôte de cette URL
+    """
+    host = urlsplit(base_url).netloc if base_url else None
+    with _breakers_lock:
+        return {
+            group: breaker
+            for (netloc, group), breaker in _breakers.items()
+            if host is None or netloc == host
+        }
+
+
+def _path_key(url: str) -> Tuple[str, str]:
+    """Hôte et chemin d'une URL, les identifiants numériques étant ignorés"""
+    parts = urlsplit(url)
+    return parts.netloc, _ID_SEGMENT.sub("/{id}", parts.path)
+
+
+def latency_for(url: str) -> LatencyTracker:
+    """Suivi de latence d'une URL, les identifiants numériques étant ignorés"""
+    key = _path_key(url)
+    with _breakers_lock:
+        tracker = _latencies.get(key)
+        if tracker is None:
+            tracker = _latencies[key] = LatencyTracker()
+        return tracker
+
+
+def latencies(base_url: Optional[str] = None) -> Dict[str, LatencyTracker]:
+    """
+    Suivis de latence créés, par chemin
+
+    Args:
+        base_url: Ne retenir que les suivis de l'hôte de cette URL
+    """
+    host = urlsplit(base_url).netloc if base_url else None
+    with _breakers_lock:
+        return {
+            path: tracker
+            for (netloc, path), tracker in _latencies.items()
+            if host is None or netloc == host
+        }
+
+
+def transfer_for(url: str) -> TransferStats:
+    """Volumes transférés d'une URL, les identifiants numériques étant ignorés"""
+    key = _path_key(url)
+    with _breakers_lock:
+        stats = _transfers.get(key)
+        if stats is None:
+            stats = _transfers[key] = TransferStats()
+        return stats
+
+
+def transfers(base_url: Optional[str] = None) -> Dict[str, TransferStats]:
+    """
+    Volumes transférés, par chemin
+
+    Args:
+        base_url: Ne retenir que les chemins de l'hôte de cette URL
+    """
+    host = urlsplit(base_url).netloc if base_url else None
+    with _breakers_lock:
+        return {
+            path: stats
+            for (netloc, path), stats in _transfers.items()
+            if host is None or netloc == host
+        }
+
+
+@contextlib.contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Fixe une échéance pour les appels faits dans le bloc (retries compris)
+
+    Une échéance déjà en place n'est jamais repoussée : la plus proche
+    l'emporte.
+
+    Args:
+        seconds: Durée maximale de l'opération (None ou 0 : pas d'échéance)
+    """
+    current = _deadline.get()
+    if seconds:
+        expires = time.monotonic() + seconds
+        current = expires if current is None else min(current, expires)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Temps restant avant l'échéance en cours (None si aucune)"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def _apply_deadline(url: str, kwargs: Dict[str, Any]) -> None:
+    """
+    Réduit le timeout de la requête au temps restant avant l'échéance
+
+    Raises:
+        DeadlineExceeded: Si l'échéance est déjà dépassée
+    """
+    left = remaining()
+    if left is None:
+        return
+    if left <= 0:
+        raise DeadlineExceeded(f"Échéance dépassée avant l'appel à {url}")
+    timeout = kwargs.get("timeout")
+    kwargs["timeout"] = left if timeout is None else min(timeout, left)
+
+
+def _timed_request(method: str, url: str, kwargs: Dict[str, Any]) -> requests.Response:
+    """Envoie la requête et enregistre la latence et le volume des GET"""
+    start = time.perf_counter()
+    resp = requests.request(method, url, **kwargs)
+    if method == "GET":
+        latency_for(url).add(time.perf_counter() - start)
+        transfer_for(url).add(resp)
+    return resp
+
+
+def _discard(future: concurrent.futures.Future) -> None:
+    """Libère la connexion d'une réponse arrivée trop tard"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _hedged_get(url: str, kwargs: Dict[str, Any]) -> requests.Response:
+    """
+    GET avec requête de couverture au-delà du p95 observé
+
+    La couverture consomme le budget de retry : sous forte charge, elle
+    n'est plus envoyée, pas plus qu'une fois l'échéance atteinte. La
+    première réponse reçue l'emporte ; une erreur réseau n'est remontée que
+    si les deux requêtes échouent.
+    """
+    global _hedge_executor
+
+    tracker = latency_for(url)
+    delay = tracker.percentile(HEDGE_PERCENTILE)
+    if delay is None:
+        return _timed_request("GET", url, kwargs)
+
+    with _breakers_lock:
+        if _hedge_executor is None:
+            _hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=16, thread_name_prefix="demo-api-hedge"
+            )
+    primary = _hedge_executor.submit(_timed_request, "GET", url, dict(kwargs))
+    try:
+        return primary.result(timeout=delay)
+    except concurrent.futures.TimeoutError:
+        pass
+
+    # échéance vérifiée avant de consommer le budget : sans temps restant,
+    # la requête principale, déjà bornée par l'échéance, décide seule
+    hedge_kwargs = dict(kwargs)
+    try:
+        _apply_deadline(url, hedge_kwargs)
+    except DeadlineExceeded:
+        return primary.result()
+    if not retry_budget.try_spend():
+        return primary.result()
+    tracker.hedged += 1
+    logger.debug("Requête de couverture envoyée", url=url, after_s=round(delay, 3))
+    hedge = _hedge_executor.submit(_timed_request, "GET", url, hedge_kwargs)
+
+    pending = {primary, hedge}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    tracker.hedges_won += 1
+                for other in pending:
+                    other.add_done_callback(_discard)
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def _is_failure(resp: requests.Response) -> bool:
+    """Une réponse compte comme erreur pour le disjoncteur (429 et 5xx)"""
+    return resp.status_code == 429 or resp.status_code >= 500
+
+
+def request(
+    method: str,
+    url: str,
+    hedge: Optional[bool] = None,
+    conditional: bool = False,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    Envoie une requête HTTP en passant par le disjoncteur de l'endpoint
+
+    Args:
+        method: Méthode HTTP
+        url: URL complète
+        hedge: Couvrir un GET lent par une seconde requête (défaut:
+            DEMO_API_HEDGE_GETS) ; ignoré pour les autres méthodes
+        conditional: Revalider un GET auprès du serveur à partir de la
+            dernière réponse connue (une réponse 304 est servie depuis le
+            cache, avec l'attribut from_cache=True)
+        **kwargs: Arguments de requests.request (json, headers, timeout...)
+
+    Returns:
+        Réponse HTTP (les erreurs HTTP restent à vérifier par raise_for_status)
+
+    Raises:
+        CircuitOpenError: Si le circuit de l'endpoint est ouvert
+        DeadlineExceeded: Si l'échéance de l'opération est dépassée
+        requests.RequestException: En cas d'erreur réseau
+    """
+    with tracing.span(f"HTTP {method}", url=url) as span:
+        resp = _send(method, url, hedge, conditional, kwargs)
+        span.set(
+            status_code=resp.status_code,
+            from_cache=getattr(resp, "from_cache", False),
+            bytes=len(resp.content) if method == "GET" else None,
+        )
+        return resp
+
+
+def _send(
+    method: str,
+    url: str,
+    hedge: Optional[bool],
+    conditional: bool,
+    kwargs: Dict[str, Any],
+) -> requests.Response:
+    """Envoi effectif d'une requête (voir request)"""
+    _apply_deadline(url, kwargs)
+    breaker = breaker_for(url)
+    probe = breaker.allow()
+    retry_budget.deposit()
+
+    if hedge is None:
+        hedge = config.DEMO_API_HEDGE_GETS
+
+    cached = None
+    if method == "GET":
+        headers = {"Accept-Encoding": ACCEPT_ENCODING, **(kwargs.get("headers") or {})}
+        if conditional:
+            cached = http_cache.get(url, headers)
+            if cached is not None:
+                headers.update(http_cache.validators(cached))
+        kwargs["headers"] = headers
+
+    success = False
+    try:
+        if method == "GET" and hedge:
+            resp = _hedged_get(url, kwargs)
+        else:
+            resp = _timed_request(method, url, kwargs)
+        success = not _is_failure(resp)
+    finally:
+        breaker.record(success, probe)
+
+    if conditional and resp.status_code == 304 and cached is not None:
+        logger.debug("Réponse 304, corps servi depuis le cache", url=url)
+        return http_cache.replay(cached, resp)
+    if conditional and resp.status_code == 304:
+        # Pas de corps à rejouer (entrée absente ou supprimée du cache) : la
+        # requête est répétée une fois sans validateurs plutôt que de rendre
+        # une réponse vide
+        logger.warning("Réponse 304 sans entrée en cache, requête répétée", url=url)
+        resp.close()
+        headers = {
+            name: value
+            for name, value in kwargs["headers"].items()
+            if name.lower() not in CONDITIONAL_HEADERS
+        }
+        kwargs = {**kwargs, "headers": headers}
+        resp = _send(method, url, hedge, False, kwargs)
+    if conditional and resp.status_code == 200:
+        http_cache.store(url, kwargs["headers"], resp)
+    return resp
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """Requête GET, éventuellement couverte ou conditionnelle (voir request)"""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """Requête POST (voir request)"""
+    return request("POST", url, **kwargs)
+
+
+def patch(url: str, **kwargs: Any) -> requests.Response:
+    """Requête PATCH (voir request)"""
+    return request("PATCH", url, **kwargs)
+
+
+def delete(url: str, **kwargs: Any) -> requests.Response:
+    """Requête DELETE (voir request)"""
+    return request("DELETE", url, **kwargs)
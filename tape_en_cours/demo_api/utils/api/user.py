@@ -1,7 +1,11 @@
 import requests
-from utils.date_utils import parse_unix_timestamp
+from utils.date_utils import decode_timestamps, parse_unix_timestamp
 from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
 from utils.config import config
+from . import transport
+from .responses import response_json
 from .decorators import retry_on_429
 from .exceptions import (
     UsersFetchError,
@@ -29,14 +33,15 @@ def get_users(base_url):
     """
     logger.info("Récupération des utilisateurs depuis l'API", base_url=base_url)
 
+    resp = None
     try:
-        resp = requests.get(f"{base_url}/user", timeout=config.DEMO_API_TIMEOUT)
+        resp = transport.get(
+            f"{base_url}/user", conditional=True, timeout=config.DEMO_API_TIMEOUT
+        )
         resp.raise_for_status()
 
-        users = []
-        for user in resp.json():
-            user["created_at"] = parse_unix_timestamp(user["created_at"])
-            users.append(user)
+        users = response_json(resp)
+        decode_timestamps(users, "created_at")
 
         logger.info(
             "Utilisateurs récupérés avec succès",
@@ -68,6 +73,8 @@ def get_users(base_url):
         )
 
 
+@traced()
+@stage("join")
 def add_vms_to_users(users, vms):
     """Ajoute les machines virtuelles à leurs utilisateurs respectifs.
 
@@ -132,8 +139,9 @@ def create_user(base_url, token, name, email, password=None):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.post(
+        resp = transport.post(
             f"{base_url}/user",
             json=payload,
             headers=headers,
@@ -141,7 +149,7 @@ def create_user(base_url, token, name, email, password=None):
         )
         resp.raise_for_status()
 
-        user_data = resp.json()
+        user_data = response_json(resp)
         logger.debug(f"Réponse JSON de l'API: {user_data} (type: {type(user_data)})")
 
         # Vérifier que user_data est valide
@@ -208,13 +216,14 @@ def get_user(base_url, user_id):
     """
     logger.info("Récupération d'un utilisateur spécifique", user_id=user_id)
 
+    resp = None
     try:
-        resp = requests.get(
+        resp = transport.get(
             f"{base_url}/user/{user_id}", timeout=config.DEMO_API_TIMEOUT
         )
         resp.raise_for_status()
 
-        user_data = resp.json()
+        user_data = response_json(resp)
         user_data["created_at"] = parse_unix_timestamp(user_data["created_at"])
 
         logger.info(
@@ -268,8 +277,9 @@ def update_user(base_url, token, user_id, updates):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.patch(
+        resp = transport.patch(
             f"{base_url}/user/{user_id}",
             json=updates,
             headers=headers,
@@ -277,7 +287,7 @@ def update_user(base_url, token, user_id, updates):
         )
         resp.raise_for_status()
 
-        user_data = resp.json()
+        user_data = response_json(resp)
         logger.info(
             "Utilisateur mis à jour avec succès",
             user_id=user_id,
@@ -324,8 +334,9 @@ def delete_user(base_url, token, user_id):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.delete(
+        resp = transport.delete(
             f"{base_url}/user/{user_id}",
             headers=headers,
             timeout=config.DEMO_API_TIMEOUT,
@@ -340,7 +351,7 @@ def delete_user(base_url, token, user_id):
 
         # Retourner le résultat si disponible, sinon un dict vide
         try:
-            return resp.json()
+            return response_json(resp)
         except:
             return {"success": True, "user_id": user_id}
 
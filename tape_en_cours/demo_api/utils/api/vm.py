@@ -1,6 +1,8 @@
 import requests
 from utils.logging_config import get_logger
-from utils.date_utils import parse_unix_timestamp
+from utils.date_utils import decode_timestamps, parse_unix_timestamp
+from . import transport
+from .responses import response_json
 from .decorators import retry_on_429
 from .exceptions import VMsFetchError, VMCreationError, VMUpdateError, VMDeleteError
 
@@ -12,14 +14,13 @@ logger = get_logger(__name__)
 def get_vms(base_url):
     logger.info("Récupération des VMs depuis l'API", base_url=base_url)
 
+    resp = None
     try:
-        resp = requests.get(f"{base_url}/vm", timeout=5)
+        resp = transport.get(f"{base_url}/vm", conditional=True, timeout=5)
         resp.raise_for_status()
 
-        vms = []
-        for vm in resp.json():
-            vm["created_at"] = parse_unix_timestamp(vm["created_at"])
-            vms.append(vm)
+        vms = response_json(resp)
+        decode_timestamps(vms, "created_at")
 
         logger.info(
             "VMs récupérées avec succès", count=len(vms), status_code=resp.status_code
@@ -91,12 +92,15 @@ def create_vm(
         token_is_none=token is None,
     )
 
+    resp = None
     try:
         logger.debug(f"Envoi de la requête POST vers {base_url}/vm")
         logger.debug(f"Headers: {headers}")
         logger.debug(f"Payload: {payload}")
 
-        resp = requests.post(f"{base_url}/vm", json=payload, timeout=5, headers=headers)
+        resp = transport.post(
+            f"{base_url}/vm", json=payload, timeout=5, headers=headers
+        )
         logger.debug(f"Réponse reçue - Status: {resp.status_code}")
         logger.debug(f"Headers de réponse: {dict(resp.headers)}")
         logger.debug(f"Contenu de la réponse: {resp.text[:500]}...")
@@ -121,7 +125,7 @@ def create_vm(
             )
 
         try:
-            vm_result = resp.json()
+            vm_result = response_json(resp)
             logger.debug(
                 f"Réponse JSON de l'API VM: {vm_result} (type: {type(vm_result)})"
             )
@@ -214,11 +218,12 @@ def get_vm(base_url, vm_id):
     """
     logger.info("Récupération d'une VM spécifique", vm_id=vm_id)
 
+    resp = None
     try:
-        resp = requests.get(f"{base_url}/vm/{vm_id}", timeout=5)
+        resp = transport.get(f"{base_url}/vm/{vm_id}", timeout=5)
         resp.raise_for_status()
 
-        vm_data = resp.json()
+        vm_data = response_json(resp)
         vm_data["created_at"] = parse_unix_timestamp(vm_data["created_at"])
 
         logger.info(
@@ -268,13 +273,14 @@ def update_vm(base_url, token, vm_id, updates):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.patch(
+        resp = transport.patch(
             f"{base_url}/vm/{vm_id}", json=updates, headers=headers, timeout=5
         )
         resp.raise_for_status()
 
-        vm_data = resp.json()
+        vm_data = response_json(resp)
         logger.info(
             "VM mise à jour avec succès",
             vm_id=vm_id,
@@ -321,8 +327,9 @@ def delete_vm(base_url, token, vm_id):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.delete(f"{base_url}/vm/{vm_id}", headers=headers, timeout=5)
+        resp = transport.delete(f"{base_url}/vm/{vm_id}", headers=headers, timeout=5)
         resp.raise_for_status()
 
         logger.info(
@@ -333,7 +340,7 @@ def delete_vm(base_url, token, vm_id):
 
         # Retourner le résultat si disponible, sinon un dict vide
         try:
-            return resp.json()
+            return response_json(resp)
         except:
             return {"success": True, "vm_id": vm_id}
 
@@ -378,8 +385,9 @@ def attach_vm_to_user(base_url, token, vm_id, user_id):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.post(
+        resp = transport.post(
             f"{base_url}/Attach_VM_to_user", json=payload, headers=headers, timeout=5
         )
         resp.raise_for_status()
@@ -392,7 +400,7 @@ def attach_vm_to_user(base_url, token, vm_id, user_id):
         )
 
         try:
-            return resp.json()
+            return response_json(resp)
         except:
             return {"success": True, "vm_id": vm_id, "user_id": user_id}
 
@@ -437,8 +445,9 @@ def stop_vm(base_url, token, vm_id):
 
     headers = {"Authorization": f"Bearer {token}"} if token else {}
 
+    resp = None
     try:
-        resp = requests.post(
+        resp = transport.post(
             f"{base_url}/Stop_VM", json=payload, headers=headers, timeout=5
         )
         resp.raise_for_status()
@@ -450,7 +459,7 @@ def stop_vm(base_url, token, vm_id):
         )
 
         try:
-            return resp.json()
+            return response_json(resp)
         except:
             return {"success": True, "vm_id": vm_id, "action": "stopped"}
 
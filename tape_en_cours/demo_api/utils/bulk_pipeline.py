@@ -0,0 +1,264 @@
+"""
+Pipeline producteur/consommateur pour les créations en masse via l'API.
+
+Trois étages tournent en parallèle au lieu de s'enchaîner élément par élément :
+- génération : un thread prépare les données (Faker, journal) dans une file
+  bornée, en avance sur l'envoi ;
+- envoi : N threads consomment la file et appellent l'API, au rythme imposé
+  par un limiteur partagé ;
+- rapport : le thread appelant regroupe les résultats et ne rappelle
+  l'affichage que par lots.
+
+Chaque étage tient ses propres compteurs de débit (StageStats).
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Marqueur de fin de file
+_DONE = object()
+
+
+class StageStats:
+    """Compteurs de débit d'un étage du pipeline"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, busy: float, error: bool = False) -> None:
+        """Comptabilise un élément traité et le temps passé dessus"""
+        with self._lock:
+            self.items += 1
+            self.errors += int(error)
+            self.busy += busy
+
+    @property
+    def elapsed(self) -> float:
+        """Durée de vie de l'étage en secondes"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Éléments traités par seconde depuis le démarrage de l'étage"""
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Compteurs sous forme de dictionnaire (logs, affichage)"""
+        return {
+            "items": self.items,
+            "errors": self.errors,
+            "busy_s": round(self.busy, 2),
+            "elapsed_s": round(self.elapsed, 2),
+            "items_per_s": round(self.throughput, 2),
+        }
+
+
+class RateLimiter:
+    """
+    Espace les départs d'appels entre tous les threads d'envoi
+
+    Reproduit le rythme des scripts séquentiels : un intervalle entre deux
+    éléments et une pause supplémentaire tous les batch_size éléments.
+    """
+
+    def __init__(self, interval: float = 0.0, batch_size: int = 0, pause: float = 0.0):
+        """
+        Args:
+            interval: Délai minimal entre deux départs (secondes)
+            batch_size: Nombre d'éléments par lot (0 pour aucune pause)
+            pause: Pause supplémentaire entre deux lots (secondes)
+        """
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self._next_slot = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Attend le prochain créneau de départ"""
+        if not self.interval and not self.pause:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._count += 1
+            gap = self.interval
+            if self.batch_size and self._count % self.batch_size == 0:
+                gap += self.pause
+            self._next_slot = slot + gap
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BulkPipeline:
+    """Pipeline génération → envoi → rapport pour les créations en masse"""
+
+    def __init__(
+        self,
+        produce: Callable[[int], Dict[str, Any]],
+        send: Callable[[int, Dict[str, Any]], Any],
+        workers: int = 4,
+        queue_size: int = 100,
+        rate_limiter: Optional[RateLimiter] = None,
+        report_every: int = 10,
+        report_interval: float = 0.5,
+    ):
+        """
+        Initialise le pipeline
+
+        Args:
+            produce: Construit les données d'un élément à partir de son index
+            send: Envoie un élément à l'API et retourne l'enregistrement créé
+            workers: Nombre de threads d'envoi
+            queue_size: Taille de la file entre génération et envoi
+            rate_limiter: Limiteur de débit partagé par les threads d'envoi
+            report_every: Nombre de résultats regroupés par rapport
+            report_interval: Délai maximal entre deux rapports (secondes)
+        """
+        self.produce = produce
+        self.send = send
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.report_every = max(1, report_every)
+        self.report_interval = report_interval
+
+        self.stats = {
+            name: StageStats(name) for name in ("generation", "envoi", "rapport")
+        }
+        self._stop = threading.Event()
+
+    def _generate(self, indices: Iterable[int], payloads: "queue.Queue") -> None:
+        """Étage de génération : remplit la file bornée"""
+        stats = self.stats["generation"]
+        stats.started = time.perf_counter()
+        try:
+            for index in indices:
+                if self._stop.is_set():
+                    break
+                start = time.perf_counter()
+                try:
+                    item = (index, self.produce(index), None)
+                except Exception as e:
+                    item = (index, None, e)
+                stats.add(time.perf_counter() - start, error=item[2] is not None)
+                payloads.put(item)
+        finally:
+            stats.finished = time.perf_counter()
+            for _ in range(self.workers):
+                payloads.put(_DONE)
+
+    def _send(self, payloads: "queue.Queue", results: "queue.Queue") -> None:
+        """Étage d'envoi : consomme la file et appelle l'API"""
+        stats = self.stats["envoi"]
+        while True:
+            item = payloads.get()
+            if item is _DONE:
+                results.put(_DONE)
+                return
+            index, payload, error = item
+            record = None
+            if error is None and not self._stop.is_set():
+                self.rate_limiter.acquire()
+                start = time.perf_counter()
+                try:
+                    record = self.send(index, payload)
+                except Exception as e:
+                    error = e
+                stats.add(time.perf_counter() - start, error=error is not None)
+            results.put(
+                {"index": index, "payload": payload, "record": record, "error": error}
+            )
+
+    def run(
+        self,
+        indices: Iterable[int],
+        on_report: Callable[[List[Dict[str, Any]]], None],
+    ) -> List[Dict[str, Any]]:
+        """
+        Exécute le pipeline sur les index donnés
+
+        Args:
+            indices: Index des éléments à traiter
+            on_report: Appelé dans le thread courant avec chaque lot de
+                résultats ({"index", "payload", "record", "error"})
+
+        Returns:
+            Tous les résultats, triés par index
+        """
+        payloads: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        results: "queue.Queue" = queue.Queue()
+
+        threads = [
+            threading.Thread(
+                target=self._generate, args=(indices, payloads), daemon=True
+            )
+        ] + [
+            threading.Thread(target=self._send, args=(payloads, results), daemon=True)
+            for _ in range(self.workers)
+        ]
+        self.stats["envoi"].started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        stats = self.stats["rapport"]
+        stats.started = time.perf_counter()
+        collected: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        last_report = time.perf_counter()
+        running = self.workers
+
+        def flush() -> None:
+            nonlocal pending, last_report
+            start = time.perf_counter()
+            on_report(pending)
+            for _ in pending:
+                stats.add(0.0)
+            stats.busy += time.perf_counter() - start
+            pending = []
+            last_report = time.perf_counter()
+
+        try:
+            while running:
+                try:
+                    result = results.get(timeout=self.report_interval)
+                except queue.Empty:
+                    result = None
+                if result is _DONE:
+                    running -= 1
+                elif result is not None:
+                    collected.append(result)
+                    pending.append(result)
+
+                due = time.perf_counter() - last_report >= self.report_interval
+                if pending and (len(pending) >= self.report_every or due):
+                    flush()
+            if pending:
+                flush()
+        except BaseException:
+            # Interruption (Ctrl+C) : laisser les threads se vider sans envoyer
+            self._stop.set()
+            raise
+        finally:
+            self.stats["envoi"].finished = time.perf_counter()
+            stats.finished = time.perf_counter()
+
+        logger.info(
+            "Pipeline terminé",
+            **{name: stage.as_dict() for name, stage in self.stats.items()},
+        )
+        return sorted(collected, key=lambda result: result["index"])
@@ -9,6 +9,9 @@ from typing import Optional, Dict, Any
 from dotenv import load_dotenv, set_key
 import os
 
+# Racine du projet demo_api (dossier parent de utils/)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def load_env_files() -> int:
     """
@@ -63,6 +66,48 @@ class Config:
         # Configuration des métadonnées
         self.DEMO_API_TIMEOUT = self._get_env_int("DEMO_API_TIMEOUT", 5)
         self.DEMO_API_MAX_RETRIES = self._get_env_int("DEMO_API_MAX_RETRIES", 3)
+        self.DEMO_API_JSON_BACKEND = self._get_env_with_default(
+            "DEMO_API_JSON_BACKEND", "auto"
+        )
+
+        # Configuration des disjoncteurs et du budget de retry
+        self.DEMO_API_BREAKER_ERROR_RATE = self._get_env_float(
+            "DEMO_API_BREAKER_ERROR_RATE", 0.5
+        )
+        self.DEMO_API_BREAKER_MIN_REQUESTS = self._get_env_int(
+            "DEMO_API_BREAKER_MIN_REQUESTS", 10
+        )
+        self.DEMO_API_BREAKER_WINDOW = self._get_env_int("DEMO_API_BREAKER_WINDOW", 20)
+        self.DEMO_API_BREAKER_COOLDOWN = self._get_env_float(
+            "DEMO_API_BREAKER_COOLDOWN", 15.0
+        )
+        self.DEMO_API_RETRY_BUDGET = self._get_env_float("DEMO_API_RETRY_BUDGET", 0.2)
+
+        # Configuration de la latence : couverture des GET lents et échéance
+        self.DEMO_API_HEDGE_GETS = self._get_env_bool("DEMO_API_HEDGE_GETS", False)
+        self.DEMO_API_DEADLINE = self._get_env_float("DEMO_API_DEADLINE", 0.0)
+
+        # Cache des GET conditionnels (vide : en mémoire seulement). Le
+        # dossier par défaut est dans le projet, quel que soit le répertoire
+        # courant
+        self.DEMO_API_HTTP_CACHE_DIR = self._get_env_with_default(
+            "DEMO_API_HTTP_CACHE_DIR",
+            os.path.join(PROJECT_DIR, "outputs", "http_cache"),
+        )
+
+        # Instantané de la flotte ajouté à l'historique à chaque génération
+        # de rapports (sinon seulement avec --snapshot)
+        self.DEMO_API_REPORT_SNAPSHOTS = self._get_env_bool(
+            "DEMO_API_REPORT_SNAPSHOTS", False
+        )
+
+        # Traces des opérations (vide : traçage désactivé)
+        self.DEMO_API_TRACE_FILE = self._get_env_with_default(
+            "DEMO_API_TRACE_FILE", ""
+        )
+        self.DEMO_API_TRACE_FORMAT = self._get_env_with_default(
+            "DEMO_API_TRACE_FORMAT", "chrome"
+        ).lower()
 
         # Configuration des fichiers
         self.DEMO_API_OUTPUT_FILE = self._get_env_with_default(
@@ -92,6 +137,13 @@ class Config:
         except ValueError:
             return default
 
+    def _get_env_float(self, key: str, default: float) -> float:
+        """Récupère une variable d'environnement décimale"""
+        try:
+            return float(os.environ.get(key, default))
+        except ValueError:
+            return default
+
     def _get_env_list(self, key: str, default: Optional[list] = None) -> list:
         """Récupère une variable d'environnement sous forme de liste"""
         if default is None:
@@ -119,6 +171,40 @@ class Config:
         if self.DEMO_API_MAX_RETRIES < 0:
             raise ValueError(f"Nombre de retry invalide: {self.DEMO_API_MAX_RETRIES}")
 
+        # Validation du backend JSON
+        valid_json_backends = ["auto", "orjson", "msgspec", "json"]
+        if self.DEMO_API_JSON_BACKEND.lower() not in valid_json_backends:
+            raise ValueError(f"Backend JSON invalide: {self.DEMO_API_JSON_BACKEND}")
+
+        # Validation des disjoncteurs et du budget de retry
+        if not 0 < self.DEMO_API_BREAKER_ERROR_RATE <= 1:
+            raise ValueError(
+                f"Taux d'erreur invalide: {self.DEMO_API_BREAKER_ERROR_RATE}"
+            )
+
+        if self.DEMO_API_BREAKER_MIN_REQUESTS < 1 or self.DEMO_API_BREAKER_WINDOW < 1:
+            raise ValueError(
+                "Fenêtre de disjoncteur invalide: "
+                f"{self.DEMO_API_BREAKER_MIN_REQUESTS}/{self.DEMO_API_BREAKER_WINDOW}"
+            )
+
+        if self.DEMO_API_BREAKER_COOLDOWN < 0:
+            raise ValueError(
+                f"Durée d'ouverture invalide: {self.DEMO_API_BREAKER_COOLDOWN}"
+            )
+
+        if not 0 <= self.DEMO_API_RETRY_BUDGET <= 1:
+            raise ValueError(f"Budget de retry invalide: {self.DEMO_API_RETRY_BUDGET}")
+
+        if self.DEMO_API_DEADLINE < 0:
+            raise ValueError(f"Échéance invalide: {self.DEMO_API_DEADLINE}")
+
+        if self.DEMO_API_TRACE_FORMAT not in ("chrome", "json"):
+            raise ValueError(
+                f"Format de trace invalide: {self.DEMO_API_TRACE_FORMAT} "
+                "(valides: chrome, json)"
+            )
+
     # Propriétés de configuration pour l'accès facile
     @property
     def is_production(self) -> bool:
@@ -149,6 +235,11 @@ class Config:
             "base_url": self.DEMO_API_BASE_URL,
             "timeout": self.DEMO_API_TIMEOUT,
             "max_retries": self.DEMO_API_MAX_RETRIES,
+            "breaker_error_rate": self.DEMO_API_BREAKER_ERROR_RATE,
+            "breaker_cooldown": self.DEMO_API_BREAKER_COOLDOWN,
+            "retry_budget": self.DEMO_API_RETRY_BUDGET,
+            "hedge_gets": self.DEMO_API_HEDGE_GETS,
+            "deadline": self.DEMO_API_DEADLINE,
             "ssl_verify": self.is_production,  # SSL strict en production
         }
 
@@ -160,6 +251,18 @@ class Config:
             "demo_api_log_level": self.DEMO_API_LOG_LEVEL,
             "demo_api_timeout": self.DEMO_API_TIMEOUT,
             "demo_api_max_retries": self.DEMO_API_MAX_RETRIES,
+            "demo_api_json_backend": self.DEMO_API_JSON_BACKEND,
+            "demo_api_breaker_error_rate": self.DEMO_API_BREAKER_ERROR_RATE,
+            "demo_api_breaker_min_requests": self.DEMO_API_BREAKER_MIN_REQUESTS,
+            "demo_api_breaker_window": self.DEMO_API_BREAKER_WINDOW,
+            "demo_api_breaker_cooldown": self.DEMO_API_BREAKER_COOLDOWN,
+            "demo_api_retry_budget": self.DEMO_API_RETRY_BUDGET,
+            "demo_api_hedge_gets": self.DEMO_API_HEDGE_GETS,
+            "demo_api_deadline": self.DEMO_API_DEADLINE,
+            "demo_api_http_cache_dir": self.DEMO_API_HTTP_CACHE_DIR,
+            "demo_api_report_snapshots": self.DEMO_API_REPORT_SNAPSHOTS,
+            "demo_api_trace_file": self.DEMO_API_TRACE_FILE,
+            "demo_api_trace_format": self.DEMO_API_TRACE_FORMAT,
             "demo_api_output_file": self.DEMO_API_OUTPUT_FILE,
             "demo_api_env_files_loaded": self.env_files_loaded,
             "demo_api_has_credentials": self.has_credentials,
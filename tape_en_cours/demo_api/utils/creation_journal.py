@@ -0,0 +1,202 @@
+"""
+Journal de reprise pour la création en masse via l'API.
+
+Le journal est un fichier JSON Lines en ajout seul, écrit au fil de l'eau :
+- une ligne "planned" avec les données générées, avant l'appel à l'API ;
+- une ligne "created" avec l'enregistrement renvoyé par l'API, après succès.
+
+Relu avec resume=True, il permet de sauter les éléments déjà créés, de
+renvoyer exactement les mêmes données pour ceux qui étaient en cours, et de
+réutiliser les IDs des utilisateurs créés pour leur associer les VMs. Un
+journal qui contient encore des éléments en cours n'est écrasé qu'avec
+fresh=True : sinon, la trace d'une exécution interrompue serait perdue.
+
+Les écritures sont protégées par un verrou : le journal peut être alimenté
+par plusieurs threads (pipeline de création, voir utils.bulk_pipeline).
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from utils import json_codec
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+USER = "user"
+VM = "vm"
+
+
+class UnfinishedJournalError(RuntimeError):
+    """Exception levée quand un journal contient des éléments non confirmés"""
+
+
+class CreationJournal:
+    """Journal JSON Lines des éléments générés et créés via l'API"""
+
+    def __init__(self, path: str, resume: bool = False, fresh: bool = False):
+        """
+        Ouvre le journal
+
+        Args:
+            path: Chemin du fichier journal
+            resume: Relire le journal existant (sinon il est remis à zéro)
+            fresh: Remettre à zéro un journal qui contient des éléments en
+                cours (ignoré avec resume)
+
+        Raises:
+            UnfinishedJournalError: Si le journal existant contient des
+                éléments en cours, sans resume ni fresh
+        """
+        self.path = path
+        self._planned: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._created: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resume and os.path.exists(path):
+            self._load()
+        elif os.path.exists(path):
+            if not fresh:
+                self._load()
+                pending = len(self.pending(USER)) + len(self.pending(VM))
+                if pending:
+                    raise UnfinishedJournalError(
+                        f"Le journal {path} contient {pending} élément(s) "
+                        "dont la création n'a pas été confirmée"
+                    )
+                self._planned.clear()
+                self._created.clear()
+            logger.info(
+                "Nouveau journal de création, l'ancien est écrasé", path=path
+            )
+            os.remove(path)
+
+        self._file = open(path, "ab")
+
+    def _load(self) -> None:
+        """Relit le journal existant"""
+        with open(self.path, "rb") as f:
+            content = f.read()
+
+        # Une interruption peut laisser une dernière ligne tronquée : elle est
+        # retirée pour que les prochaines lignes ne lui soient pas accolées
+        complete = content.rfind(b"\n") + 1
+        if complete < len(content):
+            logger.warning("Ligne de journal tronquée ignorée", path=self.path)
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+
+        for line in content[:complete].splitlines():
+            entry = json_codec.loads(line)
+            key = (entry["kind"], entry["index"])
+            if entry["event"] == "planned":
+                self._planned[key] = entry["payload"]
+            elif entry["event"] == "created":
+                self._created[key] = entry["record"]
+
+        logger.info(
+            "Journal de création relu",
+            path=self.path,
+            planned=len(self._planned),
+            created=len(self._created),
+        )
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Ajoute une ligne au journal et la pousse immédiatement sur disque"""
+        line = json_codec.dumps(entry) + b"\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def planned(self, kind: str, index: int) -> Optional[Dict[str, Any]]:
+        """Données déjà générées pour un élément (None si jamais généré)"""
+        return self._planned.get((kind, index))
+
+    def created(self, kind: str, index: int) -> Optional[Dict[str, Any]]:
+        """Enregistrement créé pour un élément (None si pas encore créé)"""
+        return self._created.get((kind, index))
+
+    def record_planned(self, kind: str, index: int, payload: Dict[str, Any]) -> None:
+        """Journalise les données générées, avant l'appel à l'API"""
+        self._planned[(kind, index)] = payload
+        self._write(
+            {"event": "planned", "kind": kind, "index": index, "payload": payload}
+        )
+
+    def record_created(self, kind: str, index: int, record: Dict[str, Any]) -> None:
+        """Journalise l'enregistrement renvoyé par l'API"""
+        self._created[(kind, index)] = record
+        self._write(
+            {"event": "created", "kind": kind, "index": index, "record": record}
+        )
+
+    def created_records(self, kind: str) -> List[Dict[str, Any]]:
+        """Enregistrements créés d'un type, dans l'ordre des éléments"""
+        return [
+            record
+            for (entry_kind, _), record in sorted(self._created.items())
+            if entry_kind == kind
+        ]
+
+    def pending(self, kind: str) -> Dict[int, Dict[str, Any]]:
+        """Éléments générés mais dont la création n'a pas été confirmée"""
+        return {
+            index: payload
+            for (entry_kind, index), payload in self._planned.items()
+            if entry_kind == kind and (entry_kind, index) not in self._created
+        }
+
+    def reconcile(
+        self, kind: str, existing: List[Dict[str, Any]], fields: Tuple[str, ...]
+    ) -> int:
+        """
+        Rattache les éléments en cours à des enregistrements déjà présents
+
+        Une interruption entre l'appel à l'API et l'écriture de la ligne
+        "created" laisse un élément créé mais non confirmé : on le retrouve
+        dans les données existantes par les champs donnés (ex: email) pour
+        ne pas le créer une seconde fois.
+
+        Args:
+            kind: Type d'élément (user ou vm)
+            existing: Enregistrements présents dans l'API
+            fields: Champs identifiant un élément
+
+        Returns:
+            Nombre d'éléments rattachés
+        """
+        claimed = {
+            record.get("id")
+            for (entry_kind, _), record in self._created.items()
+            if entry_kind == kind
+        }
+        by_key = {
+            tuple(record.get(field) for field in fields): record
+            for record in existing
+            if record.get("id") not in claimed
+        }
+
+        reconciled = 0
+        for index, payload in self.pending(kind).items():
+            record = by_key.pop(tuple(payload.get(field) for field in fields), None)
+            if record is not None:
+                self.record_created(kind, index, record)
+                reconciled += 1
+
+        if reconciled:
+            logger.info("Éléments rattachés au journal", kind=kind, count=reconciled)
+        return reconciled
+
+    def close(self) -> None:
+        """Ferme le journal"""
+        self._file.close()
+
+    def __enter__(self) -> "CreationJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
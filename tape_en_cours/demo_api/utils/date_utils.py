@@ -3,9 +3,25 @@ Utilitaires pour la manipulation des dates et timestamps.
 
 Ce module fournit des fonctions utilitaires pour convertir
 et manipuler les timestamps Unix utilisés par l'API.
+
+Les collections renvoyées par l'API sont décodées par colonne
+(TimestampColumn) : les timestamps restent des entiers, convertis en
+datetime en une seule passe NumPy.
 """
 
 import datetime
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    np = None
+
+# Granularité des changements de décalage horaire (toutes les transitions
+# des fuseaux tombent sur un quart d'heure UTC)
+_OFFSET_BUCKET_MS = 15 * 60 * 1000
+_DAY_MS = 24 * 60 * 60 * 1000
 
 
 def parse_unix_timestamp(ts):
@@ -23,3 +39,111 @@ def parse_unix_timestamp(ts):
         datetime.datetime(2022, 1, 1, 0, 0)
     """
     return datetime.datetime.fromtimestamp(ts / 1e3)
+
+
+def _utc_offsets_ms(instants_ms: "np.ndarray") -> "np.ndarray":
+    """Décalage de l'heure locale par rapport à UTC à chaque instant (ms)"""
+    return np.fromiter(
+        (time.localtime(int(ms) // 1000).tm_gmtoff * 1000 for ms in instants_ms),
+        dtype=np.int64,
+        count=len(instants_ms),
+    )
+
+
+class TimestampColumn:
+    """
+    Colonne de timestamps Unix en millisecondes
+
+    Les valeurs sont conservées en entiers ; la vue datetime (heure locale,
+    comme parse_unix_timestamp) est calculée en bloc au premier accès, puis
+    mise en cache.
+    """
+
+    def __init__(self, values_ms: Iterable[int]):
+        """
+        Args:
+            values_ms: Timestamps Unix en millisecondes
+        """
+        values = list(values_ms)
+        self.values = np.array(values, dtype=np.int64) if np is not None else values
+        self._local: Optional["np.ndarray"] = None
+        self._datetimes: Optional[List[datetime.datetime]] = None
+
+    @classmethod
+    def from_records(
+        cls, records: List[Dict[str, Any]], field: str = "created_at"
+    ) -> "TimestampColumn":
+        """Extrait la colonne d'un champ de la liste d'enregistrements"""
+        return cls(record[field] for record in records)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _local_ms(self) -> "np.ndarray":
+        """
+        Timestamps décalés en heure locale (millisecondes), mis en cache
+
+        Le décalage est calculé une fois par jour présent dans la colonne ;
+        seuls les jours de changement d'heure sont affinés au quart d'heure.
+        """
+        if self._local is not None:
+            return self._local
+
+        # Jours couverts indexés directement (sans tri) quand la plage est
+        # raisonnable par rapport au nombre de valeurs
+        day_numbers = self.values // _DAY_MS
+        first, last = int(day_numbers.min()), int(day_numbers.max())
+        if last - first < 4 * len(day_numbers):
+            days = np.arange(first, last + 1, dtype=np.int64)
+            inverse = day_numbers - first
+        else:
+            days, inverse = np.unique(day_numbers, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        starts = _utc_offsets_ms(days * _DAY_MS)
+        ends = _utc_offsets_ms((days + 1) * _DAY_MS)
+        offsets = starts[inverse]
+
+        changing = np.flatnonzero(starts != ends)
+        if len(changing):
+            rows = np.flatnonzero(np.isin(inverse, changing))
+            buckets, bucket_inverse = np.unique(
+                self.values[rows] // _OFFSET_BUCKET_MS, return_inverse=True
+            )
+            offsets[rows] = _utc_offsets_ms(buckets * _OFFSET_BUCKET_MS)[
+                bucket_inverse.reshape(-1)
+            ]
+
+        self._local = self.values + offsets
+        return self._local
+
+    def datetime64(self) -> "np.ndarray":
+        """Vue datetime64[ms] en heure locale (nécessite numpy)"""
+        return self._local_ms().view("datetime64[ms]")
+
+    def datetimes(self) -> List[datetime.datetime]:
+        """Vue datetime (heure locale, sans fuseau), calculée en bloc"""
+        if self._datetimes is None:
+            if np is None or not len(self.values):
+                self._datetimes = [parse_unix_timestamp(ts) for ts in self.values]
+            else:
+                self._datetimes = self.datetime64().astype(object).tolist()
+        return self._datetimes
+
+
+def decode_timestamps(
+    records: List[Dict[str, Any]], field: str = "created_at"
+) -> TimestampColumn:
+    """
+    Remplace en bloc les timestamps d'un champ par leur datetime
+
+    Args:
+        records: Enregistrements renvoyés par l'API (modifiés en place)
+        field: Champ contenant le timestamp en millisecondes
+
+    Returns:
+        Colonne des timestamps d'origine (entiers)
+    """
+    column = TimestampColumn.from_records(records, field)
+    for record, value in zip(records, column.datetimes()):
+        record[field] = value
+    return column
@@ -0,0 +1,205 @@
+"""
+Codec JSON centralisé pour demo_api.
+
+Ce module fournit une interface unique pour décoder les réponses de l'API
+et encoder les rapports, avec un backend rapide (orjson ou msgspec) quand
+il est installé et un repli sur le module json de la bibliothèque standard.
+
+Les dates (datetime, date) sont encodées nativement au format ISO 8601,
+sans passer par str().
+
+Les sorties indentées le sont à 2 espaces quel que soit le backend (orjson
+ne sait pas indenter autrement) : un même rapport est identique d'un
+environnement à l'autre.
+
+Le backend peut être forcé via la configuration DEMO_API_JSON_BACKEND
+(auto, orjson, msgspec, json).
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Union
+from utils.config import config
+from utils.profiling import stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    msgspec = None
+
+
+class JSONCodecError(ValueError):
+    """Erreur de décodage JSON, indépendante du backend utilisé"""
+
+
+def _default(obj: Any) -> Any:
+    """
+    Convertit les types non supportés nativement par les backends.
+
+    Args:
+        obj: Objet à convertir
+
+    Returns:
+        Représentation sérialisable de l'objet
+
+    Raises:
+        TypeError: Si le type n'est pas supporté
+    """
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Type non sérialisable en JSON: {type(obj).__name__}")
+
+
+class StdlibBackend:
+    """Backend basé sur le module json de la bibliothèque standard"""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise JSONCodecError(str(e)) from e
+
+    def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            obj,
+            indent=2 if indent else None,
+            sort_keys=sort_keys,
+            default=_default,
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+
+class OrjsonBackend:
+    """Backend basé sur orjson"""
+
+    name = "orjson"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise JSONCodecError(str(e)) from e
+
+    def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option)
+
+
+class MsgspecBackend:
+    """Backend basé sur msgspec"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._sorted_encoder = msgspec.json.Encoder(enc_hook=_default, order="sorted")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise JSONCodecError(str(e)) from e
+
+    def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+        encoder = self._sorted_encoder if sort_keys else self._encoder
+        content = encoder.encode(obj)
+        if indent:
+            content = msgspec.json.format(content, indent=2)
+        return content
+
+
+def _select_backend(preference: str = "auto"):
+    """
+    Sélectionne le backend JSON selon la préférence et les modules installés.
+
+    Args:
+        preference: auto, orjson, msgspec ou json
+
+    Returns:
+        Instance du backend retenu (json en dernier recours)
+    """
+    preference = preference.lower()
+    if preference in ("auto", "orjson") and orjson is not None:
+        return OrjsonBackend()
+    if preference in ("auto", "msgspec") and msgspec is not None:
+        return MsgspecBackend()
+    return StdlibBackend()
+
+
+backend = _select_backend(config.DEMO_API_JSON_BACKEND)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Décode un document JSON.
+
+    Args:
+        data: Contenu JSON brut (bytes de préférence, pour éviter un décodage texte)
+
+    Returns:
+        Objet Python décodé
+
+    Raises:
+        JSONCodecError: Si le contenu n'est pas un JSON valide
+    """
+    return backend.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Encode un objet en JSON UTF-8.
+
+    Args:
+        obj: Objet à encoder
+        indent: Produire une sortie indentée (2 espaces)
+        sort_keys: Trier les clés des dictionnaires
+
+    Returns:
+        bytes: Document JSON encodé en UTF-8
+    """
+    return backend.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+@stage("write")
+def dump_file(
+    obj: Any, path: Union[str, Path], indent: bool = True, sort_keys: bool = False
+) -> int:
+    """
+    Encode un objet et l'écrit dans un fichier.
+
+    Args:
+        obj: Objet à encoder
+        path: Chemin du fichier de sortie
+        indent: Produire une sortie indentée
+        sort_keys: Trier les clés des dictionnaires
+
+    Returns:
+        int: Nombre d'octets écrits
+    """
+    content = dumps(obj, indent=indent, sort_keys=sort_keys)
+    with open(path, "wb") as f:
+        f.write(content)
+    return len(content)
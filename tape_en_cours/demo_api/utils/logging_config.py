@@ -3,6 +3,7 @@
 import structlog
 import sys
 from .config import config
+from .tracing import add_trace_context
 
 
 def setup_logging():
@@ -18,6 +19,7 @@ def setup_logging():
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
+        add_trace_context,
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
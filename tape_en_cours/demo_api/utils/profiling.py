@@ -0,0 +1,290 @@
+"""
+Mode profilage des commandes CLI de demo_api.
+
+Chaque application Typer accepte --profile avec l'un des modes suivants :
+- cprofile : profil déterministe (cProfile), écrit au format pstats
+  (lisible avec `python -m pstats` ou snakeviz) ;
+- sampling : échantillonnage périodique des piles de tous les threads, écrit
+  au format "collapsed stacks" (flamegraph.pl, speedscope, inferno) ;
+- memory : allocations suivies par tracemalloc, écrites sous forme
+  d'instantané (tracemalloc.Snapshot.load) avec un résumé des plus grosses.
+
+Quel que soit le mode, les étapes instrumentées avec stage() (fetch, join,
+aggregate, render, write...) sont chronométrées et un tableau récapitulatif
+est affiché à la fin de la commande. Hors profilage, stage() ne mesure rien.
+"""
+
+import atexit
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterator, List, Optional
+
+import click
+import typer
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Dossier par défaut des fichiers de profil
+DEFAULT_PROFILE_DIR = "outputs/profiles"
+
+# Intervalle d'échantillonnage des piles (secondes)
+SAMPLING_INTERVAL = 0.005
+
+# Profondeur des piles conservées par tracemalloc
+TRACEMALLOC_FRAMES = 25
+
+
+class ProfileMode(str, Enum):
+    """Modes de profilage disponibles"""
+
+    CPROFILE = "cprofile"
+    SAMPLING = "sampling"
+    MEMORY = "memory"
+
+
+# Extension du fichier écrit par chaque mode
+_EXTENSIONS = {
+    ProfileMode.CPROFILE: "pstats",
+    ProfileMode.SAMPLING: "folded",
+    ProfileMode.MEMORY: "tracemalloc",
+}
+
+# Session en cours (une seule par processus)
+_active: Optional["ProfileSession"] = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Chronomètre une étape de la commande pendant une session de profilage
+
+    Utilisable comme bloc `with stage("render"):` ou comme décorateur
+    `@stage("aggregate")`. Sans session active, ne fait rien.
+
+    Args:
+        name: Nom de l'étape (fetch, join, aggregate, render, write...)
+    """
+    session = _active
+    if session is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.add_timing(name, time.perf_counter() - start)
+
+
+class _StackSampler(threading.Thread):
+    """Thread qui relève périodiquement les piles de tous les autres threads"""
+
+    def __init__(self, interval: float = SAMPLING_INTERVAL):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    filename = os.path.basename(code.co_filename)
+                    stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        """Arrête l'échantillonnage et attend la fin du thread"""
+        self._stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    """Session de profilage d'une commande"""
+
+    def __init__(
+        self,
+        mode: ProfileMode,
+        directory: str = DEFAULT_PROFILE_DIR,
+        name: str = "command",
+    ):
+        """
+        Prépare la session
+
+        Args:
+            mode: Mode de profilage
+            directory: Dossier des fichiers de profil
+            name: Nom de la commande (préfixe du fichier)
+        """
+        self.mode = ProfileMode(mode)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(
+            directory, f"{name}_{timestamp}.{_EXTENSIONS[self.mode]}"
+        )
+        self.timings: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started = 0.0
+        self._stopped = False
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        """Ajoute la durée d'un passage dans une étape"""
+        with self._lock:
+            self.timings.setdefault(name, []).append(seconds)
+
+    def start(self) -> None:
+        """Démarre le profilage et l'enregistrement des étapes"""
+        global _active
+        if _active is not None:
+            raise RuntimeError("Une session de profilage est déjà active")
+        _active = self
+        self._started = time.perf_counter()
+
+        if self.mode == ProfileMode.CPROFILE:
+            # cProfile ne suit que le thread courant : le mode sampling
+            # couvre aussi les threads d'envoi et de rendu
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == ProfileMode.SAMPLING:
+            self._sampler = _StackSampler()
+            self._sampler.start()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        logger.info("Profilage démarré", mode=self.mode.value, path=self.path)
+
+    def stop(self) -> None:
+        """Arrête le profilage, écrit le fichier et affiche le récapitulatif"""
+        global _active
+        if self._stopped:
+            return
+        self._stopped = True
+        elapsed = time.perf_counter() - self._started
+        _active = None
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.path)
+        elif self._sampler is not None:
+            self._sampler.stop()
+            with open(self.path, "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(self.path)
+            self._echo_top_allocations(snapshot, peak)
+
+        logger.info("Profilage terminé", mode=self.mode.value, path=self.path)
+        self._echo_stage_table(elapsed)
+        typer.echo(f"🔬 Profil ({self.mode.value}) écrit dans {self.path}", err=True)
+
+    def _echo_top_allocations(
+        self, snapshot: tracemalloc.Snapshot, peak: int, limit: int = 10
+    ) -> None:
+        """Affiche le pic mémoire et les lignes qui retiennent le plus de mémoire"""
+        typer.echo(f"\n🧠 Pic mémoire suivi: {peak / 1024 / 1024:.1f} Mio", err=True)
+        typer.echo("   Allocations encore présentes en fin de commande:", err=True)
+        for stat in snapshot.statistics("lineno")[:limit]:
+            frame = stat.traceback[0]
+            typer.echo(
+                f"   {stat.size / 1024:10.1f} Kio {stat.count:8d} blocs  "
+                f"{frame.filename}:{frame.lineno}",
+                err=True,
+            )
+
+    def _echo_stage_table(self, elapsed: float) -> None:
+        """Affiche le temps passé dans chaque étape instrumentée"""
+        typer.echo("\n⏱️  Temps par étape:", err=True)
+        typer.echo(f"   {'Étape':<12}{'Appels':>8}{'Total (s)':>12}{'%':>8}", err=True)
+        for name, durations in sorted(
+            self.timings.items(), key=lambda item: -sum(item[1])
+        ):
+            total = sum(durations)
+            share = 100 * total / elapsed if elapsed else 0.0
+            typer.echo(
+                f"   {name:<12}{len(durations):>8}{total:>12.3f}{share:>7.1f}%",
+                err=True,
+            )
+        typer.echo(f"   {'total':<12}{'':>8}{elapsed:>12.3f}{100:>7.1f}%", err=True)
+
+
+def start_profile(
+    mode: Optional[ProfileMode],
+    directory: str = DEFAULT_PROFILE_DIR,
+    name: Optional[str] = None,
+) -> Optional[ProfileSession]:
+    """
+    Démarre une session arrêtée automatiquement à la fin de la commande Typer
+
+    Args:
+        mode: Mode de profilage (None : pas de profilage)
+        directory: Dossier des fichiers de profil
+        name: Nom de la commande (défaut: commande Typer en cours)
+
+    Returns:
+        Session démarrée ou None
+    """
+    if mode is None:
+        return None
+
+    ctx = click.get_current_context(silent=True)
+    if name is None:
+        name = (ctx and (ctx.invoked_subcommand or ctx.info_name)) or "command"
+    session = ProfileSession(mode, directory, name.replace("-", "_"))
+    session.start()
+
+    # Arrêt à la fermeture du contexte Typer, y compris sur typer.Exit
+    if ctx is not None:
+        ctx.call_on_close(session.stop)
+    else:
+        atexit.register(session.stop)
+    return session
+
+
+def add_profile_option(app: typer.Typer) -> None:
+    """
+    Ajoute les options globales --profile et --profile-dir à une application
+
+    Les options se placent avant la commande :
+    `python main.py --profile sampling report -t capacity`.
+
+    Args:
+        app: Application Typer à plusieurs commandes
+    """
+
+    @app.callback()
+    def profile_options(
+        profile: Optional[ProfileMode] = typer.Option(
+            None,
+            "--profile",
+            help="Profile la commande (cprofile, sampling ou memory)",
+            case_sensitive=False,
+        ),
+        profile_dir: str = typer.Option(
+            DEFAULT_PROFILE_DIR,
+            "--profile-dir",
+            help="Répertoire des fichiers de profil",
+        ),
+    ) -> None:
+        start_profile(profile, profile_dir)
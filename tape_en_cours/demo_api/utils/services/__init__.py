@@ -5,10 +5,20 @@ Ce module contient les services qui encapsulent la logique métier :
 - VMService : Gestion des VMs
 - ReportService : Génération de rapports
 - DataManager : Gestion centralisée des données
+- SnapshotStore : Historique des instantanés de la flotte
+- VMBulkService : Actions en masse sur les VMs
 """
 
 from .vm_service import VMService
 from .report_service import ReportService
 from .data_manager import DataManager
+from .snapshot_store import SnapshotStore
+from .vm_bulk_service import VMBulkService
 
-__all__ = ["VMService", "ReportService", "DataManager"]
+__all__ = [
+    "VMService",
+    "ReportService",
+    "DataManager",
+    "SnapshotStore",
+    "VMBulkService",
+]
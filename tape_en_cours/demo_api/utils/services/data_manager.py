@@ -6,6 +6,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from utils.api import Api
 from utils.api.exceptions import UsersFetchError, VMsFetchError
 from utils.logging_config import get_logger
+from utils.profiling import stage
+from utils.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -25,6 +27,8 @@ class DataManager:
         self._vms_cache: Optional[List[Dict[str, Any]]] = None
         self._data_fetched = False
 
+    @traced("fetch_all_data")
+    @stage("fetch")
     def fetch_all_data(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
         Récupère toutes les données nécessaires (utilisateurs et VMs) en une seule fois
@@ -55,7 +59,10 @@ class DataManager:
             self._vms_cache = []
 
         self._data_fetched = True
-        logger.info("Récupération centralisée des données terminée")
+        logger.info(
+            "Récupération centralisée des données terminée",
+            transfers=self.api.transfer_stats(),
+        )
 
         return self._users_cache or [], self._vms_cache or []
 
@@ -5,10 +5,26 @@ Service de génération de rapports
 from typing import Dict, Any, List, Optional
 from utils.api import Api
 from utils.logging_config import get_logger
-from reports import JSONReportGenerator, MarkdownReportGenerator, HTMLReportGenerator
+from utils.tracing import traced
+from reports import (
+    JSONReportGenerator,
+    MarkdownReportGenerator,
+    HTMLReportGenerator,
+    ColumnarReportGenerator,
+    compute_capacity_report,
+    compute_trend_report,
+)
+from .snapshot_store import SnapshotStore
 
 logger = get_logger(__name__)
 
+# Générateurs utilisables pour les rapports calculés (capacité, tendance)
+REPORT_GENERATORS = {
+    "json": JSONReportGenerator,
+    "markdown": MarkdownReportGenerator,
+    "html": HTMLReportGenerator,
+}
+
 
 class ReportService:
     """Service pour la génération de rapports"""
@@ -22,6 +38,7 @@ class ReportService:
         """
         self.api = api_client
 
+    @traced()
     def generate_users_vms_report(
         self,
         users: List[Dict[str, Any]],
@@ -63,6 +80,7 @@ class ReportService:
             logger.error("Erreur lors de la génération du rapport", error=str(e))
             return None
 
+    @traced()
     def generate_status_report(
         self,
         users: List[Dict[str, Any]],
@@ -114,11 +132,14 @@ class ReportService:
             )
             return None
 
+    @traced()
     def generate_users_vms_report_markdown(
         self,
         users: List[Dict[str, Any]],
         vms: List[Dict[str, Any]],
         filename: str = "vm_users.md",
+        users_per_page: Optional[int] = None,
+        workers: Optional[int] = None,
     ) -> Optional[str]:
         """
         Génère un rapport utilisateurs/VMs en Markdown
@@ -127,6 +148,8 @@ class ReportService:
             users: Liste des utilisateurs
             vms: Liste des VMs
             filename: Nom du fichier de sortie
+            users_per_page: Nombre d'utilisateurs par page (rapport paginé si fourni)
+            workers: Nombre de processus pour le rendu des pages
 
         Returns:
             Chemin du fichier généré ou None si échec
@@ -148,7 +171,9 @@ class ReportService:
         try:
             logger.info("Génération du rapport Markdown")
             markdown_generator = MarkdownReportGenerator()
-            report_file = markdown_generator.generate_users_vms_report(users, filename)
+            report_file = markdown_generator.generate_users_vms_report(
+                users, filename, users_per_page, workers
+            )
             logger.info("Rapport Markdown généré avec succès", filename=report_file)
             return report_file
         except (IOError, TypeError) as e:
@@ -157,11 +182,14 @@ class ReportService:
             )
             return None
 
+    @traced()
     def generate_users_vms_report_html(
         self,
         users: List[Dict[str, Any]],
         vms: List[Dict[str, Any]],
         filename: str = "vm_users.html",
+        users_per_page: Optional[int] = None,
+        workers: Optional[int] = None,
     ) -> Optional[str]:
         """
         Génère un rapport utilisateurs/VMs en HTML
@@ -170,6 +198,8 @@ class ReportService:
             users: Liste des utilisateurs
             vms: Liste des VMs
             filename: Nom du fichier de sortie
+            users_per_page: Nombre d'utilisateurs par page (rapport paginé si fourni)
+            workers: Nombre de processus pour le rendu des pages
 
         Returns:
             Chemin du fichier généré ou None si échec
@@ -191,13 +221,16 @@ class ReportService:
         try:
             logger.info("Génération du rapport HTML")
             html_generator = HTMLReportGenerator()
-            report_file = html_generator.generate_users_vms_report(users, filename)
+            report_file = html_generator.generate_users_vms_report(
+                users, filename, users_per_page, workers
+            )
             logger.info("Rapport HTML généré avec succès", filename=report_file)
             return report_file
         except (IOError, TypeError) as e:
             logger.error("Erreur lors de la génération du rapport HTML", error=str(e))
             return None
 
+    @traced()
     def generate_status_report_markdown(
         self,
         users: List[Dict[str, Any]],
@@ -254,6 +287,7 @@ class ReportService:
             )
             return None
 
+    @traced()
     def generate_status_report_html(
         self,
         users: List[Dict[str, Any]],
@@ -306,3 +340,198 @@ class ReportService:
                 "Erreur lors de la génération du rapport de statut HTML", error=str(e)
             )
             return None
+
+    @traced()
+    def generate_fleet_snapshot(
+        self,
+        users: List[Dict[str, Any]],
+        vms: List[Dict[str, Any]],
+        file_format: str = "parquet",
+        basename: str = "vm_users",
+    ) -> Optional[List[str]]:
+        """
+        Exporte les utilisateurs et les VMs en tables columnaires (Parquet/Arrow)
+
+        Args:
+            users: Liste des utilisateurs
+            vms: Liste des VMs
+            file_format: Format des fichiers ("parquet" ou "arrow")
+            basename: Préfixe des fichiers générés
+
+        Returns:
+            Liste des fichiers générés ou None si échec
+        """
+        logger.info("Début de l'export columnaire", file_format=file_format)
+
+        if not users and not vms:
+            logger.warning("Impossible d'exporter la flotte: données manquantes")
+            return None
+
+        try:
+            columnar_generator = ColumnarReportGenerator(file_format=file_format)
+            report_files = columnar_generator.generate_fleet_snapshot(
+                users, vms, basename
+            )
+            logger.info("Export columnaire généré avec succès", files=report_files)
+            return report_files
+        except (IOError, TypeError, ValueError, ImportError) as e:
+            logger.error("Erreur lors de l'export columnaire", error=str(e))
+            return None
+
+    @traced()
+    def compute_capacity(
+        self,
+        users: List[Dict[str, Any]],
+        vms: List[Dict[str, Any]],
+        top_n: int = 10,
+        bucket: str = "day",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Calcule les statistiques de capacité de la flotte (CPU, RAM, disque)
+
+        Le résultat est à calculer une seule fois puis à passer à
+        generate_capacity_report pour chaque format demandé.
+
+        Args:
+            users: Liste des utilisateurs
+            vms: Liste des VMs
+            top_n: Nombre d'utilisateurs dans le classement des plus gros
+                consommateurs
+            bucket: Granularité de l'histogramme des créations (hour, day, month)
+
+        Returns:
+            Statistiques de capacité ou None si échec
+        """
+        if not vms:
+            logger.warning(
+                "Impossible de générer le rapport de capacité: pas de VMs disponibles"
+            )
+            return None
+
+        try:
+            return compute_capacity_report(users, vms, top_n, bucket)
+        except (TypeError, ValueError, ImportError) as e:
+            logger.error(
+                "Erreur lors du calcul des statistiques de capacité", error=str(e)
+            )
+            return None
+
+    @traced()
+    def generate_capacity_report(
+        self,
+        capacity_data: Dict[str, Any],
+        report_format: str = "json",
+        filename: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Génère un rapport de capacité de la flotte à partir de statistiques
+        déjà calculées (voir compute_capacity)
+
+        Args:
+            capacity_data: Statistiques de capacité
+            report_format: Format du rapport ("json", "markdown" ou "html")
+            filename: Nom du fichier de sortie (défaut: vm_capacity_report.<ext>)
+
+        Returns:
+            Chemin du fichier généré ou None si échec
+        """
+        logger.info(
+            "Début de génération du rapport de capacité", format=report_format
+        )
+
+        if report_format not in REPORT_GENERATORS:
+            logger.error(
+                "Format de rapport de capacité invalide", format=report_format
+            )
+            return None
+
+        try:
+            generator = REPORT_GENERATORS[report_format]()
+            if filename is None:
+                filename = f"vm_capacity_report.{generator.get_extension()}"
+            report_file = generator.generate_capacity_report(capacity_data, filename)
+            logger.info(
+                "Rapport de capacité généré avec succès", filename=report_file
+            )
+            return report_file
+        except (IOError, TypeError, ValueError) as e:
+            logger.error(
+                "Erreur lors de la génération du rapport de capacité", error=str(e)
+            )
+            return None
+
+    @traced()
+    def record_snapshot(
+        self,
+        users: List[Dict[str, Any]],
+        vms: List[Dict[str, Any]],
+        history_dir: str = "outputs/history",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ajoute un instantané de la flotte à l'historique
+
+        Args:
+            users: Liste des utilisateurs
+            vms: Liste des VMs
+            history_dir: Dossier de l'historique
+
+        Returns:
+            Entrée d'index de l'instantané ou None si échec
+        """
+        try:
+            return SnapshotStore(history_dir).record(users, vms)
+        except (IOError, TypeError, ValueError, KeyError) as e:
+            logger.error(
+                "Erreur lors de l'enregistrement de l'instantané", error=str(e)
+            )
+            return None
+
+    @traced()
+    def generate_trend_report(
+        self,
+        report_format: str = "json",
+        filename: Optional[str] = None,
+        history_dir: str = "outputs/history",
+        limit: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Génère un rapport de tendance à partir de l'historique des instantanés
+
+        Seul l'index de l'historique est lu (agrégats précalculés).
+
+        Args:
+            report_format: Format du rapport ("json", "markdown" ou "html")
+            filename: Nom du fichier de sortie (défaut: vm_trend_report.<ext>)
+            history_dir: Dossier de l'historique
+            limit: Ne conserver que les N derniers instantanés (optionnel)
+
+        Returns:
+            Chemin du fichier généré ou None si échec
+        """
+        logger.info(
+            "Début de génération du rapport de tendance", format=report_format
+        )
+
+        if report_format not in REPORT_GENERATORS:
+            logger.error(
+                "Format de rapport de tendance invalide", format=report_format
+            )
+            return None
+
+        try:
+            trend_data = compute_trend_report(
+                SnapshotStore(history_dir).entries(), limit
+            )
+            generator = REPORT_GENERATORS[report_format]()
+            if filename is None:
+                filename = f"vm_trend_report.{generator.get_extension()}"
+            report_file = generator.generate_trend_report(trend_data, filename)
+            logger.info(
+                "Rapport de tendance généré avec succès", filename=report_file
+            )
+            return report_file
+        except (IOError, TypeError, ValueError) as e:
+            logger.error(
+                "Erreur lors de la génération du rapport de tendance", error=str(e)
+            )
+            return None
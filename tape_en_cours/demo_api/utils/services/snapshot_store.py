@@ -0,0 +1,326 @@
+"""
+Historique des instantanés de la flotte pour demo_api
+
+Chaque instantané est stocké sous forme de différence avec le précédent
+(utilisateurs et VMs ajoutés, modifiés, supprimés), dans un journal compressé
+en ajout seul. Les agrégats (VMs par statut, capacité totale, nombre
+d'utilisateurs) sont mis à jour à partir de la seule différence et écrits dans
+un index léger : les rapports de tendance lisent l'index sans jamais relire
+d'instantané complet.
+
+Organisation du dossier d'historique :
+- deltas.jsonl.gz : une différence par ligne (membres gzip concaténés)
+- index.jsonl : agrégats et volume de changements de chaque instantané
+- state.json.gz : dernier état complet, pour calculer la différence suivante
+
+L'index est le point de validation : une différence n'est prise en compte
+que si une entrée d'index lui correspond, et le dernier état est reconstruit
+par rejeu s'il est en retard sur l'index (interruption pendant l'écriture).
+"""
+
+import datetime
+import gzip
+import os
+from typing import Dict, Any, List, Optional, Tuple
+from utils import json_codec
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DELTAS_FILENAME = "deltas.jsonl.gz"
+INDEX_FILENAME = "index.jsonl"
+STATE_FILENAME = "state.json.gz"
+
+# Métriques de capacité suivies dans les agrégats
+CAPACITY_METRICS = ("cpu_cores", "ram_gb", "disk_gb")
+
+
+def _normalize(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalise un enregistrement pour la comparaison et le stockage
+
+    Les dates sont converties en ISO 8601 (forme relue depuis le stockage) et
+    la liste "vms" ajoutée aux utilisateurs par les rapports est ignorée.
+    """
+    return {
+        key: value.isoformat() if isinstance(value, datetime.date) else value
+        for key, value in record.items()
+        if key != "vms"
+    }
+
+
+def _diff(
+    previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Calcule la différence entre deux états indexés par identifiant
+
+    Returns:
+        Dictionnaire avec les enregistrements ajoutés, modifiés (nouvelle
+        version) et les identifiants supprimés
+    """
+    added = {key: record for key, record in current.items() if key not in previous}
+    changed = {
+        key: record
+        for key, record in current.items()
+        if key in previous and previous[key] != record
+    }
+    removed = [key for key in previous if key not in current]
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def _apply(state: Dict[str, Dict[str, Any]], delta: Dict[str, Any]) -> None:
+    """Applique une différence à un état indexé par identifiant (en place)"""
+    for key in delta["removed"]:
+        state.pop(key, None)
+    state.update(delta["added"])
+    state.update(delta["changed"])
+
+
+def _empty_aggregates() -> Dict[str, Any]:
+    """Agrégats d'une flotte vide"""
+    return {
+        "users": 0,
+        "vms": 0,
+        "vms_by_status": {},
+        "totals": {metric: 0 for metric in CAPACITY_METRICS},
+    }
+
+
+def _account_vm(aggregates: Dict[str, Any], vm: Dict[str, Any], sign: int) -> None:
+    """Ajoute (sign=1) ou retire (sign=-1) une VM des agrégats"""
+    status = vm.get("status") or "unknown"
+    by_status = aggregates["vms_by_status"]
+    by_status[status] = by_status.get(status, 0) + sign
+    if not by_status[status]:
+        del by_status[status]
+    aggregates["vms"] += sign
+    for metric in CAPACITY_METRICS:
+        aggregates["totals"][metric] += sign * (vm.get(metric) or 0)
+
+
+def _update_aggregates(
+    aggregates: Dict[str, Any],
+    previous_vms: Dict[str, Dict[str, Any]],
+    users_delta: Dict[str, Any],
+    vms_delta: Dict[str, Any],
+) -> None:
+    """
+    Met à jour les agrégats à partir des seules différences (en place)
+
+    Args:
+        aggregates: Agrégats de l'instantané précédent
+        previous_vms: VMs de l'instantané précédent (pour retirer l'ancienne version)
+        users_delta: Différence sur les utilisateurs
+        vms_delta: Différence sur les VMs
+    """
+    aggregates["users"] += len(users_delta["added"]) - len(users_delta["removed"])
+
+    for key in vms_delta["removed"]:
+        _account_vm(aggregates, previous_vms[key], -1)
+    for key, vm in vms_delta["changed"].items():
+        _account_vm(aggregates, previous_vms[key], -1)
+        _account_vm(aggregates, vm, 1)
+    for vm in vms_delta["added"].values():
+        _account_vm(aggregates, vm, 1)
+
+
+class SnapshotStore:
+    """Historique en ajout seul des instantanés de la flotte"""
+
+    def __init__(self, directory: str = "outputs/history"):
+        """
+        Initialise le stockage de l'historique
+
+        Args:
+            directory: Dossier de l'historique
+        """
+        self.directory = directory
+        self.deltas_path = os.path.join(directory, DELTAS_FILENAME)
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.state_path = os.path.join(directory, STATE_FILENAME)
+        os.makedirs(directory, exist_ok=True)
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Charge le dernier état complet (reconstruit s'il est en retard)"""
+        entries = self.entries()
+        if not entries:
+            return {
+                "snapshot_id": 0,
+                "users": {},
+                "vms": {},
+                "aggregates": _empty_aggregates(),
+            }
+
+        last = entries[-1]
+        if os.path.exists(self.state_path):
+            with gzip.open(self.state_path, "rb") as f:
+                state = json_codec.loads(f.read())
+            if state["snapshot_id"] == last["snapshot_id"]:
+                return state
+
+        logger.warning(
+            "État de l'historique en retard, reconstruction par rejeu",
+            snapshot_id=last["snapshot_id"],
+        )
+        users, vms = self._replay(entries, last["snapshot_id"])
+        return {
+            "snapshot_id": last["snapshot_id"],
+            "users": users,
+            "vms": vms,
+            "aggregates": {key: last[key] for key in _empty_aggregates()},
+        }
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """Remplace atomiquement le dernier état complet"""
+        tmp_path = f"{self.state_path}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(json_codec.dumps(state))
+        os.replace(tmp_path, self.state_path)
+
+    def _append(self, path: str, record: Dict[str, Any], compress: bool) -> None:
+        """Ajoute une ligne JSON à un journal (nouveau membre gzip si compressé)"""
+        line = json_codec.dumps(record) + b"\n"
+        with open(path, "ab") as f:
+            f.write(gzip.compress(line) if compress else line)
+
+    def record(
+        self, users: List[Dict[str, Any]], vms: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Enregistre un instantané de la flotte
+
+        Seule la différence avec l'instantané précédent est ajoutée au journal,
+        puis l'entrée d'index qui la valide, puis le nouvel état complet.
+
+        Args:
+            users: Liste des utilisateurs
+            vms: Liste des VMs
+
+        Returns:
+            Entrée d'index de l'instantané (agrégats et volume de changements)
+        """
+        state = self._load_state()
+        snapshot_id = state["snapshot_id"] + 1
+
+        current_users = {str(user["id"]): _normalize(user) for user in users}
+        current_vms = {str(vm["id"]): _normalize(vm) for vm in vms}
+        users_delta = _diff(state["users"], current_users)
+        vms_delta = _diff(state["vms"], current_vms)
+
+        aggregates = state["aggregates"]
+        _update_aggregates(aggregates, state["vms"], users_delta, vms_delta)
+
+        taken_at = datetime.datetime.now().isoformat()
+        self._append(
+            self.deltas_path,
+            {
+                "snapshot_id": snapshot_id,
+                "taken_at": taken_at,
+                "users": users_delta,
+                "vms": vms_delta,
+            },
+            compress=True,
+        )
+
+        entry = {
+            "snapshot_id": snapshot_id,
+            "taken_at": taken_at,
+            **aggregates,
+            "churn": {
+                f"{kind}_{change}": len(delta[change])
+                for kind, delta in (("users", users_delta), ("vms", vms_delta))
+                for change in ("added", "changed", "removed")
+            },
+        }
+        self._append(self.index_path, entry, compress=False)
+        self._save_state(
+            {
+                "snapshot_id": snapshot_id,
+                "users": current_users,
+                "vms": current_vms,
+                "aggregates": aggregates,
+            }
+        )
+
+        logger.info(
+            "Instantané de la flotte enregistré",
+            snapshot_id=snapshot_id,
+            churn=entry["churn"],
+        )
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Retourne les entrées d'index de tous les instantanés validés
+
+        Returns:
+            Liste des entrées, de la plus ancienne à la plus récente
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "rb") as f:
+            content = f.read()
+
+        # Une interruption pendant l'ajout d'une entrée peut laisser une
+        # dernière ligne tronquée : l'instantané n'est pas validé, la ligne
+        # est retirée pour que la suivante ne lui soit pas accolée
+        complete = content.rfind(b"\n") + 1
+        if complete < len(content):
+            logger.warning("Entrée d'index tronquée ignorée", path=self.index_path)
+            with open(self.index_path, "r+b") as f:
+                f.truncate(complete)
+
+        return [
+            json_codec.loads(line)
+            for line in content[:complete].splitlines()
+            if line.strip()
+        ]
+
+    def _replay(
+        self, entries: List[Dict[str, Any]], snapshot_id: int
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Rejoue les différences validées jusqu'à un instantané
+
+        Une différence n'est appliquée que si une entrée d'index porte le même
+        identifiant et la même date : les différences orphelines laissées par
+        une interruption sont ignorées.
+        """
+        committed = {entry["snapshot_id"]: entry["taken_at"] for entry in entries}
+        users: Dict[str, Dict[str, Any]] = {}
+        vms: Dict[str, Dict[str, Any]] = {}
+        with gzip.open(self.deltas_path, "rb") as f:
+            for line in f:
+                delta = json_codec.loads(line)
+                if committed.get(delta["snapshot_id"]) != delta["taken_at"]:
+                    continue
+                if delta["snapshot_id"] > snapshot_id:
+                    break
+                _apply(users, delta["users"])
+                _apply(vms, delta["vms"])
+        return users, vms
+
+    def load_snapshot(
+        self, snapshot_id: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Reconstruit un instantané en rejouant les différences
+
+        Args:
+            snapshot_id: Instantané à reconstruire (défaut: le plus récent)
+
+        Returns:
+            Tuple (users, vms) tels qu'enregistrés (dates en ISO 8601)
+
+        Raises:
+            ValueError: Si l'instantané n'existe pas
+        """
+        entries = self.entries()
+        if snapshot_id is None and entries:
+            snapshot_id = entries[-1]["snapshot_id"]
+        if snapshot_id not in {entry["snapshot_id"] for entry in entries}:
+            raise ValueError(f"Instantané introuvable: {snapshot_id}")
+
+        users, vms = self._replay(entries, snapshot_id)
+        return list(users.values()), list(vms.values())
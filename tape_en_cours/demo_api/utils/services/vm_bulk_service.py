@@ -0,0 +1,159 @@
+"""
+Actions en masse sur les VMs pour demo_api
+
+Les VMs sont sélectionnées par une expression de filtre (voir utils.vm_filter)
+dans la flotte récupérée une seule fois (DataManager), puis l'action (arrêt,
+association à un utilisateur, mise à jour) est envoyée par plusieurs threads
+au rythme d'un limiteur partagé (voir utils.bulk_pipeline).
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from utils.api import Api
+from utils.bulk_pipeline import BulkPipeline, RateLimiter, StageStats
+from utils.logging_config import get_logger
+from utils.tracing import traced
+from utils.vm_filter import filter_vms
+from .data_manager import DataManager
+
+logger = get_logger(__name__)
+
+# Actions disponibles
+BULK_ACTIONS = ("stop", "attach", "update")
+
+
+def outcome_of(result: Dict[str, Any]) -> str:
+    """
+    Libellé du résultat d'une action : "ok" ou type d'erreur et code HTTP
+
+    Args:
+        result: Résultat du pipeline ({"index", "payload", "record", "error"})
+    """
+    error = result["error"]
+    if error is None:
+        return "ok"
+    status_code = getattr(error, "status_code", None)
+    name = type(error).__name__
+    return f"{name} ({status_code})" if status_code else name
+
+
+def summarize_outcomes(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Compte les résultats par libellé, du plus fréquent au moins fréquent
+
+    Args:
+        results: Résultats du pipeline
+
+    Returns:
+        Nombre de VMs par résultat
+    """
+    counts: Dict[str, int] = {}
+    for result in results:
+        outcome = outcome_of(result)
+        counts[outcome] = counts.get(outcome, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+class VMBulkService:
+    """Service pour appliquer une action à un ensemble de VMs"""
+
+    def __init__(self, api_client: Api):
+        """
+        Initialise le service
+
+        Args:
+            api_client: Client API unifié (authentifié pour les actions)
+        """
+        self.api = api_client
+        self.data_manager = DataManager(api_client)
+        self.stats: Dict[str, StageStats] = {}
+
+    @traced()
+    def select(self, expression: str) -> List[Dict[str, Any]]:
+        """
+        Sélectionne les VMs de la flotte qui correspondent à un filtre
+
+        Args:
+            expression: Expression de filtre (ex: "status=running and os~Ubuntu")
+
+        Returns:
+            VMs sélectionnées
+
+        Raises:
+            VMFilterError: Si l'expression est invalide
+        """
+        _, vms = self.data_manager.fetch_all_data()
+        return filter_vms(vms, expression)
+
+    def _action(
+        self,
+        action: str,
+        user_id: Optional[int] = None,
+        updates: Optional[Dict[str, Any]] = None,
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """Appel API correspondant à une action, pour une VM"""
+        if action == "stop":
+            return lambda vm: self.api.vms.stop(vm["id"])
+        if action == "attach":
+            if user_id is None:
+                raise ValueError("L'action attach nécessite un user_id")
+            return lambda vm: self.api.vms.attach_to_user(vm["id"], user_id)
+        if action == "update":
+            if not updates:
+                raise ValueError("L'action update nécessite des champs à modifier")
+            return lambda vm: self.api.vms.update(vm["id"], updates)
+        raise ValueError(
+            f"Action inconnue: {action} (valides: {', '.join(BULK_ACTIONS)})"
+        )
+
+    @traced()
+    def run(
+        self,
+        action: str,
+        vms: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        updates: Optional[Dict[str, Any]] = None,
+        workers: int = 4,
+        interval: float = 0.0,
+        on_report: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Applique une action à chaque VM, en parallèle et à débit limité
+
+        Args:
+            action: Action à appliquer (stop, attach, update)
+            vms: VMs ciblées
+            user_id: Utilisateur cible (action attach)
+            updates: Champs à modifier (action update)
+            workers: Nombre de threads d'envoi
+            interval: Délai minimal entre deux appels, tous threads confondus
+            on_report: Appelé avec chaque lot de résultats (progression)
+
+        Returns:
+            Résultats du pipeline, dans l'ordre des VMs
+
+        Raises:
+            ValueError: Si l'action ou ses paramètres sont invalides
+        """
+        call = self._action(action, user_id, updates)
+        logger.info(
+            "Début de l'action en masse",
+            action=action,
+            vms_count=len(vms),
+            workers=workers,
+        )
+
+        pipeline = BulkPipeline(
+            produce=lambda index: vms[index],
+            send=lambda index, vm: call(vm),
+            workers=workers,
+            rate_limiter=RateLimiter(interval=interval),
+        )
+        results = pipeline.run(range(len(vms)), on_report or (lambda batch: None))
+        self.stats = pipeline.stats
+
+        logger.info(
+            "Action en masse terminée",
+            action=action,
+            outcomes=summarize_outcomes(results),
+        )
+        return results
@@ -12,6 +12,7 @@ from utils.api.exceptions import (
 )
 from utils.logging_config import get_logger
 from utils.password_utils import get_or_create_token
+from utils.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -28,6 +29,7 @@ class VMService:
         """
         self.api = api_client
 
+    @traced()
     def authenticate_user(
         self, email: str = "jean@dupont21.com", password: str = None
     ) -> "Optional[Dict[str, Any]]":
@@ -80,6 +82,7 @@ class VMService:
             logger.error("Erreur d'authentification", error=str(e))
             return None
 
+    @traced()
     def create_vm_for_user(
         self, user: Dict[str, Any], vm_config: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,328 @@
+"""
+Traçage léger des opérations de demo_api.
+
+Un span représente une opération chronométrée (début, fin, attributs). Les
+spans s'imbriquent selon le contexte d'exécution, par exemple :
+
+    fetch_all_data › get_vms › HTTP GET
+
+Chaque span porte l'identifiant de trace de son span racine ; ces
+identifiants sont ajoutés aux événements structlog émis pendant le span
+(trace_id, span_id) pour relier les logs d'une même exécution.
+
+Le traçage s'active avec DEMO_API_TRACE_FILE : les spans sont alors écrits
+en fin d'exécution, au format Chrome trace-event (chrome://tracing, Perfetto,
+speedscope) ou en JSON simple (DEMO_API_TRACE_FORMAT). Désactivé, span() et
+traced() se réduisent à un test sur une variable globale.
+"""
+
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+from .config import config
+
+# Formats d'export disponibles
+TRACE_FORMATS = ("chrome", "json")
+
+# Span en cours dans ce contexte d'exécution
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "demo_api_span", default=None
+)
+
+# Compteur des identifiants de span
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """Opération chronométrée, avec ses attributs et son parent"""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "thread_id",
+        "thread_name",
+    )
+
+    def __init__(
+        self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]
+    ):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = f"{next(_span_ids):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+
+    def set(self, **attributes: Any) -> None:
+        """Ajoute ou remplace des attributs du span"""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        """Durée du span en secondes (0 s'il n'est pas terminé)"""
+        return (self.end or self.start) - self.start
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Span sous forme de dictionnaire (export JSON)"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration * 1000, 3),
+            "thread": self.thread_name,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Span renvoyé quand le traçage est désactivé"""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _SpanScope:
+    """Ouvre un span à l'entrée du bloc et l'enregistre à la sortie"""
+
+    __slots__ = ("tracer", "name", "attributes", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = Span(self.name, _current.get(), self.attributes)
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.span.end = time.time()
+        if exc_type is not None:
+            self.span.attributes["error"] = f"{exc_type.__name__}: {exc_value}"
+        _current.reset(self.token)
+        self.tracer.record(self.span)
+
+
+class Tracer:
+    """Collecte les spans terminés et les exporte dans un fichier"""
+
+    def __init__(self, path: str, trace_format: str = "chrome"):
+        """
+        Initialise le collecteur
+
+        Args:
+            path: Fichier de trace écrit à l'export
+            trace_format: Format d'export ("chrome" ou "json")
+        """
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(
+                f"Format de trace invalide: {trace_format} "
+                f"(valides: {', '.join(TRACE_FORMATS)})"
+            )
+        self.path = path
+        self.trace_format = trace_format
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        """Ajoute un span terminé"""
+        with self._lock:
+            self.spans.append(span)
+
+    def _chrome_events(self, spans: List[Span]) -> List[Dict[str, Any]]:
+        """Événements "complete" (ph=X) et noms de threads du format Chrome"""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[Optional[int], str] = {}
+        for span in spans:
+            threads[span.thread_id] = span.thread_name
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "demo_api",
+                    "ph": "X",
+                    "ts": round(span.start * 1_000_000, 3),
+                    "dur": round(span.duration * 1_000_000, 3),
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {
+                        "trace_id": span.trace_id,
+                        "span_id": span.span_id,
+                        "parent_id": span.parent_id,
+                        **span.attributes,
+                    },
+                }
+            )
+        for thread_id, thread_name in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": thread_name},
+                }
+            )
+        return events
+
+    def export(self, path: Optional[str] = None) -> str:
+        """
+        Écrit les spans terminés dans le fichier de trace
+
+        Args:
+            path: Fichier de sortie (défaut: celui du collecteur)
+
+        Returns:
+            Chemin du fichier écrit
+        """
+        path = path or self.path
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+
+        if self.trace_format == "chrome":
+            document = {
+                "traceEvents": self._chrome_events(spans),
+                "displayTimeUnit": "ms",
+            }
+        else:
+            document = {"spans": [span.as_dict() for span in spans]}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, default=str)
+        return path
+
+
+# Collecteur actif (None : traçage désactivé)
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **attributes: Any):
+    """
+    Ouvre un span, à utiliser comme bloc `with span("get_vms") as s:`
+
+    Args:
+        name: Nom de l'opération
+        **attributes: Attributs initiaux (complétés avec s.set(...))
+
+    Returns:
+        Gestionnaire de contexte qui renvoie le span (inerte si désactivé)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return _SpanScope(tracer, name, attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Décorateur qui ouvre un span pour chaque appel de la fonction
+
+    Args:
+        name: Nom du span (défaut: nom qualifié de la fonction)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _SpanScope(tracer, label, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Span en cours dans ce contexte (None hors span ou si désactivé)"""
+    return _current.get()
+
+
+def add_trace_context(logger: Any, method_name: str, event_dict: Dict[str, Any]):
+    """Processeur structlog : ajoute trace_id et span_id du span en cours"""
+    current = _current.get()
+    if current is not None:
+        event_dict.setdefault("trace_id", current.trace_id)
+        event_dict.setdefault("span_id", current.span_id)
+    return event_dict
+
+
+def enable(path: str, trace_format: str = "chrome") -> Tracer:
+    """
+    Active le traçage ; les spans sont exportés à la fin du processus
+
+    Args:
+        path: Fichier de trace
+        trace_format: Format d'export ("chrome" ou "json")
+
+    Returns:
+        Collecteur actif
+    """
+    global _tracer
+    tracer = Tracer(path, trace_format)
+    _tracer = tracer
+    atexit.register(_export_at_exit, tracer)
+    return tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Désactive le traçage et retourne le collecteur qui était actif"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    atexit.unregister(_export_at_exit)
+    return tracer
+
+
+def _export_at_exit(tracer: Tracer) -> None:
+    """Écrit la trace en fin de processus (si des spans ont été collectés)"""
+    if not tracer.spans:
+        return
+    # Import tardif : logging_config importe ce module pour son processeur
+    from .logging_config import get_logger
+
+    path = tracer.export()
+    get_logger(__name__).info(
+        "Trace écrite", path=path, format=tracer.trace_format, spans=len(tracer.spans)
+    )
+
+
+if config.DEMO_API_TRACE_FILE:
+    enable(config.DEMO_API_TRACE_FILE, config.DEMO_API_TRACE_FORMAT)
@@ -0,0 +1,189 @@
+"""
+Expressions de filtre sur les VMs pour demo_api
+
+Une expression est une suite de conditions reliées par "and", par exemple :
+
+    status=running and os~Ubuntu and ram>=8
+
+Opérateurs reconnus :
+- = et != : égalité (insensible à la casse pour le texte)
+- ~ et !~ : contient / ne contient pas (insensible à la casse)
+- <, <=, >, >= : comparaison numérique
+
+Les champs sont ceux des VMs renvoyées par l'API ; quelques alias courts
+sont acceptés (os, cpu, ram, disk, user). Un champ inconnu ou un autre
+connecteur que "and" (or, not, ||...) est refusé plutôt que de produire un
+filtre qui ne sélectionne rien, ou trop.
+"""
+
+import re
+from typing import Any, Callable, Dict, List
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Alias courts des champs de VM
+FIELD_ALIASES = {
+    "os": "operating_system",
+    "cpu": "cpu_cores",
+    "ram": "ram_gb",
+    "disk": "disk_gb",
+    "user": "user_id",
+}
+
+# Champs des VMs renvoyées par l'API
+VM_FIELDS = frozenset(
+    {
+        "id",
+        "name",
+        "user_id",
+        "operating_system",
+        "cpu_cores",
+        "ram_gb",
+        "disk_gb",
+        "status",
+        "created_at",
+    }
+)
+
+# Opérateurs à deux caractères en premier pour que "!=" ne soit pas lu "="
+_CONDITION = re.compile(r"^\s*(\w+)\s*(!=|!~|<=|>=|=|~|<|>)\s*(.*?)\s*$")
+_AND = re.compile(r"\s+and\s+", re.IGNORECASE)
+_UNSUPPORTED = re.compile(r"(?:^|\s)(or|not)(?:\s|$)|(\|\||&&)", re.IGNORECASE)
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class VMFilterError(ValueError):
+    """Exception levée pour une expression de filtre invalide"""
+
+
+def _number(value: Any) -> float:
+    """Convertit une valeur en nombre (ValueError si impossible)"""
+    if isinstance(value, bool) or value is None:
+        raise ValueError(value)
+    return float(value)
+
+
+def _text(value: Any) -> str:
+    """Forme comparable d'une valeur textuelle"""
+    return "" if value is None else str(value).casefold()
+
+
+def _equals(actual: Any, expected: str) -> bool:
+    """Égalité numérique si possible, textuelle sinon"""
+    try:
+        return _number(actual) == _number(expected)
+    except ValueError:
+        return _text(actual) == _text(expected)
+
+
+def resolve_field(name: str) -> str:
+    """
+    Résout un nom de champ de VM (alias compris)
+
+    Args:
+        name: Nom ou alias du champ (insensible à la casse)
+
+    Returns:
+        Nom du champ tel que renvoyé par l'API
+
+    Raises:
+        VMFilterError: Si le champ est inconnu
+    """
+    field = FIELD_ALIASES.get(name.strip().lower(), name.strip().lower())
+    if field not in VM_FIELDS:
+        raise VMFilterError(
+            f"Champ inconnu: {name.strip()!r} "
+            f"(valides: {', '.join(sorted(VM_FIELDS | FIELD_ALIASES.keys()))})"
+        )
+    return field
+
+
+def _condition(field: str, operator: str, expected: str) -> Predicate:
+    """Construit le prédicat d'une condition"""
+    if operator == "=":
+        return lambda vm: _equals(vm.get(field), expected)
+    if operator == "!=":
+        return lambda vm: not _equals(vm.get(field), expected)
+    if operator in ("~", "!~"):
+        needle = _text(expected)
+        negate = operator == "!~"
+        return lambda vm: (needle in _text(vm.get(field))) != negate
+
+    try:
+        bound = _number(expected)
+    except ValueError as exc:
+        raise VMFilterError(
+            f"Valeur numérique attendue pour {field}{operator}: {expected!r}"
+        ) from exc
+    compare = {
+        "<": lambda value: value < bound,
+        "<=": lambda value: value <= bound,
+        ">": lambda value: value > bound,
+        ">=": lambda value: value >= bound,
+    }[operator]
+
+    def predicate(vm: Dict[str, Any]) -> bool:
+        try:
+            return compare(_number(vm.get(field)))
+        except ValueError:
+            return False
+
+    return predicate
+
+
+def parse_filter(expression: str) -> Predicate:
+    """
+    Compile une expression de filtre en prédicat
+
+    Args:
+        expression: Conditions reliées par "and" (vide : toutes les VMs)
+
+    Returns:
+        Fonction qui indique si une VM correspond à l'expression
+
+    Raises:
+        VMFilterError: Si l'expression est invalide
+    """
+    if not expression.strip():
+        return lambda vm: True
+
+    predicates: List[Predicate] = []
+    for clause in _AND.split(expression.strip()):
+        unsupported = _UNSUPPORTED.search(clause)
+        if unsupported:
+            raise VMFilterError(
+                f"Connecteur non supporté {unsupported.group().strip()!r} "
+                f"dans {clause!r}: seul \"and\" est accepté"
+            )
+        match = _CONDITION.match(clause)
+        if not match or not match.group(3):
+            raise VMFilterError(f"Condition de filtre invalide: {clause!r}")
+        field, operator, expected = match.groups()
+        field = resolve_field(field)
+        predicates.append(_condition(field, operator, expected.strip("\"'")))
+
+    return lambda vm: all(predicate(vm) for predicate in predicates)
+
+
+def filter_vms(vms: List[Dict[str, Any]], expression: str) -> List[Dict[str, Any]]:
+    """
+    Sélectionne les VMs qui correspondent à une expression de filtre
+
+    Args:
+        vms: Liste des VMs
+        expression: Expression de filtre
+
+    Returns:
+        VMs sélectionnées, dans l'ordre d'origine
+
+    Raises:
+        VMFilterError: Si l'expression est invalide
+    """
+    predicate = parse_filter(expression)
+    selected = [vm for vm in vms if predicate(vm)]
+    logger.info(
+        "VMs filtrées", expression=expression, total=len(vms), selected=len(selected)
+    )
+    return selected